@@ -0,0 +1,177 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
+
+from api.core.config import Settings, settings
+from api.core.logs import get_logger
+from api.core.metrics import Histogram
+
+logger = get_logger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """A graph run was not admitted; answered with `status_code` and a Retry-After header."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """An admitted run; `release()` it exactly once when the run ends."""
+
+    def __init__(self, controller: "AdmissionController", user_id: str):
+        self._controller = controller
+        self.user_id = user_id
+        self.started = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """
+    Bounds how many graph runs a worker executes at once.
+
+    A run needs a free global slot (`max_concurrent`) and a free slot of its
+    user (`max_per_user`). Otherwise it waits in a bounded queue for up to
+    `queue_timeout` seconds. Requests are turned away at once, without
+    queueing, when the queue is full (503) or the user already has
+    `max_per_user` runs waiting (429); a wait that times out is a 503. Every
+    rejection carries a Retry-After estimated from recent run times.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        max_per_user: int = 4,
+        max_queue: int = 64,
+        queue_timeout: float = 30.0,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._condition = asyncio.Condition()
+        self._running = 0
+        self._waiting = 0
+        self._running_by_user: dict[str, int] = {}
+        self._waiting_by_user: dict[str, int] = {}
+        self._admitted = 0
+        self._rejected = {"queue_full": 0, "user_limit": 0, "timeout": 0}
+        self._avg_run_seconds = 1.0
+        self.wait_seconds = Histogram()
+        self.run_seconds = Histogram()
+
+    def _has_slot(self, user_id: str) -> bool:
+        return self._running < self.max_concurrent and self._running_by_user.get(user_id, 0) < self.max_per_user
+
+    def _retry_after(self) -> int:
+        # Time for the queue ahead to drain at the current concurrency
+        rounds = (self._waiting + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(rounds * self._avg_run_seconds))
+
+    def _reject(self, reason: str, status_code: int, detail: str) -> AdmissionRejected:
+        self._rejected[reason] += 1
+        return AdmissionRejected(status_code, detail, self._retry_after())
+
+    async def acquire(self, user_id: str | None = None) -> Ticket:
+        """Waits for a slot; raises AdmissionRejected if none frees up in time."""
+        user_id = user_id or "anonymous"
+        started = time.perf_counter()
+        async with self._condition:
+            if not self._has_slot(user_id):
+                if self._waiting >= self.max_queue:
+                    raise self._reject("queue_full", 503, "Server is at capacity, try again later")
+                if self._waiting_by_user.get(user_id, 0) >= self.max_per_user:
+                    raise self._reject("user_limit", 429, "Too many concurrent requests for this user")
+                self._waiting += 1
+                self._waiting_by_user[user_id] = self._waiting_by_user.get(user_id, 0) + 1
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._has_slot(user_id)), self.queue_timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise self._reject("timeout", 503, "Timed out waiting for capacity") from None
+                finally:
+                    self._waiting -= 1
+                    self._waiting_by_user[user_id] -= 1
+                    if not self._waiting_by_user[user_id]:
+                        del self._waiting_by_user[user_id]
+            self._running += 1
+            self._running_by_user[user_id] = self._running_by_user.get(user_id, 0) + 1
+            self._admitted += 1
+        self.wait_seconds.observe(time.perf_counter() - started)
+        return Ticket(self, user_id)
+
+    def _release(self, ticket: Ticket) -> None:
+        elapsed = time.perf_counter() - ticket.started
+        self.run_seconds.observe(elapsed)
+        self._avg_run_seconds = 0.9 * self._avg_run_seconds + 0.1 * elapsed
+        self._running -= 1
+        self._running_by_user[ticket.user_id] -= 1
+        if not self._running_by_user[ticket.user_id]:
+            del self._running_by_user[ticket.user_id]
+        # Release may run from a sync callback, so wake waiters from a task
+        asyncio.get_running_loop().create_task(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._condition:
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def admit(self, user_id: str | None = None) -> AsyncGenerator[Ticket]:
+        ticket = await self.acquire(user_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self._running,
+            "queue_depth": self._waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_per_user": self.max_per_user,
+            "max_queue": self.max_queue,
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+            "wait_seconds": self.wait_seconds.as_dict(),
+            "run_seconds": self.run_seconds.as_dict(),
+        }
+
+
+def admission_limit(config: Settings = settings) -> int:
+    """
+    `admission_max_concurrent`, capped to the graph runs the connection pools can serve.
+
+    A run holds an ORM session connection and a conversation lock connection
+    while the model generates; local job workers run turns outside
+    admission and hold the same. The ORM pool keeps `db_pool_reserved`
+    connections for everything else.
+    """
+    orm_runs = config.db_pool_size + config.db_max_overflow - config.db_pool_reserved - config.job_workers
+    lock_runs = config.conversation_lock_pool_size - config.job_workers
+    limit = max(min(config.admission_max_concurrent, orm_runs, lock_runs), 1)
+    if limit < config.admission_max_concurrent:
+        logger.warning(
+            f"admission_max_concurrent={config.admission_max_concurrent} exceeds what the connection "
+            f"pools can serve; admitting {limit} concurrent runs (raise db_pool_size, db_max_overflow "
+            f"or conversation_lock_pool_size to allow more)"
+        )
+    return limit
+
+
+admission_controller = AdmissionController(
+    max_concurrent=admission_limit(),
+    max_per_user=settings.admission_max_per_user,
+    max_queue=settings.admission_max_queue,
+    queue_timeout=settings.admission_queue_timeout,
+)
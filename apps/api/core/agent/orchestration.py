@@ -1,21 +1,60 @@
 import functools
-
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from langchain_core.messages import BaseMessage, message_chunk_to_message, trim_messages
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableConfig, RunnablePassthrough
 from langchain_core.runnables.base import RunnableSequence
 from langchain_core.tools import StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.graph import MessagesState, StateGraph
 from langgraph.graph.state import CompiledStateGraph
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 
 from api.core.agent.prompts import SYSTEM_PROMPT
+from api.core.agent.tools import tool_executor
+from api.core.config import settings
+from api.core.telemetry import timed_node
+from api.core.tokens import count_message_tokens
 
 
 class State(MessagesState):
     next: str
 
 
+def _count_tokens(messages: list[BaseMessage]) -> int:
+    return sum(
+        count_message_tokens(str(message.content), getattr(message, "tool_calls", None))
+        for message in messages
+    )
+
+
+def history_tail(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """
+    The newest messages that fit `settings.history_max_tokens`.
+
+    Checkpointed threads keep every message; only this tail is sent to the
+    model, starting at a user message so tool results keep their calls.
+    """
+    tail = trim_messages(
+        messages,
+        max_tokens=settings.history_max_tokens,
+        token_counter=_count_tokens,
+        strategy="last",
+        start_on="human",
+        include_system=True,
+    )
+    return tail or list(messages[-1:])
+
+
 def agent_factory(
     llm: ChatOpenAI, tools: list[StructuredTool], system_prompt: str
 ) -> RunnableSequence:
@@ -25,19 +64,34 @@ def agent_factory(
             MessagesPlaceholder(variable_name="messages"),
         ]
     )
+    trim = RunnablePassthrough.assign(messages=lambda state: history_tail(state["messages"]))
     if tools:
-        agent = prompt | llm.bind_tools(tools)
+        agent = trim | prompt | llm.bind_tools(tools)
     else:
-        agent = prompt | llm
+        agent = trim | prompt | llm
     return agent
 
 
-def agent_node_factory(
+async def agent_node_factory(
     state: State,
+    config: RunnableConfig,
     agent: RunnableSequence,
 ) -> State:
-    result = agent.invoke(state)
-    return dict(messages=[result])
+    """
+    Runs the agent without blocking the event loop.
+
+    The model is streamed so each token is reported to the run's callbacks as
+    it arrives (`astream_events` emits them as `on_chat_model_stream`,
+    `stream_mode="messages"` as message chunks). Cancelling the graph run,
+    e.g. when the client disconnects, cancels the in-flight model request.
+    """
+    result: BaseMessage | None = None
+    async for chunk in agent.astream(state, config):
+        result = chunk if result is None else result + chunk
+    if result is None:
+        # Streaming produced nothing (e.g. a model without streaming support)
+        result = await agent.ainvoke(state, config)
+    return dict(messages=[message_chunk_to_message(result)])
 
 
 def graph_factory(
@@ -47,8 +101,9 @@ def graph_factory(
     name: str = "agent_node",
 ) -> CompiledStateGraph:
     graph_builder = StateGraph(State)
-    graph_builder.add_node(name, agent_node)
-    graph_builder.add_node("tools", ToolNode(tools))
+    graph_builder.add_node(name, timed_node(name, agent_node))
+    # Runs the turn's tool calls concurrently, see core.agent.tools.ToolExecutor
+    graph_builder.add_node("tools", timed_node("tools", tool_executor.bind(tools)))
 
     graph_builder.add_conditional_edges(name, tools_condition)
     graph_builder.add_edge("tools", name)
@@ -58,7 +113,108 @@ def graph_factory(
     return graph
 
 
-def get_graph(
+def tools_fingerprint(tools: list[StructuredTool]) -> str:
+    """Hash of the tool schemas as the model sees them (name, description, arguments)."""
+    schemas = [convert_to_openai_tool(tool) for tool in tools]
+    payload = json.dumps(schemas, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _model_key(llm: ChatOpenAI) -> str:
+    # Requests build a fresh client each time, so key on its parameters rather than its identity
+    params = json.dumps(llm._identifying_params, sort_keys=True, default=str)
+    return f"{type(llm).__qualname__}:{params}"
+
+
+class GraphCache:
+    """
+    LRU cache of compiled graphs.
+
+    Building a graph re-creates the prompt, binds the tools to the model and
+    compiles the `StateGraph`; none of that depends on the request, so one
+    compiled graph is reused for every request with the same model, system
+    prompt, tool schemas and checkpointer. Cached graphs hold a reference to
+    their checkpointer, so its `id()` cannot be reused while the entry lives.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._graphs: OrderedDict[Hashable, tuple[str, CompiledStateGraph]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._build_seconds = 0.0
+
+    def get_or_build(
+        self,
+        llm: ChatOpenAI,
+        tools: list[StructuredTool],
+        system_prompt: str,
+        name: str,
+        checkpointer: AsyncPostgresSaver | None,
+    ) -> CompiledStateGraph:
+        fingerprint = tools_fingerprint(tools)
+        key = (_model_key(llm), system_prompt, fingerprint, name, id(checkpointer))
+        with self._lock:
+            entry = self._graphs.get(key)
+            if entry is not None:
+                self._graphs.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        started = time.perf_counter()
+        graph = build_graph(llm, tools, system_prompt, name, checkpointer)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._build_seconds += elapsed
+            self._graphs[key] = (fingerprint, graph)
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+                self._evictions += 1
+        return graph
+
+    def invalidate(self, tools: list[StructuredTool] | None = None) -> int:
+        """
+        Drops cached graphs built with `tools` (all graphs when `tools` is None).
+
+        Call this when the tool set changes so graphs bound to the old tools
+        are released instead of aging out.
+
+        Returns:
+            int: The number of graphs dropped.
+        """
+        fingerprint = None if tools is None else tools_fingerprint(tools)
+        with self._lock:
+            stale = [
+                key for key, (graph_fingerprint, _) in self._graphs.items()
+                if fingerprint is None or graph_fingerprint == fingerprint
+            ]
+            for key in stale:
+                del self._graphs[key]
+        return len(stale)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._graphs),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "build_seconds_total": round(self._build_seconds, 6),
+            }
+
+
+graph_cache = GraphCache(max_size=settings.graph_cache_size)
+
+
+def build_graph(
     llm: ChatOpenAI,
     tools: list[StructuredTool] = [],
     system_prompt: str = SYSTEM_PROMPT,
@@ -70,7 +226,23 @@ def get_graph(
     return graph_factory(worker_node, tools, checkpointer, name)
 
 
-def get_config():
+def get_graph(
+    llm: ChatOpenAI,
+    tools: list[StructuredTool] = [],
+    system_prompt: str = SYSTEM_PROMPT,
+    name: str = "agent_node",
+    checkpointer: AsyncPostgresSaver | None = None,
+) -> CompiledStateGraph:
+    """Returns the compiled graph for this configuration, building it on first use."""
+    return graph_cache.get_or_build(llm, tools, system_prompt, name, checkpointer)
+
+
+def thread_id_for(conversation_id: str | uuid.UUID) -> str:
+    """Checkpoint thread of a conversation: one thread per conversation."""
+    return str(conversation_id)
+
+
+def get_config(conversation_id: str | uuid.UUID):
     return dict(
-        configurable=dict(thread_id="1"),
+        configurable=dict(thread_id=thread_id_for(conversation_id)),
     )
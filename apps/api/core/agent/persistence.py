@@ -1,13 +1,33 @@
+import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator
 
 import psycopg
 import psycopg.errors
-import uvicorn
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from psycopg_pool import AsyncConnectionPool
 
-from api.core.logs import uvicorn
+from api.core.config import settings
+from api.core.logs import get_logger
+
+logger = get_logger(__name__)
+
+# NOTE: LangGraph AsyncPostgresSaver does not support SQLAlchemy ORM Connections.
+# A compatible psycopg connection is created via the connection pool to connect to the checkpointer.
+_CONNECTION_KWARGS = dict(prepare_threshold=None)
+
+
+async def _setup_checkpointer(pool: AsyncConnectionPool) -> AsyncPostgresSaver:
+    checkpointer = AsyncPostgresSaver(pool)
+    try:
+        await checkpointer.setup()
+    except (
+        psycopg.errors.DuplicateColumn,
+        psycopg.errors.ActiveSqlTransaction,
+    ):
+        logger.warning("Skipping checkpointer setup — already configured.")
+    return checkpointer
 
 
 @asynccontextmanager
@@ -17,8 +37,9 @@ async def checkpointer_context(
     """
     Async context manager that sets up and yields a LangGraph checkpointer.
 
-    Uses a psycopg async connection pool to initialize AsyncPostgresSaver.
-    Skips setup if checkpointer is already configured.
+    Opens a dedicated connection pool for the duration of the context, so it
+    is meant for scripts and one-off jobs; requests use the shared
+    `checkpointer_pool` instead.
 
     Args:
         conn_str (str): PostgreSQL connection string.
@@ -26,18 +47,349 @@ async def checkpointer_context(
     Yields:
         AsyncPostgresSaver: The initialized checkpointer.
     """
-    # NOTE: LangGraph AsyncPostgresSaver does not support SQLAlchemy ORM Connections.
-    # A compatible psycopg connection is created via the connection pool to connect to the checkpointer.
     async with AsyncConnectionPool(
         conninfo=conn_str,
-        kwargs=dict(prepare_threshold=None),
+        kwargs=_CONNECTION_KWARGS,
     ) as pool:
-        checkpointer = AsyncPostgresSaver(pool)
+        yield await _setup_checkpointer(pool)
+
+
+class CheckpointerPool:
+    """
+    Application-lifetime connection pool and `AsyncPostgresSaver`.
+
+    Opened once in the FastAPI lifespan so requests reuse warm connections
+    and the checkpoint schema check runs once per process, not per request.
+    """
+
+    def __init__(
+        self,
+        conn_str: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 300.0,
+        timeout: float = 30.0,
+    ):
+        self.conn_str = conn_str
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._pool: AsyncConnectionPool | None = None
+        self._checkpointer: AsyncPostgresSaver | None = None
+
+    @property
+    def pool(self) -> AsyncConnectionPool:
+        if self._pool is None:
+            raise RuntimeError("Checkpointer pool is not open")
+        return self._pool
+
+    @property
+    def checkpointer(self) -> AsyncPostgresSaver:
+        if self._checkpointer is None:
+            raise RuntimeError("Checkpointer pool is not open")
+        return self._checkpointer
+
+    async def open(self) -> AsyncPostgresSaver:
+        """Opens the pool and sets up the checkpointer. Safe to call repeatedly."""
+        if self._checkpointer is not None:
+            return self._checkpointer
+        pool = AsyncConnectionPool(
+            conninfo=self.conn_str,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            max_idle=self.max_idle,
+            timeout=self.timeout,
+            kwargs=_CONNECTION_KWARGS,
+            open=False,
+        )
+        await pool.open(wait=True, timeout=self.timeout)
         try:
-            await checkpointer.setup()
-        except (
-            psycopg.errors.DuplicateColumn,
-            psycopg.errors.ActiveSqlTransaction,
-        ):
-            uvicorn.warning("Skipping checkpointer setup — already configured.")
-        yield checkpointer
+            checkpointer = await _setup_checkpointer(pool)
+        except BaseException:
+            await pool.close()
+            raise
+        self._pool, self._checkpointer = pool, checkpointer
+        logger.info(f"Checkpointer pool open (min_size={self.min_size}, max_size={self.max_size})")
+        return checkpointer
+
+    async def close(self) -> None:
+        pool, self._pool, self._checkpointer = self._pool, None, None
+        if pool is not None:
+            await pool.close()
+
+    def stats(self) -> dict[str, Any]:
+        if self._pool is None:
+            return {"open": False}
+        # pool_size, pool_available, requests_waiting, requests_num, usage_ms, ...
+        return {"open": True, **self._pool.get_stats()}
+
+
+checkpointer_pool = CheckpointerPool(
+    settings.checkpoint_conn_str,
+    min_size=settings.checkpoint_pool_min_size,
+    max_size=settings.checkpoint_pool_max_size,
+    max_idle=settings.checkpoint_pool_max_idle,
+    timeout=settings.checkpoint_pool_timeout,
+)
+
+
+# Superseded checkpoints of one thread: beyond the newest `keep` per namespace, or
+# older than `max_age` seconds. The newest checkpoint of a namespace is always kept
+# so the conversation can resume. Checkpoint ids are time-ordered, which is also
+# how AsyncPostgresSaver finds the latest one.
+_SUPERSEDED_CHECKPOINTS_SQL = """
+    SELECT thread_id, checkpoint_ns, checkpoint_id
+    FROM (
+        SELECT thread_id, checkpoint_ns, checkpoint_id, checkpoint ->> 'ts' AS ts,
+               row_number() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rank
+        FROM checkpoints
+        WHERE thread_id = %(thread_id)s
+    ) AS ranked
+    WHERE rank > 1
+      AND (
+          rank > %(keep)s
+          OR ts::timestamptz < now() - %(max_age)s::float8 * interval '1 second'
+      )
+    ORDER BY checkpoint_id
+    LIMIT %(batch_size)s
+"""
+
+PRUNE_CHECKPOINTS_SQL = f"""
+    WITH superseded AS ({_SUPERSEDED_CHECKPOINTS_SQL}),
+    deleted_writes AS (
+        DELETE FROM checkpoint_writes AS w
+        USING superseded AS s
+        WHERE w.thread_id = s.thread_id
+          AND w.checkpoint_ns = s.checkpoint_ns
+          AND w.checkpoint_id = s.checkpoint_id
+        RETURNING octet_length(w.blob) AS bytes
+    ),
+    deleted_checkpoints AS (
+        DELETE FROM checkpoints AS c
+        USING superseded AS s
+        WHERE c.thread_id = s.thread_id
+          AND c.checkpoint_ns = s.checkpoint_ns
+          AND c.checkpoint_id = s.checkpoint_id
+        RETURNING pg_column_size(c.checkpoint) + pg_column_size(c.metadata) AS bytes
+    )
+    SELECT
+        (SELECT count(*) FROM deleted_checkpoints),
+        (SELECT coalesce(sum(bytes), 0) FROM deleted_checkpoints),
+        (SELECT count(*) FROM deleted_writes),
+        (SELECT coalesce(sum(bytes), 0) FROM deleted_writes)
+"""
+
+# Channel values no remaining checkpoint of the thread points at
+PRUNE_BLOBS_SQL = """
+    WITH deleted AS (
+        DELETE FROM checkpoint_blobs
+        WHERE ctid IN (
+            SELECT b.ctid
+            FROM checkpoint_blobs AS b
+            WHERE b.thread_id = %(thread_id)s
+              AND NOT EXISTS (
+                  SELECT 1 FROM checkpoints AS c
+                  WHERE c.thread_id = b.thread_id
+                    AND c.checkpoint_ns = b.checkpoint_ns
+                    AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+              )
+            LIMIT %(batch_size)s
+        )
+        RETURNING coalesce(octet_length(blob), 0) AS bytes
+    )
+    SELECT count(*), coalesce(sum(bytes), 0) FROM deleted
+"""
+
+# Pending writes whose checkpoint is gone (e.g. left behind by an interrupted run)
+PRUNE_ORPHAN_WRITES_SQL = """
+    WITH deleted AS (
+        DELETE FROM checkpoint_writes
+        WHERE ctid IN (
+            SELECT w.ctid
+            FROM checkpoint_writes AS w
+            WHERE w.thread_id = %(thread_id)s
+              AND NOT EXISTS (
+                  SELECT 1 FROM checkpoints AS c
+                  WHERE c.thread_id = w.thread_id
+                    AND c.checkpoint_ns = w.checkpoint_ns
+                    AND c.checkpoint_id = w.checkpoint_id
+              )
+            LIMIT %(batch_size)s
+        )
+        RETURNING octet_length(blob) AS bytes
+    )
+    SELECT count(*), coalesce(sum(bytes), 0) FROM deleted
+"""
+
+
+CHECKPOINT_TABLES = ("checkpoints", "checkpoint_writes", "checkpoint_blobs")
+
+
+@dataclass
+class PruneResult:
+    """Rows and bytes deleted per checkpoint table."""
+
+    rows: dict[str, int] = field(default_factory=lambda: dict.fromkeys(CHECKPOINT_TABLES, 0))
+    bytes: dict[str, int] = field(default_factory=lambda: dict.fromkeys(CHECKPOINT_TABLES, 0))
+
+    def add(self, table: str, rows: int, size: int) -> None:
+        self.rows[table] += rows
+        self.bytes[table] += size
+
+    def merge(self, other: "PruneResult") -> None:
+        for table in CHECKPOINT_TABLES:
+            self.add(table, other.rows[table], other.bytes[table])
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rows": dict(self.rows),
+            "bytes": dict(self.bytes),
+            "total_rows": sum(self.rows.values()),
+            "total_bytes": sum(self.bytes.values()),
+        }
+
+
+async def _delete_in_batches(
+    pool: AsyncConnectionPool,
+    sql: str,
+    params: dict[str, Any],
+    on_batch,
+    pause: float,
+) -> None:
+    # One short transaction per batch, with a pause in between so foreground
+    # queries are never queued behind pruning for long
+    while True:
+        async with pool.connection() as conn:
+            row = await (await conn.execute(sql, params)).fetchone()
+        if on_batch(row) < params["batch_size"]:
+            return
+        await asyncio.sleep(pause)
+
+
+async def prune_thread(
+    pool: AsyncConnectionPool,
+    thread_id: str,
+    keep_last: int,
+    max_age: float | None = None,
+    batch_size: int = 500,
+    pause: float = 0.05,
+    orphans: bool = False,
+) -> PruneResult:
+    """
+    Deletes the superseded checkpoints of one thread with their writes, then
+    the blobs no remaining checkpoint references.
+
+    Args:
+        keep_last: Checkpoints to keep per namespace.
+        max_age: Also delete superseded checkpoints older than this many seconds.
+        orphans: Also delete writes whose checkpoint no longer exists.
+    """
+    result = PruneResult()
+    params = {"thread_id": thread_id, "keep": keep_last, "max_age": max_age, "batch_size": batch_size}
+
+    def checkpoints_batch(row) -> int:
+        checkpoints, checkpoint_bytes, writes, write_bytes = row
+        result.add("checkpoints", checkpoints, checkpoint_bytes)
+        result.add("checkpoint_writes", writes, write_bytes)
+        return checkpoints
+
+    def table_batch(table: str):
+        def on_batch(row) -> int:
+            result.add(table, row[0], row[1])
+            return row[0]
+        return on_batch
+
+    await _delete_in_batches(pool, PRUNE_CHECKPOINTS_SQL, params, checkpoints_batch, pause)
+    if orphans:
+        await _delete_in_batches(pool, PRUNE_ORPHAN_WRITES_SQL, params, table_batch("checkpoint_writes"), pause)
+    await _delete_in_batches(pool, PRUNE_BLOBS_SQL, params, table_batch("checkpoint_blobs"), pause)
+    return result
+
+
+class CheckpointPruner:
+    """
+    Keeps the last `keep_last` checkpoints of each thread.
+
+    Runs record the threads they wrote to with `touch()`; a background task
+    prunes those threads in small batches (see `prune_thread`). Threads then
+    stay bounded, and loading the latest checkpoint costs the same however
+    much traffic the database has seen.
+    """
+
+    def __init__(
+        self,
+        pool: CheckpointerPool,
+        keep_last: int = 20,
+        batch_size: int = 500,
+        interval: float = 10.0,
+        pause: float = 0.05,
+    ):
+        self._checkpointer_pool = pool
+        self.keep_last = keep_last
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+        self._pending: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self._pruned = PruneResult()
+        self._last_error: str | None = None
+
+    def touch(self, thread_id: str) -> None:
+        """Marks a thread as written to; it is pruned on the next pass."""
+        self._pending.add(thread_id)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="checkpoint-pruner")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def prune_thread(self, thread_id: str) -> PruneResult:
+        """Prunes one thread down to `keep_last` checkpoints."""
+        result = await prune_thread(
+            self._checkpointer_pool.pool,
+            thread_id,
+            keep_last=self.keep_last,
+            batch_size=self.batch_size,
+            pause=self.pause,
+        )
+        self._pruned.merge(result)
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            threads, self._pending = self._pending, set()
+            for thread_id in threads:
+                try:
+                    await self.prune_thread(thread_id)
+                except Exception as e:
+                    self._last_error = repr(e)
+                    logger.warning(f"Failed to prune checkpoints of thread {thread_id}: {e!r}")
+                    self._pending.add(thread_id)
+                await asyncio.sleep(self.pause)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "keep_last": self.keep_last,
+            "pending_threads": len(self._pending),
+            "pruned": self._pruned.as_dict(),
+            "last_error": self._last_error,
+        }
+
+
+checkpoint_pruner = CheckpointPruner(
+    checkpointer_pool,
+    keep_last=settings.checkpoint_keep_last,
+    batch_size=settings.checkpoint_prune_batch_size,
+    interval=settings.checkpoint_prune_interval,
+)
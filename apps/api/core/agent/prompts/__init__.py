@@ -1,9 +1,15 @@
 import os
 
 
-def read_system_prompt():
-    with open(os.path.join(os.path.dirname(__file__), "system.md"), "r") as f:
+def read_prompt(name: str):
+    with open(os.path.join(os.path.dirname(__file__), f"{name}.md"), "r") as f:
         return f.read()
 
 
+def read_system_prompt():
+    return read_prompt("system")
+
+
 SYSTEM_PROMPT = read_system_prompt()
+SUMMARY_PROMPT = read_prompt("summary")
+TEAM_MERGE_PROMPT = read_prompt("team_merge")
@@ -0,0 +1,133 @@
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolCall, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+
+from api.core.config import settings
+from api.core.logs import get_logger
+from api.core.telemetry import TOOL_CALL_SECONDS
+
+logger = get_logger(__name__)
+
+
+class ToolExecutor:
+    """
+    Runs the tool calls of one model turn concurrently.
+
+    At most `max_concurrency` calls of a turn run at once and each call gets
+    its own `timeout`, so a turn takes as long as its slowest call rather
+    than the sum of all of them. Results come back as `ToolMessage`s in the
+    order of the calls. A failing, timed out or unknown tool becomes an error
+    `ToolMessage` for the model to react to instead of failing the turn;
+    cancelling the turn cancels every call still running.
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._turns = 0
+        self._calls = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._call_seconds = 0.0
+        self._turn_seconds = 0.0
+
+    async def run(
+        self,
+        tool_calls: Sequence[ToolCall],
+        tools: Sequence[BaseTool],
+        config: RunnableConfig | None = None,
+    ) -> list[ToolMessage]:
+        """Executes `tool_calls` and returns their results in call order."""
+        by_name = {tool.name: tool for tool in tools}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(call: ToolCall) -> ToolMessage:
+            async with semaphore:
+                return await self._call(by_name.get(call["name"]), call, config)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_one(call) for call in tool_calls))
+        with self._lock:
+            self._turns += 1
+            self._turn_seconds += time.perf_counter() - started
+        return list(results)
+
+    async def _call(
+        self,
+        tool: BaseTool | None,
+        call: ToolCall,
+        config: RunnableConfig | None,
+    ) -> ToolMessage:
+        started = time.perf_counter()
+        timed_out = failed = False
+        try:
+            if tool is None:
+                failed = True
+                return self._error(call, f"Error: unknown tool {call['name']!r}")
+            result = await asyncio.wait_for(tool.ainvoke({**call, "type": "tool_call"}, config), self.timeout)
+            if isinstance(result, ToolMessage):
+                return result
+            return ToolMessage(content=str(result), name=call["name"], tool_call_id=call["id"])
+        except asyncio.TimeoutError:
+            timed_out = failed = True
+            return self._error(call, f"Error: tool {call['name']!r} timed out after {self.timeout:g}s")
+        except Exception as e:
+            failed = True
+            logger.warning(f"Tool {call['name']!r} failed: {e!r}")
+            return self._error(call, f"Error: {e!r}")
+        finally:
+            elapsed = time.perf_counter() - started
+            # Unknown names come from the model, so they share one label
+            TOOL_CALL_SECONDS.labels(tool=call["name"] if tool is not None else "unknown").observe(elapsed)
+            with self._lock:
+                self._calls += 1
+                self._errors += failed
+                self._timeouts += timed_out
+                self._call_seconds += elapsed
+
+    @staticmethod
+    def _error(call: ToolCall, content: str) -> ToolMessage:
+        return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"], status="error")
+
+    async def node(
+        self,
+        state: dict[str, Any],
+        config: RunnableConfig,
+        tools: Sequence[BaseTool],
+    ) -> dict[str, Any]:
+        """Graph node running the tool calls of the last AI message (bind `tools` with functools.partial)."""
+        messages: Sequence[BaseMessage] = state["messages"]
+        last = messages[-1] if messages else None
+        if not isinstance(last, AIMessage) or not last.tool_calls:
+            return dict(messages=[])
+        return dict(messages=await self.run(last.tool_calls, tools, config))
+
+    def bind(self, tools: Sequence[BaseTool]) -> functools.partial:
+        return functools.partial(self.node, tools=list(tools))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "timeout": self.timeout,
+                "turns": self._turns,
+                "calls": self._calls,
+                "errors": self._errors,
+                "timeouts": self._timeouts,
+                "call_seconds_total": round(self._call_seconds, 6),
+                # Turn time is the slowest call; the gap to call time is what concurrency saved
+                "turn_seconds_total": round(self._turn_seconds, 6),
+            }
+
+
+tool_executor = ToolExecutor(
+    max_concurrency=settings.tool_max_concurrency,
+    timeout=settings.tool_call_timeout,
+)
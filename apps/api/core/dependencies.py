@@ -2,30 +2,46 @@ from contextlib import asynccontextmanager
 from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends
-from langchain_mcp_adapters.tools import load_mcp_tools
 from langchain_openai import ChatOpenAI
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from api.core.agent.persistence import checkpointer_context
+from api.core.agent.persistence import checkpointer_pool
 from api.core.config import settings
-from api.core.mcps import mcp_sse_client
+from api.core.llm_cache import CachedChatOpenAI, ResponseCache
+from api.core.mcps import mcp_client_manager
 from api.core.models import Resource
+from api.core.telemetry import instrument_engine, llm_metrics
 
 
 def get_llm() -> ChatOpenAI:
-    return ChatOpenAI(
+    params = dict(
         streaming=True,
         model=settings.model,
         temperature=0,
         api_key=settings.openai_api_key,
         stream_usage=True,
+        callbacks=[llm_metrics],  # request and time-to-first-token histograms
     )
+    if settings.llm_cache_enabled:
+        return CachedChatOpenAI(**params, response_cache=llm_response_cache)
+    return ChatOpenAI(**params)
 
 
 LLMDep = Annotated[ChatOpenAI, Depends(get_llm)]
 
 
-engine: AsyncEngine = create_async_engine(settings.orm_conn_str)
+engine: AsyncEngine = create_async_engine(
+    settings.orm_conn_str,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+)
+instrument_engine(engine)
 
 
 def get_engine() -> AsyncEngine:
@@ -35,15 +51,36 @@ def get_engine() -> AsyncEngine:
 EngineDep = Annotated[AsyncEngine, Depends(get_engine)]
 
 
+# The shared tier lives in Postgres (see migrations/0004_llm_response_cache.sql)
+llm_response_cache = ResponseCache(
+    engine=engine if settings.llm_cache_shared and engine.dialect.name == "postgresql" else None,
+    max_entries=settings.llm_cache_max_entries,
+    ttl=settings.llm_cache_ttl,
+)
+
+
+# NOTE: expire_on_commit=False keeps committed ORM objects readable
+# without an implicit (blocking) refresh when responses are serialized.
+async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession]:
+    async with async_session_maker() as session:
+        yield session
+
+
+DBSessionDep = Annotated[AsyncSession, Depends(get_db)]
+
+
 @asynccontextmanager
 async def setup_graph() -> AsyncGenerator[Resource]:
-    async with checkpointer_context(
-        settings.checkpoint_conn_str
-    ) as checkpointer:
-        async with mcp_sse_client() as session:
-            tools = await load_mcp_tools(session)
-            yield Resource(
-                checkpointer=checkpointer,
-                tools=tools,
-                session=session,
-            )
+    # The checkpointer and its pool are shared for the application lifetime
+    # and so is the MCP session with its cached tool catalog
+    checkpointer = checkpointer_pool.checkpointer
+    session = await mcp_client_manager.session()
+    tools = await mcp_client_manager.tools()
+    yield Resource(
+        checkpointer=checkpointer,
+        tools=tools,
+        session=session,
+    )
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import (
+    AIMessageChunk,
+    BaseMessage,
+    message_chunk_to_message,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.messages.tool import tool_call_chunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+from pydantic import Field
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.core.logs import get_logger
+
+logger = get_logger(__name__)
+
+# USD per million (input, output) tokens, matched by model name prefix
+MODEL_PRICES_PER_MILLION = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "o3-mini": (1.10, 4.40),
+}
+
+# Parameters that don't change the response, so streamed and invoked calls share entries
+_IGNORED_PARAMS = {"stream", "streaming", "stream_usage", "stream_options", "api_key", "openai_api_key"}
+
+_GET_SQL = text(
+    "SELECT model, response FROM llm_response_cache WHERE key = :key AND expires_at > now()"
+)
+_PUT_SQL = text(
+    "INSERT INTO llm_response_cache (key, model, response, expires_at)"
+    " VALUES (:key, :model, CAST(:response AS jsonb), now() + :ttl * interval '1 second')"
+    " ON CONFLICT (key) DO UPDATE SET response = EXCLUDED.response, expires_at = EXCLUDED.expires_at"
+)
+_PURGE_SQL = text(
+    "DELETE FROM llm_response_cache WHERE key IN"
+    " (SELECT key FROM llm_response_cache WHERE expires_at <= now() LIMIT 1000)"
+)
+
+
+def _price(model: str) -> tuple[float, float]:
+    for prefix in sorted(MODEL_PRICES_PER_MILLION, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_PRICES_PER_MILLION[prefix]
+    return (0.0, 0.0)
+
+
+def _normalize_message(message: BaseMessage) -> dict[str, Any]:
+    # Message ids are per-run and don't affect the response
+    normalized: dict[str, Any] = {"type": message.type, "content": message.content}
+    for attr in ("name", "tool_call_id"):
+        if getattr(message, attr, None):
+            normalized[attr] = getattr(message, attr)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        normalized["tool_calls"] = [
+            {"name": call["name"], "args": call["args"], "id": call.get("id")} for call in tool_calls
+        ]
+    return normalized
+
+
+def _as_chunk(message: BaseMessage) -> AIMessageChunk:
+    # Responses stored by a non-streaming call are whole AIMessages
+    if isinstance(message, AIMessageChunk):
+        return message
+    return AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        usage_metadata=getattr(message, "usage_metadata", None),
+        tool_call_chunks=[
+            tool_call_chunk(name=call["name"], args=json.dumps(call["args"]), id=call.get("id"), index=i)
+            for i, call in enumerate(getattr(message, "tool_calls", None) or [])
+        ],
+    )
+
+
+class ResponseCache:
+    """
+    Two-tier cache of chat model responses.
+
+    Entries are keyed by a hash of the model parameters, messages, stop
+    sequences and bound tools, and hold the response as the list of chunks it
+    was streamed in, so a hit can be replayed to streaming callers as well as
+    returned whole to `invoke`. The in-process LRU tier answers repeats within
+    a worker; the optional Postgres tier (`llm_response_cache` table, see
+    migrations/0004) shares entries across workers until their TTL expires.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine | None = None,
+        max_entries: int = 1024,
+        ttl: float = 86400.0,
+    ):
+        self._engine = engine
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._shared_errors = 0
+        self._tokens_saved = {"input": 0, "output": 0}
+        self._cost_saved = 0.0
+
+    def key(
+        self,
+        llm: ChatOpenAI,
+        messages: list[BaseMessage],
+        stop: list[str] | None,
+        kwargs: dict[str, Any],
+    ) -> str:
+        params = {k: v for k, v in llm._identifying_params.items() if k not in _IGNORED_PARAMS}
+        payload = {
+            "params": params,
+            "stop": stop,
+            "kwargs": {k: v for k, v in kwargs.items() if k not in _IGNORED_PARAMS},
+            "messages": [_normalize_message(m) for m in messages],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    async def aget(self, key: str) -> list[BaseMessage] | None:
+        """The cached chunks for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return self._hit(entry[1], entry[2])
+
+        if self._engine is not None:
+            try:
+                async with self._engine.connect() as conn:
+                    row = (await conn.execute(_GET_SQL, {"key": key})).first()
+            except Exception as e:
+                self._shared_errors += 1
+                logger.warning(f"LLM cache lookup failed: {e!r}")
+                row = None
+            if row is not None:
+                model, chunks = row
+                chunks = chunks if isinstance(chunks, list) else json.loads(chunks)
+                self._remember(key, model, chunks)
+                with self._lock:
+                    self._shared_hits += 1
+                    return self._hit(model, chunks)
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    async def aput(self, key: str, model: str, chunks: list[BaseMessage]) -> None:
+        stored = []
+        for chunk in chunks:
+            data = message_to_dict(chunk)
+            data["data"]["id"] = None # Replays get the id of the run replaying them
+            stored.append(data)
+        self._remember(key, model, stored)
+        with self._lock:
+            self._stores += 1
+            purge = self._stores % 1000 == 0
+
+        if self._engine is not None:
+            try:
+                async with self._engine.begin() as conn:
+                    await conn.execute(_PUT_SQL, {
+                        "key": key,
+                        "model": model,
+                        "response": json.dumps(stored),
+                        "ttl": self.ttl,
+                    })
+                    if purge:
+                        await conn.execute(_PURGE_SQL)
+            except Exception as e:
+                self._shared_errors += 1
+                logger.warning(f"LLM cache store failed: {e!r}")
+
+    def _remember(self, key: str, model: str, chunks: list[dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, model, chunks)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _hit(self, model: str, chunks: list[dict]) -> list[BaseMessage]:
+        # Called with the lock held
+        messages = messages_from_dict(chunks)
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        for message in messages:
+            for name in usage:
+                usage[name] += (getattr(message, "usage_metadata", None) or {}).get(name, 0)
+        input_price, output_price = _price(model)
+        self._tokens_saved["input"] += usage["input_tokens"]
+        self._tokens_saved["output"] += usage["output_tokens"]
+        self._cost_saved += (usage["input_tokens"] * input_price + usage["output_tokens"] * output_price) / 1_000_000
+        return messages
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits = self._memory_hits + self._shared_hits
+            lookups = hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "shared": self._engine is not None,
+                "memory_hits": self._memory_hits,
+                "shared_hits": self._shared_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "shared_errors": self._shared_errors,
+                "tokens_saved": dict(self._tokens_saved),
+                "cost_saved_usd": round(self._cost_saved, 6),
+            }
+
+
+class CachedChatOpenAI(ChatOpenAI):
+    """`ChatOpenAI` that answers repeated requests from a `ResponseCache`.
+
+    Cached responses are replayed chunk by chunk to streaming callers (with
+    the same token callbacks a live stream produces) and returned whole to
+    `invoke`. Only complete responses are stored.
+    """
+
+    response_cache: Any = Field(default=None, exclude=True)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = self.response_cache.key(self, messages, stop, kwargs)
+        cached = await self.response_cache.aget(key)
+        if cached is not None:
+            for message in cached:
+                chunk = ChatGenerationChunk(message=_as_chunk(message))
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            return
+
+        chunks = []
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            chunks.append(chunk.message)
+            yield chunk
+        await self.response_cache.aput(key, self.model_name, chunks)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.streaming:
+            # ChatOpenAI generates through _astream, which does the caching
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        key = self.response_cache.key(self, messages, stop, kwargs)
+        cached = await self.response_cache.aget(key)
+        if cached is not None:
+            message = cached[0]
+            for chunk in cached[1:]:
+                message = message + chunk
+            return ChatResult(generations=[ChatGeneration(message=message_chunk_to_message(message))])
+
+        result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        await self.response_cache.aput(key, self.model_name, [result.generations[0].message])
+        return result
@@ -1,7 +1,7 @@
 import logging
 import os
 import sys
-from python_json_logger import jsonlogger
+from pythonjsonlogger import jsonlogger
 
 # Determine the desired log level from environment variable
 # Default to INFO if not set or invalid
@@ -1,10 +1,28 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
-from mcp import ClientSession
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp import ClientSession, types
 from mcp.client.sse import sse_client
 
 from api.core.config import settings
+from api.core.logs import get_logger
+
+logger = get_logger(__name__)
+
+# Extra field of a listed tool declaring its results cacheable, {"ttl": seconds};
+# set by the MCP server (packages/shared_mcp/caching.py), which this app doesn't import
+CACHE_FIELD = "cache"
+
+
+def mcp_server_url() -> str:
+    return f"http://mcp:{settings.mcp_server_port}/sse"
 
 
 @asynccontextmanager
@@ -13,15 +31,292 @@ async def mcp_sse_client() -> AsyncGenerator[ClientSession]:
     Creates and initializes an MCP client session over SSE.
 
     Establishes an SSE connection to the MCP server and yields an initialized
-    `ClientSession` for communication.
+    `ClientSession` for communication. Requests should use the shared
+    `mcp_client_manager` instead; this is for scripts and one-off jobs.
 
     Yields:
         ClientSession: An initialized MCP client session.
     """
-    async with sse_client(f"http://mcp:{settings.mcp_server_port}/sse") as (
+    async with sse_client(mcp_server_url()) as (
         read_stream,
         write_stream,
     ):
         async with ClientSession(read_stream, write_stream) as session:
             await session.initialize()
             yield session
+
+
+class ToolResultCache:
+    """
+    Bounded LRU of results of tools the server declared cacheable.
+
+    Tools opt in at registration (`@mcp.tool(cache_ttl=...)`, see
+    shared_mcp.caching) and their TTL arrives with the catalog. Calls with
+    identical arguments within the TTL are answered without a round trip to
+    the server; error results are never cached.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._ttls: dict[str, float] = {}
+        self._entries: OrderedDict[tuple[str, str], tuple[float, types.CallToolResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    def configure(self, tools: list[types.Tool]) -> None:
+        """Takes the TTLs from a freshly listed catalog and drops every cached result."""
+        ttls = {}
+        for tool in tools:
+            ttl = ((tool.model_extra or {}).get(CACHE_FIELD) or {}).get("ttl")
+            if ttl:
+                ttls[tool.name] = float(ttl)
+        with self._lock:
+            self._ttls = ttls
+            self._entries.clear()
+
+    def cacheable(self, name: str) -> bool:
+        return name in self._ttls
+
+    @staticmethod
+    def _key(name: str, arguments: dict[str, Any] | None) -> tuple[str, str]:
+        return name, json.dumps(arguments or {}, sort_keys=True, default=str)
+
+    def get(self, name: str, arguments: dict[str, Any] | None) -> types.CallToolResult | None:
+        key = self._key(name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits[name] = self._hits.get(name, 0) + 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._misses[name] = self._misses.get(name, 0) + 1
+        return None
+
+    def put(self, name: str, arguments: dict[str, Any] | None, result: types.CallToolResult) -> None:
+        if result.isError or name not in self._ttls:
+            return
+        with self._lock:
+            key = self._key(name, arguments)
+            self._entries[key] = (time.monotonic() + self._ttls[name], result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "tools": {
+                    name: {
+                        "ttl": ttl,
+                        "hits": self._hits.get(name, 0),
+                        "misses": self._misses.get(name, 0),
+                    }
+                    for name, ttl in self._ttls.items()
+                },
+            }
+
+
+class _ManagedSession:
+    """
+    Stand-in `ClientSession` for LangChain tools built from the catalog.
+
+    Tools keep a reference to the session they were converted with; routing
+    their calls through the manager lets them survive reconnects.
+    """
+
+    def __init__(self, manager: "MCPClientManager"):
+        self._manager = manager
+
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None) -> types.CallToolResult:
+        return await self._manager.call_tool(name, arguments)
+
+
+class MCPClientManager:
+    """
+    Long-lived MCP client session shared by all requests.
+
+    A supervisor task owns the SSE connection (anyio transports must be
+    entered and exited by the same task), reconnects with exponential backoff
+    when it drops, and pings the server to notice dead connections. The
+    `ClientSession` multiplexes concurrent requests by request id, so graph
+    runs share it without extra locking.
+
+    The tool catalog is loaded once per connection and reloaded only when
+    the server sends `notifications/tools/list_changed`. Results of tools the
+    server declares cacheable are served from `tool_cache` while fresh.
+    """
+
+    def __init__(
+        self,
+        url_factory=mcp_server_url,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        ping_interval: float = 30.0,
+        connect_timeout: float = 10.0,
+        tool_cache_size: int = 1024,
+    ):
+        self._url_factory = url_factory
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.ping_interval = ping_interval
+        self.connect_timeout = connect_timeout
+        self._session: ClientSession | None = None
+        self._connected = asyncio.Event()
+        self._disconnected = asyncio.Event()
+        self._supervisor: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._closing = False
+        self._tools: list[BaseTool] = []
+        self._tool_listeners: list = []
+        self._proxy = _ManagedSession(self)
+        self.tool_cache = ToolResultCache(max_entries=tool_cache_size)
+        self._connects = 0
+        self._catalog_refreshes = 0
+        self._last_error: str | None = None
+
+    async def start(self) -> None:
+        """Starts connecting in the background; does not wait for the server."""
+        if self._supervisor is None:
+            self._closing = False
+            self._supervisor = asyncio.create_task(self._supervise(), name="mcp-client-manager")
+
+    async def close(self) -> None:
+        self._closing = True
+        self._disconnected.set()
+        for task in (self._refresh_task, self._supervisor):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._refresh_task = self._supervisor = None
+
+    def on_tools_changed(self, listener) -> None:
+        """Registers `listener(old_tools, new_tools)`, called after the catalog is reloaded."""
+        self._tool_listeners.append(listener)
+
+    async def session(self) -> ClientSession:
+        """Returns the connected session, waiting up to `connect_timeout` for a (re)connect."""
+        if self._supervisor is None:
+            await self.start()
+        if not self._connected.is_set():
+            try:
+                await asyncio.wait_for(self._connected.wait(), timeout=self.connect_timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"MCP server is not connected: {self._last_error}") from None
+        return self._session
+
+    async def tools(self) -> list[BaseTool]:
+        """Returns the cached LangChain tools for the current catalog."""
+        await self.session()
+        return self._tools
+
+    async def list_tools(self) -> list[types.Tool]:
+        session = await self.session()
+        return (await session.list_tools()).tools
+
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None) -> types.CallToolResult:
+        if self.tool_cache.cacheable(name):
+            cached = self.tool_cache.get(name, arguments)
+            if cached is not None:
+                return cached
+        session = await self.session()
+        result = await session.call_tool(name, arguments)
+        self.tool_cache.put(name, arguments, result)
+        return result
+
+    async def _supervise(self) -> None:
+        backoff = self.initial_backoff
+        while not self._closing:
+            try:
+                await self._connect_once()
+                backoff = self.initial_backoff
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = repr(e)
+                logger.warning(f"MCP connection failed, retrying in {backoff:.1f}s: {e!r}")
+            finally:
+                self._session = None
+                self._connected.clear()
+            if self._closing:
+                break
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _connect_once(self) -> None:
+        self._disconnected.clear()
+        async with sse_client(self._url_factory()) as (read_stream, write_stream):
+            async with ClientSession(
+                read_stream, write_stream, message_handler=self._handle_message
+            ) as session:
+                await asyncio.wait_for(session.initialize(), timeout=self.connect_timeout)
+                await self._load_tools(session)
+                self._session = session
+                self._connects += 1
+                self._last_error = None
+                self._connected.set()
+                logger.info(f"MCP session connected ({len(self._tools)} tools)")
+                await self._keepalive(session)
+
+    async def _keepalive(self, session: ClientSession) -> None:
+        """Returns when the connection is lost or the manager is closing."""
+        while not self._disconnected.is_set():
+            try:
+                await asyncio.wait_for(self._disconnected.wait(), timeout=self.ping_interval)
+            except asyncio.TimeoutError:
+                await asyncio.wait_for(session.send_ping(), timeout=self.connect_timeout)
+
+    async def _handle_message(self, message) -> None:
+        if isinstance(message, Exception):
+            # The transport reports read errors in-band before its stream closes
+            self._last_error = repr(message)
+            self._disconnected.set()
+        elif isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            # Can't await a request from inside the receive loop that would read its response
+            session = self._session
+            if session is not None:
+                self._refresh_task = asyncio.create_task(self._refresh_tools(session))
+
+    async def _refresh_tools(self, session: ClientSession) -> None:
+        try:
+            await self._load_tools(session)
+        except Exception as e:
+            logger.warning(f"Failed to refresh MCP tool catalog: {e!r}")
+
+    async def _load_tools(self, session: ClientSession) -> None:
+        listed = (await session.list_tools()).tools
+        old_tools = self._tools
+        self.tool_cache.configure(listed)
+        self._tools = [convert_mcp_tool_to_langchain_tool(self._proxy, tool) for tool in listed]
+        self._catalog_refreshes += 1
+        for listener in self._tool_listeners:
+            listener(old_tools, self._tools)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self._connected.is_set(),
+            "connects": self._connects,
+            "reconnects": max(self._connects - 1, 0),
+            "tools": len(self._tools),
+            "catalog_refreshes": self._catalog_refreshes,
+            "last_error": self._last_error,
+            "tool_cache": self.tool_cache.stats(),
+        }
+
+
+mcp_client_manager = MCPClientManager(
+    initial_backoff=settings.mcp_reconnect_initial_backoff,
+    max_backoff=settings.mcp_reconnect_max_backoff,
+    ping_interval=settings.mcp_ping_interval,
+    connect_timeout=settings.mcp_connect_timeout,
+    tool_cache_size=settings.mcp_tool_cache_size,
+)
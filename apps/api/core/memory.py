@@ -0,0 +1,184 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from mem0 import Memory
+
+from api.core.config import settings
+from api.core.logs import get_logger
+from api.core.telemetry import MEMORY_ADD_SECONDS, MEMORY_SEARCH_SECONDS
+
+logger = get_logger(__name__)
+
+# Attributes of `Memory` that own backend clients, in the order they are closed.
+# Only public close methods: Neo4jGraph.close() shuts its driver down. Neither
+# the Neo4j driver nor the Qdrant client reports pool usage publicly, so
+# `stats` counts clients rather than connections.
+_BACKENDS = ("graph", "vector_store", "embedding_model", "llm", "db")
+_CLOSERS = (
+    "graph.graph.close",
+    "vector_store.client.close",
+    "db.connection.close",
+)
+
+
+def build_memory_config() -> dict[str, Any]:
+    """Builds the mem0 configuration from application settings."""
+    return {
+        "vector_store": {
+            "provider": "qdrant",
+            "config": {
+                "host": settings.qdrant_host,
+                "port": settings.qdrant_port,
+            },
+        },
+        "graph_store": {
+            "provider": "neo4j",
+            "config": {
+                "url": settings.neo4j_uri,
+                "username": settings.neo4j_username,
+                "password": settings.neo4j_password,
+            },
+        },
+        # LLM and embedder fall back to the mem0 defaults (OpenAI)
+    }
+
+
+def _resolve(obj: Any, path: str) -> Any:
+    for attr in path.split("."):
+        obj = getattr(obj, attr, None)
+        if obj is None:
+            return None
+    return obj
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryHandle:
+    """
+    A view of the shared `Memory` bound to a user and/or a conversation.
+
+    Handles hold no connections of their own and are cheap to create per request.
+    The `Memory` is resolved when a handle is used, so creating one never
+    blocks on or fails with the mem0 backends; call `add`/`search` off the
+    event loop.
+    """
+
+    registry: "MemoryRegistry"
+    user_id: str | None = None
+    conversation_id: str | None = None
+
+    @property
+    def memory(self) -> Memory:
+        return self.registry.open()
+
+    def add(self, messages: str | list[dict[str, str]], metadata: dict[str, Any] | None = None) -> Any:
+        with MEMORY_ADD_SECONDS.time():
+            return self.memory.add(
+                messages,
+                user_id=self.user_id,
+                run_id=self.conversation_id,
+                metadata=metadata,
+            )
+
+    def search(self, query: str, limit: int = 10) -> Any:
+        with MEMORY_SEARCH_SECONDS.time():
+            return self.memory.search(
+                query,
+                user_id=self.user_id,
+                run_id=self.conversation_id,
+                limit=limit,
+            )
+
+
+class MemoryRegistry:
+    """
+    Owns the process-wide mem0 `Memory` and the backend clients behind it.
+
+    `Memory.from_config` creates Qdrant and Neo4j clients, an embedder and an
+    LLM client. The registry builds them once and hands out scoped
+    `MemoryHandle`s that share them. The application lifespan tries to open it
+    up front; if Qdrant or Neo4j is down the API starts anyway and the
+    registry opens on first use. A failed open is not retried for
+    `retry_interval` seconds, so an outage costs callers one fast error
+    instead of a connection timeout each.
+    """
+
+    def __init__(self, config_factory: Callable[[], dict[str, Any]] = build_memory_config, retry_interval: float = 30.0):
+        self._config_factory = config_factory
+        self._retry_interval = retry_interval
+        self._memory: Memory | None = None
+        self._lock = threading.Lock()
+        self._handles_issued = 0
+        self._open_failures = 0
+        self._last_error: Exception | None = None
+        self._retry_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._memory is not None
+
+    def open(self) -> Memory:
+        """Creates the shared `Memory` if needed. Blocking; safe to call repeatedly.
+
+        Raises the backend error if it can't be created, or the last one
+        while waiting to retry.
+        """
+        with self._lock:
+            if self._memory is None:
+                if self._last_error is not None and time.monotonic() < self._retry_at:
+                    raise self._last_error
+                logger.info("Initializing shared mem0 Memory")
+                try:
+                    self._memory = Memory.from_config(config_dict=self._config_factory())
+                except Exception as e:
+                    self._open_failures += 1
+                    self._last_error = e
+                    self._retry_at = time.monotonic() + self._retry_interval
+                    raise
+                self._last_error = None
+            return self._memory
+
+    def try_open(self) -> bool:
+        """Like `open`, but logs a failure instead of raising it. Returns whether the registry is open."""
+        try:
+            self.open()
+        except Exception as e:
+            logger.warning(f"mem0 backends unavailable, memory will be opened on first use: {e!r}")
+            return False
+        return True
+
+    def scoped(self, user_id: str | None = None, conversation_id: str | None = None) -> MemoryHandle:
+        """Returns a handle scoped to `user_id` and/or `conversation_id`."""
+        if user_id is None and conversation_id is None:
+            raise ValueError("A memory handle needs a user_id or a conversation_id")
+        self._handles_issued += 1
+        return MemoryHandle(registry=self, user_id=user_id, conversation_id=conversation_id)
+
+    def close(self) -> None:
+        """Closes the backend clients. Handles issued earlier must not be used afterwards."""
+        with self._lock:
+            memory, self._memory = self._memory, None
+        if memory is None:
+            return
+        for path in _CLOSERS:
+            close = _resolve(memory, path)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Error closing mem0 backend {path}: {e}")
+        logger.info("Shared mem0 Memory closed")
+
+    def stats(self) -> dict[str, Any]:
+        memory = self._memory
+        return {
+            "open": memory is not None,
+            "clients": sum(_resolve(memory, name) is not None for name in _BACKENDS) if memory else 0,
+            "handles_issued": self._handles_issued,
+            "open_failures": self._open_failures,
+        }
+
+
+memory_registry = MemoryRegistry()
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Any
+
+from api.core.config import settings
+from api.core.logs import get_logger
+from api.core.memory import MemoryRegistry, memory_registry
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class MemoryWrite:
+    user_id: str
+    content: str
+    role: str = "user"
+    metadata: dict[str, Any] = field(default_factory=dict)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _merge_metadata(items: list[MemoryWrite]) -> dict[str, Any]:
+    """Keeps metadata shared by every item and collects the per-message ids."""
+    merged = dict(items[0].metadata)
+    for item in items[1:]:
+        merged = {k: v for k, v in merged.items() if item.metadata.get(k) == v}
+    merged.pop("message_id", None)
+    merged["message_ids"] = [
+        item.metadata["message_id"] for item in items if "message_id" in item.metadata
+    ]
+    return merged
+
+
+class MemoryWriteBehind:
+    """
+    Bounded write-behind queue for mem0 `add` calls.
+
+    Each `Memory.add` runs LLM entity extraction plus Neo4j and Qdrant writes,
+    so it is kept off the request path: callers `submit` and return at once,
+    and a single background worker drains the queue, batching consecutive
+    writes per user_id into one `add` call and retrying failures with
+    exponential backoff. A single worker keeps writes for a user in order.
+    """
+
+    def __init__(
+        self,
+        registry: MemoryRegistry,
+        max_queue_size: int = settings.memory_write_queue_size,
+        batch_size: int = settings.memory_write_batch_size,
+        max_retries: int = settings.memory_write_max_retries,
+        retry_backoff: float = settings.memory_write_retry_backoff,
+    ):
+        self._registry = registry
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._queue: asyncio.Queue[MemoryWrite] | None = None
+        self._worker: asyncio.Task | None = None
+        # Enqueue times of pending writes, oldest first, to report lag
+        self._pending: deque[float] = deque()
+        self._written = 0
+        self._failed = 0
+        self._dropped = 0
+        self._retries = 0
+        self._last_lag = 0.0
+
+    async def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._worker = asyncio.create_task(self._run(), name="memory-write-behind")
+
+    def submit(
+        self,
+        user_id: str,
+        content: str,
+        role: str = "user",
+        metadata: dict[str, Any] | None = None,
+    ) -> bool:
+        """Queues a memory addition. Never blocks; returns False if it was dropped."""
+        if self._queue is None:
+            logger.warning("Memory write-behind queue is not running; dropping memory write")
+            self._dropped += 1
+            return False
+        item = MemoryWrite(user_id=user_id, content=content, role=role, metadata=metadata or {})
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.warning(f"Memory write-behind queue full; dropping memory write for {user_id}")
+            self._dropped += 1
+            return False
+        self._pending.append(item.enqueued_at)
+        return True
+
+    async def close(self, timeout: float = settings.memory_write_flush_timeout) -> None:
+        """Flushes pending writes (up to `timeout` seconds) and stops the worker."""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Memory write-behind flush timed out with {self._queue.qsize()} writes pending")
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        self._queue = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                # Consecutive writes for the same user become one mem0 call
+                for user_id, items in groupby(batch, key=lambda item: item.user_id):
+                    await self._write(user_id, list(items))
+            finally:
+                self._last_lag = time.monotonic() - batch[0].enqueued_at
+                for _ in batch:
+                    self._pending.popleft()
+                    self._queue.task_done()
+
+    async def _write(self, user_id: str, items: list[MemoryWrite]) -> None:
+        handle = self._registry.scoped(user_id=user_id)
+        messages = [{"role": item.role, "content": item.content} for item in items]
+        metadata = _merge_metadata(items)
+        for attempt in range(self._max_retries + 1):
+            try:
+                await asyncio.to_thread(handle.add, messages, metadata)
+                self._written += len(items)
+                return
+            except Exception as e:
+                if attempt == self._max_retries:
+                    logger.error(f"Giving up on {len(items)} memory writes for {user_id}: {e}")
+                    self._failed += len(items)
+                    return
+                self._retries += 1
+                logger.warning(f"Memory write for {user_id} failed (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(self._retry_backoff * 2**attempt)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._worker is not None,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "lag_seconds": time.monotonic() - self._pending[0] if self._pending else 0.0,
+            "last_batch_lag_seconds": self._last_lag,
+            "written": self._written,
+            "failed": self._failed,
+            "dropped": self._dropped,
+            "retries": self._retries,
+        }
+
+
+memory_writer = MemoryWriteBehind(memory_registry)
@@ -0,0 +1,37 @@
+import bisect
+import threading
+from typing import Any, Sequence
+
+# Upper bounds in seconds, from a fast cache hit to a slow model run
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """
+    Cumulative bucket histogram of durations.
+
+    Observing is a bisect and two additions under a lock, cheap enough for
+    every request. Buckets follow the Prometheus convention: each count
+    includes all smaller observations and `+Inf` equals `count`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), counts):
+            running += count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": running, "sum": round(total, 6)}
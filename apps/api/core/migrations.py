@@ -0,0 +1,68 @@
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.core.logs import get_logger
+from api.models.base import Base
+# Imported for their side effect of registering tables on Base.metadata
+from api.models import agent_state, agent_team, conversation_message, evaluation_result, job  # noqa: F401
+
+logger = get_logger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# Arbitrary constant key so only one worker migrates at a time
+_MIGRATION_LOCK_KEY = 7_206_019_311
+
+
+async def run_migrations(engine: AsyncEngine) -> list[str]:
+    """
+    Brings the database schema up to date.
+
+    Missing tables are created from the ORM models, then the versioned SQL
+    files in `migrations/` that have not been applied yet are run in name
+    order and recorded in `schema_migrations`. Migrations are written to be
+    idempotent so they also apply cleanly on top of freshly created tables.
+
+    Returns:
+        list[str]: The versions applied by this call.
+    """
+    applied_now = []
+    async with engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            # Versioned migrations use PostgreSQL syntax; other backends (SQLite tests)
+            # get their schema from the models alone.
+            await conn.run_sync(Base.metadata.create_all)
+            return applied_now
+
+        # Taken before create_all so workers starting together don't race on CREATE TABLE/INDEX
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                " version text PRIMARY KEY,"
+                " applied_at timestamptz NOT NULL DEFAULT now())"
+            )
+        )
+        applied = set((await conn.execute(text("SELECT version FROM schema_migrations"))).scalars())
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            version = path.stem
+            if version in applied:
+                continue
+            logger.info(f"Applying migration {version}")
+            await conn.exec_driver_sql(path.read_text())
+            await conn.execute(
+                text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+                {"version": version},
+            )
+            applied_now.append(version)
+    return applied_now
+
+
+if __name__ == "__main__":
+    from api.core.dependencies import engine
+
+    print(asyncio.run(run_migrations(engine)))
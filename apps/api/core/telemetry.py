@@ -0,0 +1,210 @@
+import time
+from typing import Any, Callable, Iterable, Sequence
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.core.logs import get_logger
+from api.core.metrics import DEFAULT_BUCKETS
+
+logger = get_logger(__name__)
+
+# Queries are mostly well under the request buckets' 5ms floor
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Prometheus metrics served at /metrics. Hot paths observe into label children
+# bound once up front where the labels are known, so recording is a bisect
+# and an addition; gauges are read from the components at scrape time.
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], buckets=DEFAULT_BUCKETS,
+)
+GRAPH_NODE_SECONDS = Histogram(
+    "graph_node_duration_seconds", "LangGraph node execution time",
+    ["node"], buckets=DEFAULT_BUCKETS,
+)
+TOOL_CALL_SECONDS = Histogram(
+    "tool_call_duration_seconds", "Tool call time, including timeouts and errors",
+    ["tool"], buckets=DEFAULT_BUCKETS,
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "llm_time_to_first_token_seconds", "Time from a chat model request to its first streamed token",
+    ["model"], buckets=DEFAULT_BUCKETS,
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Total chat model request time",
+    ["model", "outcome"], buckets=DEFAULT_BUCKETS,
+)
+MEMORY_OPERATION_SECONDS = Histogram(
+    "memory_operation_duration_seconds", "mem0 operation time",
+    ["operation"], buckets=DEFAULT_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "ORM database statement time",
+    ["operation"], buckets=DB_BUCKETS,
+)
+
+MEMORY_ADD_SECONDS = MEMORY_OPERATION_SECONDS.labels(operation="add")
+MEMORY_SEARCH_SECONDS = MEMORY_OPERATION_SECONDS.labels(operation="search")
+_DB_OPERATIONS = {op: DB_QUERY_SECONDS.labels(operation=op.lower()) for op in ("SELECT", "INSERT", "UPDATE", "DELETE")}
+_DB_OTHER = DB_QUERY_SECONDS.labels(operation="other")
+
+
+# --- HTTP ---
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware observing each HTTP request into `HTTP_REQUEST_SECONDS`.
+
+    Requests are labelled with the matched route template (`/v1/agents/{agent_id}`),
+    never the raw path, so label cardinality stays bounded; unmatched paths
+    share one label. Streaming responses are timed until their last byte.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(time.perf_counter() - started)
+
+
+# --- Graph nodes ---
+
+def node_timer(node: str) -> Any:
+    """The `GRAPH_NODE_SECONDS` child of a node, to bind once where the node is added."""
+    return GRAPH_NODE_SECONDS.labels(node=node)
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """Wraps a `(state, config)` graph node so each execution is timed as `name`."""
+    timer = node_timer(name)
+
+    async def run(state: Any, config: Any) -> Any:
+        with timer.time():
+            return await node(state, config)
+    run.__name__ = name
+    return run
+
+
+# --- LLM calls ---
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    Times chat model requests: total time, and time to the first streamed token.
+
+    Runs inline on the event loop (no executor hop per token); the per-token
+    work is one dict lookup until the first token has been seen.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        # run_id -> [started, model, first token seen]
+        self._runs: dict[UUID, list] = {}
+
+    def on_chat_model_start(self, serialized: Any, messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        metadata = kwargs.get("metadata") or {}
+        model = metadata.get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model") or "unknown"
+        self._runs[run_id] = [time.perf_counter(), model, False]
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.get(run_id)
+        if run is not None and not run[2]:
+            run[2] = True
+            LLM_FIRST_TOKEN_SECONDS.labels(model=run[1]).observe(time.perf_counter() - run[0])
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "ok")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "error")
+
+    def _finish(self, run_id: UUID, outcome: str) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            LLM_REQUEST_SECONDS.labels(model=run[1], outcome=outcome).observe(time.perf_counter() - run[0])
+
+
+llm_metrics = LLMMetricsCallback()
+
+
+# --- Database ---
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Observes every statement `engine` executes into `DB_QUERY_SECONDS`."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        histogram = _DB_OPERATIONS.get(statement.lstrip()[:6].upper(), _DB_OTHER)
+        histogram.observe(time.perf_counter() - context._query_started)
+
+
+def pool_usage(engine: AsyncEngine) -> dict[str, int]:
+    """Connections of a QueuePool by state; empty for pools without accounting (SQLite)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {"checked_out": pool.checkedout(), "idle": pool.checkedin(), "overflow": max(pool.overflow(), 0)}
+
+
+# --- Gauges ---
+
+class StatsGauge:
+    """A gauge read at scrape time, so keeping it current costs the hot path nothing.
+
+    `read` returns a number, or a dict from label value(s) to number.
+    """
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Any], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.labelnames = list(labelnames)
+
+    def describe(self) -> Iterable[GaugeMetricFamily]:
+        return [GaugeMetricFamily(self.name, self.documentation, labels=self.labelnames)]
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        try:
+            values = self.read()
+        except Exception as e:
+            logger.warning(f"Failed to read gauge {self.name}: {e!r}")
+            return []
+        family = GaugeMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        if isinstance(values, dict):
+            for labels, value in values.items():
+                family.add_metric(labels if isinstance(labels, tuple) else (labels,), value)
+        else:
+            family.add_metric([], values)
+        return [family]
+
+
+def register_gauge(name: str, documentation: str, read: Callable[[], Any], labelnames: Sequence[str] = ()) -> StatsGauge:
+    gauge = StatsGauge(name, documentation, read, labelnames)
+    REGISTRY.register(gauge)
+    return gauge
@@ -0,0 +1,59 @@
+import asyncio
+import functools
+import json
+from typing import Any
+
+import tiktoken
+
+from api.core.config import settings
+from api.core.logs import get_logger
+
+logger = get_logger(__name__)
+
+# Per-message framing the chat format adds around role and content
+MESSAGE_OVERHEAD_TOKENS = 4
+# Encoding of model ids tiktoken doesn't know (yet)
+FALLBACK_ENCODING = "o200k_base"
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model: str) -> tiktoken.Encoding | None:
+    # Never raises: a failure would not be cached and every count would retry the download
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        # Encodings are downloaded on first use; without network fall back to an estimate
+        logger.warning(f"No tiktoken encoding for {model}, estimating token counts: {e!r}")
+        return None
+
+
+async def load_encoding(model: str | None = None) -> None:
+    """Loads the encoding of `model` (the configured chat model by default) off the event loop.
+
+    Called at startup, so counting on the request path never blocks on the
+    BPE file download.
+    """
+    await asyncio.to_thread(_encoding, model or settings.model)
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Tokens in `text` for `model` (the configured chat model by default)."""
+    encoding = _encoding(model or settings.model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(
+    content: str,
+    tool_calls: list[dict[str, Any]] | None = None,
+    model: str | None = None,
+) -> int:
+    """Approximate prompt tokens one stored message contributes."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(content or "", model)
+    if tool_calls:
+        tokens += count_tokens(json.dumps(tool_calls, default=str), model)
+    return tokens
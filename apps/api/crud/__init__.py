@@ -0,0 +1,4 @@
+# CRUD modules, imported so routers can write `crud.agent.get_agent`
+from . import agent, agent_state, conversation, evaluation_result, message, team
+
+__all__ = ["agent", "agent_state", "conversation", "evaluation_result", "message", "team"]
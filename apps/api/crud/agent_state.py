@@ -1,26 +1,26 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 import uuid
 
 from .. import models, schemas
 
-def get_agent_state(db: Session, state_id: uuid.UUID):
-    return db.get(models.AgentState, state_id)
+async def get_agent_state(db: AsyncSession, state_id: uuid.UUID):
+    return await db.get(models.AgentState, state_id)
 
-def get_agent_states_by_conversation(db: Session, conversation_id: uuid.UUID, agent_id: uuid.UUID = None, skip: int = 0, limit: int = 100):
+async def get_agent_states_by_conversation(db: AsyncSession, conversation_id: uuid.UUID, agent_id: uuid.UUID = None, skip: int = 0, limit: int = 100):
     query = select(models.AgentState).where(models.AgentState.conversation_id == conversation_id)
     if agent_id:
         query = query.where(models.AgentState.agent_id == agent_id)
-    result = db.execute(query.order_by(models.AgentState.updated_at.desc()).offset(skip).limit(limit))
+    result = await db.execute(query.order_by(models.AgentState.updated_at.desc()).offset(skip).limit(limit))
     return result.scalars().all()
 
-def create_or_update_agent_state(db: Session, state: schemas.AgentStateCreateOrUpdate):
+async def create_or_update_agent_state(db: AsyncSession, state: schemas.AgentStateCreateOrUpdate):
     # Check if state already exists for this agent in this conversation
-    existing_state = db.execute(
+    existing_state = (await db.execute(
         select(models.AgentState)
         .where(models.AgentState.conversation_id == state.conversation_id)
         .where(models.AgentState.agent_id == state.agent_id)
-    ).scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if existing_state:
         # Update existing state
@@ -33,16 +33,15 @@ def create_or_update_agent_state(db: Session, state: schemas.AgentStateCreateOrU
         db_state = models.AgentState(**state.model_dump())
         db.add(db_state)
 
-    db.commit()
-    db.refresh(db_state)
+    await db.commit()
+    await db.refresh(db_state)
     return db_state
 
 # Delete might be needed for cleanup
-def delete_agent_state(db: Session, state_id: uuid.UUID):
-    db_state = get_agent_state(db, state_id)
+async def delete_agent_state(db: AsyncSession, state_id: uuid.UUID):
+    db_state = await get_agent_state(db, state_id)
     if not db_state:
         return None
-    db.delete(db_state)
-    db.commit()
+    await db.delete(db_state)
+    await db.commit()
     return db_state
-
@@ -1,46 +1,55 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
+from typing import Optional
 import uuid
 
 from .. import models, schemas
+from .pagination import KeysetPage, keyset_paginate
 
-def get_conversation(db: Session, conversation_id: uuid.UUID):
-    return db.get(models.Conversation, conversation_id)
+async def get_conversation(db: AsyncSession, conversation_id: uuid.UUID):
+    return await db.get(models.Conversation, conversation_id)
 
-def get_conversations(db: Session, user_id: str = None, team_id: uuid.UUID = None, skip: int = 0, limit: int = 100):
+# Newest conversations first
+CONVERSATION_ORDER = [models.Conversation.created_at, models.Conversation.id]
+
+async def get_conversations(db: AsyncSession, user_id: str = None, team_id: uuid.UUID = None, cursor: Optional[str] = None, limit: int = 100) -> KeysetPage:
     query = select(models.Conversation)
     if user_id:
         query = query.where(models.Conversation.user_id == user_id)
     if team_id:
         query = query.where(models.Conversation.team_id == team_id)
-    result = db.execute(query.offset(skip).limit(limit))
-    return result.scalars().all()
+    return await keyset_paginate(db, query, CONVERSATION_ORDER, cursor=cursor, limit=limit, descending=True)
+
+def _columns(data: dict) -> dict:
+    # The metadata column is mapped as metadata_ on the model
+    if "metadata" in data:
+        data["metadata_"] = data.pop("metadata")
+    return data
 
-def create_conversation(db: Session, conversation: schemas.ConversationCreate):
-    db_conversation = models.Conversation(**conversation.model_dump())
+async def create_conversation(db: AsyncSession, conversation: schemas.ConversationCreate):
+    db_conversation = models.Conversation(**_columns(conversation.model_dump()))
     db.add(db_conversation)
-    db.commit()
-    db.refresh(db_conversation)
+    await db.commit()
+    await db.refresh(db_conversation)
     return db_conversation
 
-def update_conversation(db: Session, conversation_id: uuid.UUID, conversation_update: schemas.ConversationUpdate):
-    db_conversation = get_conversation(db, conversation_id)
+async def update_conversation(db: AsyncSession, conversation_id: uuid.UUID, conversation_update: schemas.ConversationUpdate):
+    db_conversation = await get_conversation(db, conversation_id)
     if not db_conversation:
         return None
-    update_data = conversation_update.model_dump(exclude_unset=True)
+    update_data = _columns(conversation_update.model_dump(exclude_unset=True))
     for key, value in update_data.items():
         setattr(db_conversation, key, value)
-    db.commit()
-    db.refresh(db_conversation)
+    await db.commit()
+    await db.refresh(db_conversation)
     return db_conversation
 
-def delete_conversation(db: Session, conversation_id: uuid.UUID):
-    db_conversation = get_conversation(db, conversation_id)
+async def delete_conversation(db: AsyncSession, conversation_id: uuid.UUID):
+    db_conversation = await get_conversation(db, conversation_id)
     if not db_conversation:
         return None
     # Need to handle related messages, states, evaluations if necessary (cascade?)
     # For now, just deleting the conversation.
-    db.delete(db_conversation)
-    db.commit()
+    await db.delete(db_conversation)
+    await db.commit()
     return db_conversation
-
@@ -1,14 +1,14 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import uuid
 
 from .. import models, schemas
 
-def get_evaluation_result(db: Session, result_id: uuid.UUID):
-    return db.get(models.EvaluationResult, result_id)
+async def get_evaluation_result(db: AsyncSession, result_id: uuid.UUID):
+    return await db.get(models.EvaluationResult, result_id)
 
-def get_evaluation_results_by_conversation(db: Session, conversation_id: uuid.UUID, skip: int = 0, limit: int = 100):
-    result = db.execute(
+async def get_evaluation_results_by_conversation(db: AsyncSession, conversation_id: uuid.UUID, skip: int = 0, limit: int = 100):
+    result = await db.execute(
         select(models.EvaluationResult)
         .where(models.EvaluationResult.conversation_id == conversation_id)
         .order_by(models.EvaluationResult.created_at.desc()) # Show newest first
@@ -17,13 +17,12 @@ def get_evaluation_results_by_conversation(db: Session, conversation_id: uuid.UU
     )
     return result.scalars().all()
 
-def create_evaluation_result(db: Session, result: schemas.EvaluationResultCreate):
+async def create_evaluation_result(db: AsyncSession, result: schemas.EvaluationResultCreate):
     db_result = models.EvaluationResult(**result.model_dump())
     db.add(db_result)
-    db.commit()
-    db.refresh(db_result)
+    await db.commit()
+    await db.refresh(db_result)
     return db_result
 
 # Update/Delete for evaluation results might be less common
-# def delete_evaluation_result(db: Session, result_id: uuid.UUID): ...
-
+# async def delete_evaluation_result(db: AsyncSession, result_id: uuid.UUID): ...
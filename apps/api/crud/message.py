@@ -1,29 +1,157 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, func
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 import uuid
 
 from .. import models, schemas
+from ..core.tokens import count_message_tokens
+from .pagination import KeysetPage, keyset_paginate
 
-def get_message(db: Session, message_id: uuid.UUID):
-    return db.get(models.Message, message_id)
+async def get_message(db: AsyncSession, message_id: uuid.UUID):
+    return await db.get(models.Message, message_id)
 
-def get_messages_by_conversation(db: Session, conversation_id: uuid.UUID, skip: int = 0, limit: int = 1000):
-    result = db.execute(
-        select(models.Message)
+# Messages are ordered by their position in the conversation, which is unique
+# there and increases with every append. Keying on it rather than created_at
+# also keeps cursors exact on SQLite, which stores server timestamps without
+# the microseconds a bound datetime carries.
+MESSAGE_ORDER = [models.Message.position, models.Message.id]
+
+async def get_messages_by_conversation(db: AsyncSession, conversation_id: uuid.UUID, cursor: Optional[str] = None, limit: int = 100) -> KeysetPage:
+    query = select(models.Message).where(models.Message.conversation_id == conversation_id)
+    return await keyset_paginate(db, query, MESSAGE_ORDER, cursor=cursor, limit=limit)
+
+def _in_conversation(conversation_id: uuid.UUID, after_position: Optional[int] = None):
+    query = select(models.Message).where(models.Message.conversation_id == conversation_id)
+    if after_position is not None:
+        query = query.where(models.Message.position > after_position)
+    return query
+
+async def get_messages_after_position(
+    db: AsyncSession,
+    conversation_id: uuid.UUID,
+    after_position: Optional[int] = None,
+    limit: int = 500,
+) -> List[models.Message]:
+    """Messages of a conversation after `after_position` (all when None), oldest first."""
+    page = await keyset_paginate(db, _in_conversation(conversation_id, after_position), MESSAGE_ORDER, limit=limit)
+    return page.items
+
+async def get_history_window(
+    db: AsyncSession,
+    conversation_id: uuid.UUID,
+    max_tokens: int,
+    batch_size: int = 50,
+    after_position: Optional[int] = None,
+) -> List[models.Message]:
+    """Returns the newest messages of a conversation that fit in `max_tokens`, oldest first.
+
+    Messages are read newest-first in batches until the budget is filled, so
+    the cost depends on the budget, not on the length of the conversation.
+    Token counts come from `Message.token_count`; rows stored before it
+    existed are counted once here and the count is saved. The newest message
+    is always included. Tool results whose requesting assistant message fell
+    outside the window are dropped, since the model rejects them on their own.
+    With `after_position`, only messages after it (not yet folded into the
+    conversation summary) are considered.
+    """
+    window: List[models.Message] = []
+    used = 0
+    cursor = None
+    backfilled = False
+    while True:
+        page = await keyset_paginate(
+            db,
+            _in_conversation(conversation_id, after_position),
+            MESSAGE_ORDER,
+            cursor=cursor,
+            limit=batch_size,
+            descending=True,
+        )
+        for message in page.items:
+            if message.token_count is None:
+                message.token_count = count_message_tokens(message.content, message.tool_calls)
+                backfilled = True
+            if window and used + message.token_count > max_tokens:
+                break
+            window.append(message)
+            used += message.token_count
+        else:
+            if page.next_cursor is not None:
+                cursor = page.next_cursor
+                continue
+        break
+
+    if backfilled:
+        await db.commit()
+    window.reverse()
+    while len(window) > 1 and window[0].role == "tool":
+        window.pop(0)
+    return window
+
+def _columns(message: schemas.MessageCreate) -> dict:
+    data = message.model_dump()
+    data["metadata_"] = data.pop("metadata")
+    return data
+
+# Attempts at an append that keeps losing its positions to concurrent appends
+POSITION_RETRIES = 3
+
+async def _next_position(db: AsyncSession, conversation_id: uuid.UUID) -> int:
+    return await db.scalar(
+        select(func.coalesce(func.max(models.Message.position) + 1, 0))
         .where(models.Message.conversation_id == conversation_id)
-        .order_by(models.Message.created_at) # Ensure messages are ordered chronologically
-        .offset(skip)
-        .limit(limit)
     )
-    return result.scalars().all()
 
-def create_message(db: Session, message: schemas.MessageCreate):
-    db_message = models.Message(**message.model_dump())
-    db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+async def _insert_messages(db: AsyncSession, messages: List[schemas.MessageCreate]) -> List[models.Message]:
+    """Appends `messages` to their conversations, numbering them from the next free `position`.
+
+    Positions are unique per conversation. An append racing another one for
+    the same positions fails on that constraint; its savepoint is rolled back
+    and the positions are read again.
+    """
+    for attempt in range(POSITION_RETRIES):
+        positions = {}
+        rows = []
+        for message in messages:
+            conversation_id = message.conversation_id
+            if conversation_id not in positions:
+                positions[conversation_id] = await _next_position(db, conversation_id)
+            rows.append({
+                **_columns(message),
+                "position": positions[conversation_id],
+                "token_count": count_message_tokens(message.content, message.tool_calls),
+            })
+            positions[conversation_id] += 1
+        try:
+            async with db.begin_nested():
+                return (await db.scalars(
+                    insert(models.Message).returning(models.Message, sort_by_parameter_order=True),
+                    rows,
+                )).all()
+        except IntegrityError:
+            if attempt == POSITION_RETRIES - 1:
+                raise
+
+async def create_message(db: AsyncSession, message: schemas.MessageCreate):
+    (db_message,) = await _insert_messages(db, [message])
+    await db.commit()
     return db_message
 
+async def create_messages(db: AsyncSession, messages: List[schemas.MessageCreate]):
+    """Inserts a batch of messages (e.g. a whole graph turn) in a single transaction.
+
+    Rows are written with one multi-row INSERT ... RETURNING instead of an
+    add/commit/refresh round trip per message. Each row gets the next
+    `position` in its conversation, so the batch keeps its order even though
+    every row shares the transaction's `created_at`.
+    """
+    if not messages:
+        return []
+    db_messages = await _insert_messages(db, messages)
+    await db.commit()
+    return db_messages
+
 # Update/Delete for messages might be less common, depending on use case
-# def delete_message(db: Session, message_id: uuid.UUID): ...
+# async def delete_message(db: AsyncSession, message_id: uuid.UUID): ...
 
@@ -0,0 +1,98 @@
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Keyset (cursor) pagination.
+#
+# Pages are read with `WHERE (created_at, ..., id) > (:last values)` instead of
+# OFFSET, so with a matching index every page costs the same no matter how deep
+# into the result it is. Cursors are opaque url-safe tokens that encode the
+# direction and the key of the row the next page starts after.
+
+@dataclass
+class KeysetPage:
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+def encode_cursor(direction: str, values: List[Any]) -> str:
+    payload = json.dumps({"d": direction, "k": [_dump(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: List[Any]) -> tuple[str, List[Any]]:
+    """Returns (direction, key values). Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, values = payload["d"], payload["k"]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if direction not in ("next", "prev") or not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    return direction, [_load(column, value) for column, value in zip(columns, values)]
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+def _load(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        return python_type(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+async def keyset_paginate(
+    db: AsyncSession,
+    query: Select,
+    columns: List[Any],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = False,
+) -> KeysetPage:
+    """Runs `query` as one page ordered by `columns` (which must end in a unique column).
+
+    `cursor` is a `next_cursor`/`prev_cursor` from an earlier page; without it
+    the first page is returned.
+    """
+    direction, values = ("next", None) if cursor is None else decode_cursor(cursor, columns)
+    backwards = direction == "prev"
+    # Scan ascending for forward pages of an ascending listing and backward pages of a descending one
+    ascending = descending == backwards
+
+    if values is not None:
+        key = tuple_(*columns)
+        bound = tuple_(*(literal(value, column.type) for column, value in zip(columns, values)))
+        query = query.where(key > bound if ascending else key < bound)
+    query = query.order_by(*(column.asc() if ascending else column.desc() for column in columns))
+
+    rows = list((await db.execute(query.limit(limit + 1))).scalars().all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    has_next = cursor is not None if backwards else has_more
+    has_prev = has_more if backwards else cursor is not None
+    return KeysetPage(
+        items=rows,
+        next_cursor=encode_cursor("next", _key(rows[-1], columns)) if rows and has_next else None,
+        prev_cursor=encode_cursor("prev", _key(rows[0], columns)) if rows and has_prev else None,
+    )
+
+def _key(row: Any, columns: List[Any]) -> List[Any]:
+    return [getattr(row, column.key) for column in columns]
@@ -1,54 +1,111 @@
 # apps/api/graphs/graph.py
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from .state import AgentState
-from .nodes import call_agent, execute_tools
+from .nodes import (
+    budget_exceeded,
+    call_agent,
+    execute_tools,
+    fan_out,
+    fan_out_agents,
+    get_handoff_call,
+    handoff,
+    over_budget,
+)
+from ..core.telemetry import node_timer
+from ..core.tokens import count_message_tokens
+
+# --- Step and Token Accounting ---
+
+def _message_tokens(message: Any) -> int:
+    """Model tokens spent on a message: reported usage, else an estimate."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens", 0)
+    if isinstance(message, dict):
+        return count_message_tokens(str(message.get("content", "")))
+    return count_message_tokens(str(message.content), getattr(message, "tool_calls", None))
+
+def counted(node: Callable[..., Awaitable[Dict[str, Any]]], spends_tokens: bool = False):
+    """Wraps a node so each execution adds to the run's `steps` (and `tokens_used`) and is timed."""
+    timer = node_timer(node.__name__)
+
+    async def run(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        with timer.time():
+            update = await node(state, config)
+        update["steps"] = 1
+        if spends_tokens:
+            update["tokens_used"] = sum(_message_tokens(m) for m in update.get("messages") or [])
+        return update
+    run.__name__ = node.__name__
+    return run
+
+# --- Routing ---
+
+def route_entry(state: AgentState, config: RunnableConfig) -> str:
+    """Fans the turn out when the team runs in fan-out mode with several agents to ask."""
+    has_llm = ((config or {}).get("configurable") or {}).get("llm") is not None
+    return "fan_out" if has_llm and len(fan_out_agents(state)) > 1 else "agent"
+
+def route_after_agent(state: AgentState, config: RunnableConfig) -> str:
+    """Ends the run on a final answer, otherwise hands off or runs the requested tools."""
+    last_message = state["messages"][-1]
+    if not getattr(last_message, "tool_calls", None):
+        return "end"
+    if over_budget(state, config):
+        return "budget"
+    if get_handoff_call(last_message):
+        return "handoff"
+    return "tools"
+
+def route_after_tools(state: AgentState, config: RunnableConfig) -> str:
+    """Returns to the agent with the tool results unless the budget is used up."""
+    return "budget" if over_budget(state, config) else "agent"
 
 # Define the workflow
 workflow = StateGraph(AgentState)
 
 # Define the nodes
-workflow.add_node("call_agent", call_agent)
-workflow.add_node("execute_tools", execute_tools)
-
-# TODO: Define a router node/function if more complex routing is needed
-# workflow.add_node("router", router_function)
+workflow.add_node("call_agent", counted(call_agent, spends_tokens=True))
+workflow.add_node("execute_tools", counted(execute_tools))
+workflow.add_node("handoff", counted(handoff))
+workflow.add_node("fan_out", counted(fan_out, spends_tokens=True))
+workflow.add_node("budget_exceeded", budget_exceeded)
 
 # Set the entry point
-workflow.set_entry_point("call_agent")
+workflow.set_conditional_entry_point(
+    route_entry,
+    {
+        "agent": "call_agent",
+        "fan_out": "fan_out",
+    },
+)
 
 # Define the edges
-workflow.add_edge("call_agent", "execute_tools") # Always try to execute tools after agent call for now
-workflow.add_edge("execute_tools", "call_agent") # Loop back to agent after tools execute
-
-# TODO: Implement conditional edges based on state["next_node"] or tool calls
-# Example conditional edge:
-# def should_continue(state: AgentState):
-#     messages = state["messages"]
-#     last_message = messages[-1]
-#     # If there are no tool calls, then we finish
-#     if not hasattr(last_message, "tool_calls") or not last_message.tool_calls:
-#         return "end"
-#     # Otherwise if there are tool calls, we continue
-#     else:
-#         return "continue"
-#
-# workflow.add_conditional_edges(
-#     "call_agent",
-#     should_continue,
-#     {
-#         "continue": "execute_tools",
-#         "end": END,
-#     },
-# )
-# workflow.add_conditional_edges(
-#     "execute_tools",
-#     # Logic to decide if agent needs to be called again or end
-#     lambda x: "call_agent", # Simple loop back for now
-#     {
-#         "call_agent": "call_agent",
-#         "end": END,
-#     },
-# )
+workflow.add_conditional_edges(
+    "call_agent",
+    route_after_agent,
+    {
+        "tools": "execute_tools",
+        "handoff": "handoff",
+        "budget": "budget_exceeded",
+        "end": END,
+    },
+)
+for node_name in ("execute_tools", "handoff"):
+    workflow.add_conditional_edges(
+        node_name,
+        route_after_tools,
+        {
+            "agent": "call_agent",
+            "budget": "budget_exceeded",
+        },
+    )
+workflow.add_edge("fan_out", END)
+workflow.add_edge("budget_exceeded", END)
 
 # Compile the workflow into a runnable graph
 # Use `with_config` for things like setting recursion limits
@@ -63,3 +120,37 @@ app_graph = workflow.compile()
 
 print("LangGraph workflow compiled.")
 
+# --- Run Statistics ---
+
+class GraphRunStats:
+    """Node executions, tokens and early stops per graph run, for /health/stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._node_executions = 0
+        self._max_node_executions = 0
+        self._tokens = 0
+        self._budget_stops: Dict[str, int] = {}
+
+    def record(self, steps: int, tokens: int, stop_reason: str | None = None) -> None:
+        with self._lock:
+            self._runs += 1
+            self._node_executions += steps
+            self._max_node_executions = max(self._max_node_executions, steps)
+            self._tokens += tokens
+            if stop_reason:
+                self._budget_stops[stop_reason] = self._budget_stops.get(stop_reason, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self._runs,
+                "avg_node_executions": self._node_executions / self._runs if self._runs else 0.0,
+                "max_node_executions": self._max_node_executions,
+                "avg_tokens": self._tokens / self._runs if self._runs else 0.0,
+                "budget_stops": dict(self._budget_stops),
+            }
+
+graph_run_stats = GraphRunStats()
+
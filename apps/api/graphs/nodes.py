@@ -1,6 +1,12 @@
 # apps/api/graphs/nodes.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, tool
 from .state import AgentState
+from ..core.agent.tools import tool_executor
+from ..core.config import settings
+from ..services.team_fanout import team_fanout
 from ..models.agent_team import Agent  # Assuming Agent model is here
 from ..models.conversation_message import Message # Assuming Message model is here
 # Import necessary clients (LLM, tool executors, etc.) later
@@ -8,11 +14,13 @@ from ..models.conversation_message import Message # Assuming Message model is he
 # Placeholder for LLM client initialization
 # llm_client = ...
 
-async def call_agent(state: AgentState) -> Dict[str, Any]:
+async def call_agent(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
     """Invokes the appropriate AI agent based on the current state.
 
     Args:
         state (AgentState): The current graph state.
+        config (RunnableConfig): The run config; `configurable["llm"]` is the chat model to use
+            and `configurable["tools"]` the tools it may call (see `agent_tools`).
 
     Returns:
         Dict[str, Any]: A dictionary containing the agent's response message(s)
@@ -32,6 +40,23 @@ async def call_agent(state: AgentState) -> Dict[str, Any]:
     # TODO: Invoke the LLM with the prepared input and agent's tools
     # response = await llm_client.invoke(llm_input, tools=agent_details.tools)
 
+    configurable = config.get("configurable") or {}
+    llm = configurable.get("llm")
+    if llm is not None:
+        # Team agents run with the system prompt prepared in their cached roster entry
+        roster = state.get("roster")
+        agent = roster.agent(current_agent_id) if roster is not None else None
+        llm_input = [agent.system_message, *messages] if agent is not None else list(messages)
+        tools = agent_tools(configurable.get("tools") or [], roster, current_agent_id)
+        model = llm.bind_tools(tools) if tools else llm
+        # Passing the run config lets streaming callers receive tokens as they are generated
+        response = await model.ainvoke(llm_input, config)
+        print(f"--- Agent Response: {response.content} ---")
+        return {
+            "messages": [response],
+            "next_node": "execute_tools" if getattr(response, "tool_calls", None) else None,
+        }
+
     # Placeholder response
     agent_response_content = f"Agent {current_agent_id} responding to: {messages[-1].content}"
     response_message = {"role": "assistant", "content": agent_response_content}
@@ -49,35 +74,42 @@ async def call_agent(state: AgentState) -> Dict[str, Any]:
         "next_node": "execute_tools" # Or determine next node based on response
     }
 
-async def execute_tools(state: AgentState) -> Dict[str, Any]:
-    """Executes any tool calls requested by the agent.
+def agent_tools(tools: Sequence[BaseTool], roster: Any, agent_id: Any) -> List[Any]:
+    """The tools an agent is bound with: the ones its config names, else all of `tools`.
+
+    Agents of a team with several members can also hand the conversation off.
+    """
+    agent = roster.agent(agent_id) if roster is not None else None
+    if agent is not None and agent.tool_names:
+        tools = [t for t in tools if t.name in agent.tool_names]
+    if roster is not None and len(roster.agents) > 1:
+        return [*tools, handoff_to_agent]
+    return list(tools)
+
+async def execute_tools(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Executes the tool calls requested by the agent's last message.
+
+    Independent calls run concurrently (capped by `settings.tool_max_concurrency`,
+    each with its own `settings.tool_call_timeout`) and their results are
+    appended in the order the agent requested them.
 
     Args:
         state (AgentState): The current graph state.
+        config (RunnableConfig): The run config; `configurable["tools"]` are the tools the agent may call.
 
     Returns:
         Dict[str, Any]: A dictionary containing the results of the tool executions.
     """
-    print("--- Executing Tools (Placeholder) ---")
-    tool_calls = state.get("tool_calls") # Get potential tool calls from state
-    tool_results = []
+    last_message = state["messages"][-1] if state["messages"] else None
+    tool_calls = getattr(last_message, "tool_calls", None)
 
     if not tool_calls:
         print("--- No tools to execute. ---")
         return {"messages": [], "next_node": "router"} # Decide next step if no tools
 
-    # TODO: Implement actual tool execution logic using MCP or other mechanisms
-    # for call in tool_calls:
-    #     tool_name = call["name"]
-    #     tool_args = call["arguments"]
-    #     try:
-    #         result = await execute_single_tool(tool_name, tool_args)
-    #         tool_results.append({"tool_call_id": call["id"], "content": result})
-    #     except Exception as e:
-    #         print(f"Error executing tool {tool_name}: {e}")
-    #         tool_results.append({"tool_call_id": call["id"], "content": f"Error: {e}"})
-
-    print(f"--- Tool Results (Placeholder): {tool_results} ---")
+    print(f"--- Executing {len(tool_calls)} Tool Call(s) ---")
+    tools = (config.get("configurable") or {}).get("tools") or []
+    tool_results = await tool_executor.run(tool_calls, tools, config)
 
     # Return the tool results as messages to be added to the state
     return {
@@ -85,5 +117,129 @@ async def execute_tools(state: AgentState) -> Dict[str, Any]:
         "next_node": "call_agent" # Typically, return to agent after tool execution
     }
 
+# --- Agent Handoff ---
+
+HANDOFF_TOOL_NAME = "handoff_to_agent"
+
+@tool(HANDOFF_TOOL_NAME)
+def handoff_to_agent(agent_id: str, reason: str = "") -> str:
+    """Hands the conversation over to another agent of the team.
+
+    Bind this alongside an agent's tools; calls to it are answered by the
+    `handoff` node instead of being executed.
+    """
+    return f"Transferred to agent {agent_id}"
+
+def get_handoff_call(message: Any) -> Dict[str, Any] | None:
+    """Returns the first handoff tool call of a message, if it requested one."""
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        if tool_call["name"] == HANDOFF_TOOL_NAME:
+            return tool_call
+    return None
+
+async def handoff(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Makes the requested agent the current one.
+
+    Every tool call of the message gets a result, so the history stays valid:
+    the handoff is confirmed and any other calls are reported as skipped.
+
+    Args:
+        state (AgentState): The current graph state.
+        config (RunnableConfig): The run config.
+
+    Returns:
+        Dict[str, Any]: The tool results and the new `current_agent_id`.
+    """
+    last_message = state["messages"][-1]
+    handoff_call = get_handoff_call(last_message)
+    target = str(handoff_call["args"]["agent_id"])
+    print(f"--- Handing off from Agent {state.get('current_agent_id')} to Agent {target} ---")
+
+    results = [
+        ToolMessage(
+            content=(
+                f"Transferred to agent {target}" if tool_call is handoff_call
+                else f"Skipped: the conversation was handed off to agent {target}"
+            ),
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+        )
+        for tool_call in last_message.tool_calls
+    ]
+    return {
+        "messages": results,
+        "current_agent_id": target,
+        "next_node": "call_agent",
+    }
+
+# --- Team Fan-out ---
+
+def fan_out_agents(state: AgentState) -> List[Any]:
+    """The team members a turn fans out to, when the team runs in fan-out mode.
+
+    Teams opt in with `config = {"mode": "fan_out", "reducer": ..., "branch_timeout": ...,
+    "agents": [agent ids]}` (`agents` defaults to the whole team).
+    """
+    roster = state.get("roster")
+    if roster is None or (roster.config or {}).get("mode") != "fan_out":
+        return []
+    agent_ids = roster.config.get("agents")
+    if agent_ids:
+        return [a for a in (roster.agent(agent_id) for agent_id in agent_ids) if a is not None]
+    return list(roster.agents)
+
+async def fan_out(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Sends the turn to several team agents in parallel and merges their answers.
+
+    Args:
+        state (AgentState): The current graph state; its roster's config picks the reducer.
+        config (RunnableConfig): The run config; `configurable["llm"]` is the chat model to use.
+
+    Returns:
+        Dict[str, Any]: The merged answer and the agent it came from.
+    """
+    roster = state["roster"]
+    agents = fan_out_agents(state)
+    print(f"--- Fanning out to {len(agents)} Agents of Team {roster.team_id} ---")
+    result = await team_fanout.run(
+        agents,
+        state["messages"],
+        (config.get("configurable") or {})["llm"],
+        reducer=roster.config.get("reducer"),
+        branch_timeout=roster.config.get("branch_timeout"),
+    )
+    message = result.message
+    message.response_metadata = {**message.response_metadata, "fan_out": [b.as_dict() for b in result.branches]}
+    return {
+        "messages": [message],
+        "current_agent_id": result.agent_id or state.get("current_agent_id"),
+        "next_node": None,
+    }
+
+# --- Run Budgets ---
+
+def over_budget(state: AgentState, config: RunnableConfig | None) -> str | None:
+    """Returns which per-run budget is used up ("steps" or "tokens"), if any.
+
+    Budgets come from `configurable["max_steps"]` / `configurable["max_tokens"]`,
+    defaulting to `settings.graph_max_steps` / `settings.graph_max_tokens`.
+    """
+    configurable = (config or {}).get("configurable") or {}
+    if state.get("steps", 0) >= (configurable.get("max_steps") or settings.graph_max_steps):
+        return "steps"
+    if state.get("tokens_used", 0) >= (configurable.get("max_tokens") or settings.graph_max_tokens):
+        return "tokens"
+    return None
+
+async def budget_exceeded(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Ends a run that used up its step or token budget.
+
+    Returns:
+        Dict[str, Any]: The `stop_reason` ("steps" or "tokens").
+    """
+    stop_reason = over_budget(state, config) or "steps"
+    print(f"--- Budget Exceeded ({stop_reason}) for Conv {state['conversation_id']} ---")
+    return {"stop_reason": stop_reason, "next_node": None}
+
 # Add more node functions as needed (e.g., for routing, final response generation)
 
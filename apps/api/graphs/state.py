@@ -1,7 +1,9 @@
 # apps/api/graphs/state.py
+import operator
 from typing import TypedDict, Sequence, Annotated, List, Dict, Any
 from langgraph.graph.message import AnyMessage
-from mem0 import Memory # Import mem0 Memory class
+from ..core.memory import MemoryHandle # Scoped handle on the shared mem0 Memory
+from ..services.team_roster import TeamRoster
 
 # Define the state for our agent graph
 class AgentState(TypedDict):
@@ -12,7 +14,11 @@ class AgentState(TypedDict):
         next_node: The next node to call.
         current_agent_id: The ID of the agent currently acting.
         conversation_id: The ID of the current conversation.
-        memory: An instance of mem0 Memory for the current context (e.g., conversation).
+        memory: A handle on the shared mem0 Memory scoped to the current context (e.g., conversation).
+        roster: The conversation's team roster (cached agents with their prepared prompts), if it has a team.
+        steps: Node executions so far in this run (summed across node updates).
+        tokens_used: Model tokens spent so far in this run (summed across node updates).
+        stop_reason: Why the run ended early, when a budget stopped it.
         # Add other relevant state fields as needed, e.g.:
         # tool_calls: List of pending tool calls
         # agent_outcome: Result from the last agent action
@@ -22,7 +28,11 @@ class AgentState(TypedDict):
     next_node: str | None
     current_agent_id: str | None
     conversation_id: str
-    memory: Memory | None # Add mem0 instance to state
+    memory: MemoryHandle | None # Add mem0 handle to state
+    roster: TeamRoster | None
+    steps: Annotated[int, operator.add]
+    tokens_used: Annotated[int, operator.add]
+    stop_reason: str | None
     # Example additional fields:
     # tool_calls: List[Dict[str, Any]] | None
     # agent_outcome: Any | None
@@ -1,16 +1,40 @@
+import asyncio
+import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from api.core.admission import AdmissionRejected, admission_controller
+from api.core.agent.orchestration import graph_cache
+from api.core.agent.persistence import checkpoint_pruner, checkpointer_pool
+from api.core.agent.tools import tool_executor
+from api.core.dependencies import engine, llm_response_cache
 from api.core.logs import setup_logging # Import the setup_logging function
+from api.core.mcps import mcp_client_manager
+from api.core.memory import memory_registry
+from api.core.memory_writer import memory_writer
+from api.core.migrations import run_migrations
+from api.core.telemetry import PrometheusMiddleware, pool_usage, register_gauge
+from api.core.tokens import load_encoding
+from api.graphs.graph import graph_run_stats
+from api.services.checkpoint_compaction import checkpoint_compactor
+from api.services.conversation_runs import conversation_runs
+from api.services.conversation_summary import conversation_summarizer
+from api.services.jobs import job_queue
+from api.services.team_fanout import team_fanout
+from api.services.team_roster import team_roster_cache
 from fastapi.middleware.cors import CORSMiddleware
 # from langfuse.fastapi import LangfuseMiddleware # Uncomment when ready
 
 # Import routers
 from api.routers import agents, teams, conversations, messages, agent_states, evaluation_results # Core CRUD routers
 from api.routers import mcp # MCP router
-# from api.routers import checkpoints, llms # Original template routers (commented out if replaced/unused)
+from api.routers import checkpoints # Checkpoint maintenance
+from api.routers import jobs # Queued agent runs
+# from api.routers import llms # Original template routers (commented out if replaced/unused)
 # from api.websockets import manager # Placeholder for WebSocket manager
 
 # Placeholder for Langfuse integration - replace with actual config
@@ -28,10 +52,46 @@ async def lifespan(app: FastAPI):
     # For example, replace print() with logging.getLogger("api").info()
     logging.getLogger("api").info("Starting up AI Agent Canvas Backend...")
     # langfuse_middleware.configure(app)
-    # TODO: Initialize database connection pool if needed
+    # Create missing tables and apply pending versioned migrations (indexes, backfills)
+    applied = await run_migrations(engine)
+    if applied:
+        logging.getLogger("api").info(f"Applied migrations: {', '.join(applied)}")
+    # Token counting on the request path must not download the tokenizer
+    await load_encoding()
+    # One checkpointer connection pool for all graph runs
+    await checkpointer_pool.open()
+    await checkpoint_pruner.start()
+    await checkpoint_compactor.start()
+    # Connect the shared MCP session in the background; requests wait for it if needed
+    await mcp_client_manager.start()
+    # Build the shared mem0 backend clients once instead of per graph run; with
+    # Qdrant or Neo4j down the API still starts and memory opens on first use
+    await asyncio.to_thread(memory_registry.try_open)
+    await memory_writer.start()
+    await conversation_summarizer.start()
+    # Local workers for queued agent runs (settings.job_workers, may be 0)
+    await job_queue.start()
     yield
     # Shutdown logic: Close connections, etc.
     logging.getLogger("api").info("Shutting down AI Agent Canvas Backend...")
+    # Running jobs go back to the queue for the next worker
+    await job_queue.close()
+    await conversation_summarizer.close()
+    # Flush queued memory writes before the backend clients go away
+    await memory_writer.close()
+    await asyncio.to_thread(memory_registry.close)
+    await mcp_client_manager.close()
+    await checkpoint_compactor.close()
+    await checkpoint_pruner.close()
+    await checkpointer_pool.close()
+    await conversation_runs.close()
+
+def _invalidate_graphs(old_tools, new_tools):
+    # Drop compiled graphs bound to a tool catalog the MCP server has replaced
+    if old_tools:
+        graph_cache.invalidate(old_tools)
+
+mcp_client_manager.on_tools_changed(_invalidate_graphs)
 
 app = FastAPI(
     title="AI Agent Canvas Backend",
@@ -53,15 +113,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browser clients read the id of a newly started agent conversation
+    expose_headers=["X-Conversation-Id"],
 )
 
-# Add Langfuse Middleware (uncomment when configured)
-# app.add_middleware(LangfuseMiddleware)
+# Request latency histograms for /metrics
+app.add_middleware(PrometheusMiddleware)
+
+# Pool and queue gauges, read from the components when /metrics is scraped
+def _checkpointer_pool_usage():
+    stats = checkpointer_pool.stats()
+    if not stats["open"]:
+        return {}
+    return {
+        "in_use": stats["pool_size"] - stats["pool_available"],
+        "idle": stats["pool_available"],
+    }
+
+register_gauge(
+    "db_pool_connections", "Database pool connections by state",
+    lambda: {
+        **{("orm", state): n for state, n in pool_usage(engine).items()},
+        **{("checkpointer", state): n for state, n in _checkpointer_pool_usage().items()},
+    },
+    ["pool", "state"],
+)
+register_gauge(
+    "queue_depth", "Work waiting for capacity",
+    lambda: {
+        "admission": admission_controller.stats()["queue_depth"],
+        "memory_writes": memory_writer.stats()["depth"],
+        "checkpointer_pool": checkpointer_pool.stats().get("requests_waiting", 0),
+    },
+    ["queue"],
+)
+register_gauge(
+    "in_flight", "Work currently running",
+    lambda: {
+        "graph_runs": admission_controller.stats()["in_flight"],
+        "jobs": job_queue.stats()["running"],
+    },
+    ["component"],
+)
 
-import logging
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    # Overloaded: tell clients when to come back instead of queueing them indefinitely
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
-# Include Core CRUD Routers
--import logging # Add this import for the getLogger calls in lifespan
+# Add Langfuse Middleware (uncomment when configured)
+# app.add_middleware(LangfuseMiddleware)
 
 # Include Core CRUD Routers
 app.include_router(agents.router, prefix="/v1", tags=["Agents"])
@@ -74,9 +179,14 @@ app.include_router(evaluation_results.router, prefix="/v1", tags=["Evaluation Re
 # Include MCP Router
 app.include_router(mcp.router, prefix="/v1") # Tag is defined within mcp.py
 
+# Checkpoint maintenance (compaction)
+app.include_router(checkpoints.router, prefix="/v1")
+
+# Asynchronous agent runs (submit, poll, subscribe)
+app.include_router(jobs.router, prefix="/v1")
+
 # Include original template routers if still needed (commented out for now)
 # app.include_router(llms.router, prefix="/v1", tags=["LLMs"])
-# app.include_router(checkpoints.router, prefix="/v1", tags=["Checkpoints"])
 
 # Placeholder for WebSocket endpoint
 # @app.websocket("/ws/{chat_id}")
@@ -94,3 +204,30 @@ app.include_router(mcp.router, prefix="/v1") # Tag is defined within mcp.py
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Prometheus metrics: latency histograms of the hot paths, pool and queue gauges."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/health/stats", tags=["Health"])
+async def health_stats():
+    """Reports the state of long-lived resources (clients, pools, queues)."""
+    return {
+        "memory": memory_registry.stats(),
+        "memory_writes": memory_writer.stats(),
+        "graphs": graph_cache.stats(),
+        "graph_runs": graph_run_stats.stats(),
+        "team_rosters": team_roster_cache.stats(),
+        "team_fanout": team_fanout.stats(),
+        "llm_cache": llm_response_cache.stats(),
+        "tools": tool_executor.stats(),
+        "summaries": conversation_summarizer.stats(),
+        "conversation_runs": conversation_runs.stats(),
+        "jobs": job_queue.stats(),
+        "admission": admission_controller.stats(),
+        "checkpointer": checkpointer_pool.stats(),
+        "checkpoint_retention": checkpoint_pruner.stats(),
+        "checkpoint_compaction": checkpoint_compactor.stats(),
+        "mcp": mcp_client_manager.stats(),
+    }
+
@@ -0,0 +1,13 @@
+-- Per-conversation ordering for messages: rows bulk-inserted in one
+-- transaction share created_at, so position breaks the tie.
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS position integer;
+
+-- Backfill existing rows in chronological order
+UPDATE messages AS m
+SET position = ordered.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY conversation_id ORDER BY created_at, id) - 1 AS position
+    FROM messages
+) AS ordered
+WHERE m.id = ordered.id
+  AND m.position IS NULL;
@@ -0,0 +1,38 @@
+-- Indexes for the hot query paths in api/crud.
+
+-- History loads and keyset pages of a conversation's messages
+CREATE INDEX IF NOT EXISTS ix_messages_conversation_id_created_at
+    ON messages (conversation_id, created_at, position, id);
+
+-- Conversation listings (keyset on created_at, id), optionally by user or team
+CREATE INDEX IF NOT EXISTS ix_conversations_created_at_id
+    ON conversations (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_conversations_user_id_created_at
+    ON conversations (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_conversations_team_id_created_at
+    ON conversations (team_id, created_at, id);
+
+-- Evaluations of a conversation, newest first
+CREATE INDEX IF NOT EXISTS ix_evaluation_results_conversation_id_created_at
+    ON evaluation_results (conversation_id, created_at);
+
+-- Agent states: at most one row per (conversation, agent).
+-- Keep the most recently written row of any existing duplicates.
+DELETE FROM agent_states AS a
+USING agent_states AS b
+WHERE a.conversation_id = b.conversation_id
+  AND a.agent_id = b.agent_id
+  AND (coalesce(a.updated_at, a.created_at), a.id) < (coalesce(b.updated_at, b.created_at), b.id);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_agent_states_conversation_id_agent_id'
+    ) THEN
+        ALTER TABLE agent_states
+            ADD CONSTRAINT uq_agent_states_conversation_id_agent_id UNIQUE (conversation_id, agent_id);
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS ix_agent_states_conversation_id_agent_id_updated_at
+    ON agent_states (conversation_id, agent_id, updated_at);
@@ -0,0 +1,3 @@
+-- Cached prompt token count per message, used by the token-budgeted history
+-- loader. Existing rows are filled in lazily the first time they are loaded.
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS token_count integer;
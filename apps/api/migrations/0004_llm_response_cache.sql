@@ -0,0 +1,11 @@
+-- Shared tier of the LLM response cache (core.llm_cache). Entries are keyed
+-- by a hash of the request and hold the streamed chunks of the response.
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key text PRIMARY KEY,
+    model text NOT NULL,
+    response jsonb NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    expires_at timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_response_cache_expires_at ON llm_response_cache (expires_at);
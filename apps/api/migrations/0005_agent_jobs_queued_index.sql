@@ -0,0 +1,4 @@
+-- Dequeue of services.jobs only scans runnable jobs; keep that index small
+-- as finished jobs accumulate.
+CREATE INDEX IF NOT EXISTS ix_agent_jobs_queued_run_after
+    ON agent_jobs (run_after, created_at) WHERE status = 'queued';
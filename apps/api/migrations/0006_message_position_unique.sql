@@ -0,0 +1,25 @@
+-- One message per position within a conversation, so two concurrent appends
+-- can't both take the next position (crud.message retries the loser).
+
+-- Renumber any collisions left by appends that raced before the constraint
+UPDATE messages AS m
+SET position = ordered.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY conversation_id ORDER BY position, created_at, id) - 1 AS position
+    FROM messages
+) AS ordered
+WHERE m.id = ordered.id
+  AND m.conversation_id IN (
+      SELECT conversation_id FROM messages
+      GROUP BY conversation_id, position
+      HAVING count(*) > 1
+  );
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_messages_conversation_id_position') THEN
+        ALTER TABLE messages
+            ADD CONSTRAINT uq_messages_conversation_id_position UNIQUE (conversation_id, position);
+    END IF;
+END
+$$;
@@ -0,0 +1,5 @@
+-- Message history and keyset pages are ordered by (position, id) within a
+-- conversation; the created_at-led index no longer matches any query.
+DROP INDEX IF EXISTS ix_messages_conversation_id_created_at;
+CREATE INDEX IF NOT EXISTS ix_messages_conversation_id_position
+    ON messages (conversation_id, position, id);
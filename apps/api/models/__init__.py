@@ -0,0 +1,12 @@
+# ORM models, re-exported so callers can write `models.Agent`
+from .agent_state import AgentState
+from .agent_team import Agent, Team, TeamAgent
+from .base import Base
+from .conversation_message import Conversation, Message
+from .evaluation_result import EvaluationResult
+from .job import Job, JobEvent
+
+__all__ = [
+    "Agent", "AgentState", "Base", "Conversation", "EvaluationResult",
+    "Job", "JobEvent", "Message", "Team", "TeamAgent",
+]
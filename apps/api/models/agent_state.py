@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Index, String, Text, DateTime, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -7,6 +7,11 @@ from .base import Base
 
 class AgentState(Base):
     __tablename__ = "agent_states"
+    __table_args__ = (
+        # One state row per agent per conversation (see crud.agent_state.create_or_update_agent_state)
+        UniqueConstraint("conversation_id", "agent_id", name="uq_agent_states_conversation_id_agent_id"),
+        Index("ix_agent_states_conversation_id_agent_id_updated_at", "conversation_id", "agent_id", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
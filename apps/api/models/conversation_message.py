@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -7,24 +7,37 @@ from .base import Base
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Keyset listings, optionally filtered by user or team (see crud.conversation)
+        Index("ix_conversations_created_at_id", "created_at", "id"),
+        Index("ix_conversations_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_conversations_team_id_created_at", "team_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"), nullable=True) # Optional link to a team
     user_id = Column(String) # Identifier for the end-user
     title = Column(String)
-    metadata = Column(JSON) # Any extra info about the conversation
+    # "metadata" is reserved by declarative models, so the column is mapped as metadata_
+    metadata_ = Column("metadata", JSON) # Any extra info about the conversation (e.g. its rolling summary)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship to team
     team = relationship("Team", back_populates="conversations")
     # Relationship to messages (one-to-many)
-    messages = relationship("Message", back_populates="conversation", order_by="Message.created_at")
+    messages = relationship("Message", back_populates="conversation", order_by="[Message.position, Message.id]")
     # Relationship to agent states (one-to-many)
     agent_states = relationship("AgentState", back_populates="conversation")
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # History loads and keyset pages within a conversation (see crud.message)
+        Index("ix_messages_conversation_id_position", "conversation_id", "position", "id"),
+        # Concurrent appends can't both take the next position (see crud.message)
+        UniqueConstraint("conversation_id", "position", name="uq_messages_conversation_id_position"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
@@ -33,7 +46,9 @@ class Message(Base):
     content = Column(Text, nullable=False)
     tool_calls = Column(JSON) # If role is "tool", store tool call info
     tool_call_id = Column(String) # If role is response to tool call
-    metadata = Column(JSON) # Any extra info about the message
+    metadata_ = Column("metadata", JSON) # Any extra info about the message
+    position = Column(Integer) # Order within the conversation: 0, 1, 2, ... unique per conversation, assigned on insert (see crud.message._insert_messages)
+    token_count = Column(Integer) # Cached prompt tokens (see core.tokens); filled on insert or first load
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship to conversation
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import Column, Index, String, Text, DateTime, ForeignKey, JSON, Float
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -7,6 +7,9 @@ from .base import Base
 
 class EvaluationResult(Base):
     __tablename__ = "evaluation_results"
+    __table_args__ = (
+        Index("ix_evaluation_results_conversation_id_created_at", "conversation_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
@@ -0,0 +1,42 @@
+import uuid
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from .base import Base
+
+class Job(Base):
+    """A queued agent run (see services.jobs). Workers claim rows with FOR UPDATE SKIP LOCKED."""
+    __tablename__ = "agent_jobs"
+    __table_args__ = (
+        # Dequeue order of runnable jobs
+        Index("ix_agent_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False) # Handler that runs the job, e.g. "mcp_invoke"
+    status = Column(String, nullable=False, default="queued") # queued, running, succeeded or failed
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False) # Not dequeued before this (retry backoff)
+    locked_by = Column(String) # Worker running the job
+    heartbeat_at = Column(DateTime(timezone=True)) # Refreshed while running; stale means the worker died
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+class JobEvent(Base):
+    """A progress event of a job, read by subscribers in id order."""
+    __tablename__ = "agent_job_events"
+    __table_args__ = (
+        Index("ix_agent_job_events_job_id_id", "job_id", "id"),
+    )
+
+    # BIGSERIAL on PostgreSQL; SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("agent_jobs.id", ondelete="CASCADE"), nullable=False)
+    event = Column(String, nullable=False)
+    data = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,38 +1,39 @@
-from fastapi import APIRouter
-from sqlalchemy import text
+from typing import Optional
 
-from api.core.dependencies import EngineDep
-from api.core.logs import uvicorn
+from fastapi import APIRouter, Query
 
-TABLES = [
-    "checkpoints",
-    "checkpoint_migrations",
-    "checkpoint_blobs",
-    "checkpoint_writes",
-]
-router = APIRouter(tags=["checkpoints"])
+from api.services.checkpoint_compaction import checkpoint_compactor
 
+router = APIRouter(prefix="/checkpoints", tags=["checkpoints"])
 
-@router.delete("/truncate")
-async def truncate_checkpoints(engine: EngineDep):
+
+@router.post("/compact")
+async def compact_checkpoints(
+    keep_last: Optional[int] = Query(None, ge=1),
+    max_age_seconds: Optional[float] = Query(None, gt=0),
+    max_threads: Optional[int] = Query(None, ge=1, le=100_000),
+):
     """
-    Truncates all checkpoint-related tables from LangGraph AsyncPostgresSaver.
+    Compacts the LangGraph AsyncPostgresSaver tables incrementally.
 
-    This operation removes all records from the following tables:
-    - checkpoints
-    - checkpoint_migrations
-    - checkpoint_blobs
-    - checkpoint_writes
+    Visits the next page of conversation threads and deletes superseded rows:
+    - checkpoints beyond the newest `keep_last` or older than `max_age_seconds`
+      (the latest checkpoint of a thread is always kept)
+    - their `checkpoint_writes`, and writes whose checkpoint no longer exists
+    - `checkpoint_blobs` no remaining checkpoint references
 
-    **Warning**: This action is irreversible and should be used with caution. Ensure proper backups are in place
-    before performing this operation.
+    Deletes run in small, rate-limited batches. Omitted parameters use the
+    configured policy. Returns the rows and bytes reclaimed per table and
+    whether the sweep over all threads is complete.
     """
+    return await checkpoint_compactor.run_once(
+        keep_last=keep_last,
+        max_age=max_age_seconds,
+        max_threads=max_threads,
+    )
+
 
-    async with engine.begin() as conn:
-        for table in TABLES:
-            await conn.execute(text(f"TRUNCATE TABLE {table};"))
-            uvicorn.info(f"Truncated table {table}")
-    return {
-        "status": "success",
-        "message": "All checkpoint-related tables truncated successfully.",
-    }
+@router.get("/compact/stats")
+async def compaction_stats():
+    """Totals reclaimed by compaction since startup and the last run's report."""
+    return checkpoint_compactor.stats()
@@ -0,0 +1,89 @@
+# apps/api/routers/jobs.py
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from typing import AsyncGenerator, Dict, Optional
+import json
+import uuid
+
+from sse_starlette.sse import EventSourceResponse
+
+from ..schemas.job import JobEventPage, JobEventResponse, JobResponse
+from ..services.jobs import FINISHED, job_queue
+from .mcp import MCPRequest, _last_user_message
+
+# Seconds a subscriber waits for news before re-reading the job's events, for
+# jobs whose worker runs in another process
+SUBSCRIBE_POLL_INTERVAL = 1.0
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+)
+
+async def _get_job_or_404(job_id: uuid.UUID):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(request: MCPRequest):
+    """Queues an `/v1/mcp/invoke` turn and returns at once with the job.
+
+    Poll `GET /jobs/{id}` for the outcome (`result` holds the MCP response
+    once `status` is `succeeded`), or follow progress with
+    `GET /jobs/{id}/events`. Jobs are stored, so they outlive the request
+    and survive worker restarts; failed attempts are retried with backoff.
+    """
+    last_user_mcp_message = _last_user_message(request)
+    return await job_queue.submit(
+        "mcp_invoke",
+        {
+            "conversation_id": request.conversation_id,
+            "content": last_user_mcp_message.content,
+            "user_id": request.user_id,
+        },
+    )
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def read_job(job_id: uuid.UUID):
+    return await _get_job_or_404(job_id)
+
+@router.get("/{job_id}/events/page", response_model=JobEventPage)
+async def read_job_events(job_id: uuid.UUID, after: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    """Progress events with an id above `after`, for clients that poll."""
+    job = await _get_job_or_404(job_id)
+    events = await job_queue.events_after(job_id, after, limit)
+    return JobEventPage(items=[JobEventResponse.model_validate(e) for e in events], status=job.status)
+
+@router.get("/{job_id}/events")
+async def subscribe_job_events(
+    job_id: uuid.UUID,
+    after: int = Query(0, ge=0),
+    last_event_id: Optional[int] = Header(None),
+):
+    """Follows a job's progress as Server-Sent Events (SSE).
+
+    Replays the events recorded so far, then streams new ones (`started`,
+    `tool_start`/`tool_end`, `message`, `saved`, `retry`) until the job ends
+    with `succeeded` or `failed`. Each event has the event row's id, so a
+    reconnecting client resumes after Last-Event-ID without missing any.
+    """
+    await _get_job_or_404(job_id)
+    cursor = max(after, last_event_id or 0)
+
+    async def events() -> AsyncGenerator[Dict[str, str], None]:
+        nonlocal cursor
+        while True:
+            # Read the status first: a finished job's events are all committed by then
+            job = await job_queue.get(job_id)
+            batch = await job_queue.events_after(job_id, cursor)
+            for event in batch:
+                cursor = event.id
+                yield {"id": str(event.id), "event": event.event, "data": json.dumps(event.data, default=str)}
+            if batch:
+                continue
+            if job is None or job.status in FINISHED:
+                return
+            await job_queue.wait_for_update(job_id, SUBSCRIBE_POLL_INTERVAL)
+
+    return EventSourceResponse(events())
@@ -1,18 +1,24 @@
+import json
+import uuid
 from typing import AsyncGenerator
 
-import psycopg.errors
 from fastapi import APIRouter
 from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from sse_starlette.sse import EventSourceResponse
 from starlette.responses import Response
 
-from api.core.agent.orchestration import get_config, get_graph
+from api.core.agent.orchestration import get_config, get_graph, thread_id_for
+from api.core.agent.persistence import checkpoint_pruner
 from api.core.dependencies import LLMDep, setup_graph
-from api.core.logs import print, uvicorn
+from api.core.logs import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(tags=["chat"])
 
+# Response header carrying the conversation (checkpoint thread) a run belongs to
+CONVERSATION_ID_HEADER = "X-Conversation-Id"
+
 
 @router.get("/chat/completions")
 async def completions(query: str, llm: LLMDep) -> Response:
@@ -26,13 +32,21 @@ async def completions(query: str, llm: LLMDep) -> Response:
 
 
 @router.get("/chat/agent")
-async def agent(query: str, llm: LLMDep) -> Response:
+async def agent(query: str, llm: LLMDep, conversation_id: uuid.UUID | None = None) -> Response:
     """Stream LangGraph completions as Server-Sent Events (SSE).
 
     This endpoint streams LangGraph-generated events in real-time, allowing the client
     to receive responses as they are processed, useful for agent-based workflows.
+    Runs with the same `conversation_id` continue one checkpoint thread; without
+    it a new thread is started. Either way the id is returned in the
+    `X-Conversation-Id` header and the first event (`event: conversation`), so
+    the client can continue the thread.
     """
-    return EventSourceResponse(stream_graph(query, llm))
+    conversation_id = conversation_id or uuid.uuid4()
+    return EventSourceResponse(
+        stream_graph(query, llm, conversation_id),
+        headers={CONVERSATION_ID_HEADER: str(conversation_id)},
+    )
 
 
 async def stream_completions(
@@ -42,21 +56,10 @@ async def stream_completions(
         yield dict(data=chunk)
 
 
-async def checkpointer_setup(pool):
-    checkpointer = AsyncPostgresSaver(pool)
-    try:
-        await checkpointer.setup()
-    except (
-        psycopg.errors.DuplicateColumn,
-        psycopg.errors.ActiveSqlTransaction,
-    ):
-        uvicorn.warning("Skipping checkpointer setup — already configured.")
-    return checkpointer
-
-
 async def stream_graph(
     query: str,
     llm: LLMDep,
+    conversation_id: uuid.UUID,
 ) -> AsyncGenerator[dict[str, str], None]:
     async with setup_graph() as resource:
         graph = get_graph(
@@ -64,10 +67,15 @@ async def stream_graph(
             tools=resource.tools,
             checkpointer=resource.checkpointer,
         )
-        config = get_config()
+        config = get_config(conversation_id)
         events = dict(messages=[HumanMessage(content=query)])
 
-        async for event in graph.astream_events(events, config, version="v2"):
-            if event.get("event").endswith("end"):
-                print(event)
-            yield dict(data=event)
+        yield dict(event="conversation", data=json.dumps({"conversation_id": str(conversation_id)}))
+        try:
+            async for event in graph.astream_events(events, config, version="v2"):
+                if event.get("event").endswith("end"):
+                    logger.debug(event)
+                yield dict(data=event)
+        finally:
+            # The run added checkpoints to the thread; older ones are pruned in the background
+            checkpoint_pruner.touch(thread_id_for(conversation_id))
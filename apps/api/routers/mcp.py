@@ -1,13 +1,19 @@
 # apps/api/routers/mcp.py
-from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional, Literal
+from typing import AsyncGenerator, List, Dict, Any, Optional, Literal
+import json
 import uuid
 
-from ..dependencies import get_db # Assuming dependency for DB session
+from sse_starlette.sse import EventSourceResponse
+from starlette.background import BackgroundTask
+
+from ..core.admission import AdmissionRejected, admission_controller
+from ..core.dependencies import LLMDep, async_session_maker
+from ..core.mcps import mcp_client_manager
 from ..services import graph_service
-from langgraph.graph.message import HumanMessage, AIMessage # Import message types
+from ..services.conversation_runs import ConversationBusy, conversation_runs
+from langchain_core.messages import HumanMessage, AIMessage # Import message types
 
 # --- MCP Schemas (Simplified based on common patterns) ---
 # These should ideally align with the official MCP spec if available,
@@ -42,26 +48,34 @@ router = APIRouter(
     tags=["MCP"],
 )
 
+def _last_user_message(request: MCPRequest) -> MCPMessage:
+    """Finds the last user message to use as input for the graph service."""
+    last_user_mcp_message = next((msg for msg in reversed(request.messages) if msg.role == "user"), None)
+    if not last_user_mcp_message:
+        raise HTTPException(status_code=400, detail="No user message found in the request")
+    return last_user_mcp_message
+
 # --- MCP Endpoint ---
 @router.post("/invoke", response_model=MCPResponse)
 async def invoke_agent_system(
     request: MCPRequest,
-    db: Session = Depends(get_db)
+    llm: LLMDep,
 ):
     """Handles an incoming request according to the Model Context Protocol.
 
     Receives conversation history and context, invokes the agent graph,
     and returns the assistant's response in MCP format.
+
+    Turns of one conversation run one at a time (409 if the conversation
+    stays busy past `conversation_lock_timeout`), and a request repeating a
+    message that is still being answered shares that answer. Runs are
+    admitted by `admission_controller` (429/503 with Retry-After when full).
     """
     print(f"--- Received MCP Invoke Request for Conv {request.conversation_id} ---")
     # print(f"Request Body: {request.dict()}")
 
     # 1. Validate and Extract Input
-    # Find the last user message to use as input for the graph service
-    last_user_mcp_message = next((msg for msg in reversed(request.messages) if msg.role == "user"), None)
-
-    if not last_user_mcp_message:
-        raise HTTPException(status_code=400, detail="No user message found in the request")
+    last_user_mcp_message = _last_user_message(request)
 
     # Convert the last user message to the format expected by graph_service
     # Note: graph_service currently expects the *entire* history to be loaded from DB,
@@ -71,13 +85,29 @@ async def invoke_agent_system(
     input_graph_message = HumanMessage(content=last_user_mcp_message.content)
 
     # 2. Call the Graph Service
+    async def turn() -> AIMessage | None:
+        # Runs in its own session: a coalesced turn can outlive the request that started it
+        async with async_session_maker() as db:
+            # The graph_service loads history, appends input_graph_message, runs graph, saves results
+            return await graph_service.run_graph_for_conversation(
+                conversation_id=request.conversation_id,
+                input_message=input_graph_message,
+                db=db,
+                llm=llm,
+                tools=await mcp_client_manager.tools(),
+            )
+
     try:
-        # The graph_service loads history, appends input_graph_message, runs graph, saves results
-        final_agent_message = await graph_service.run_graph_for_conversation(
-            conversation_id=request.conversation_id,
-            input_message=input_graph_message,
-            db=db
+        # Admitted, then locked, as streamed turns are. Only the run itself takes an
+        # admission slot, not requests coalesced into it.
+        final_agent_message = await conversation_runs.run(
+            request.conversation_id, last_user_mcp_message.content, turn,
+            admit=lambda: admission_controller.admit(request.user_id),
         )
+    except ConversationBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except AdmissionRejected:
+        raise # Answered with its status and Retry-After (see main.py)
     except Exception as e:
         print(f"Error running graph service: {e}")
         # Consider more specific error handling based on graph_service exceptions
@@ -105,5 +135,44 @@ async def invoke_agent_system(
     print(f"--- Sending MCP Invoke Response for Conv {request.conversation_id} ---")
     return mcp_response
 
-# TODO: Add other potential MCP endpoints if needed (e.g., for streaming, context management)
+@router.post("/invoke/stream")
+async def stream_agent_system(request: MCPRequest, llm: LLMDep):
+    """Streaming variant of `/invoke` as Server-Sent Events (SSE).
+
+    Emits `token` events with text deltas, `tool_start`/`tool_end` around tool
+    calls, a `message` event with the final assistant message and `saved`
+    once the turn is persisted. Each event's data is a JSON object.
+
+    The run is admitted before the stream starts, so a full server answers
+    with 429/503 and Retry-After instead of an event stream.
+    """
+    last_user_mcp_message = _last_user_message(request)
+    input_graph_message = HumanMessage(content=last_user_mcp_message.content)
+    print(f"--- Received MCP Stream Request for Conv {request.conversation_id} ---")
+    ticket = await admission_controller.acquire(request.user_id)
+
+    async def events() -> AsyncGenerator[Dict[str, str], None]:
+        try:
+            # Streams aren't coalesced, but still wait for the conversation's other turns
+            async with conversation_runs.lock(request.conversation_id):
+                async for event in graph_service.stream_graph_for_conversation(
+                    conversation_id=request.conversation_id,
+                    input_message=input_graph_message,
+                    llm=llm,
+                    tools=await mcp_client_manager.tools(),
+                ):
+                    yield {"event": event["event"], "data": json.dumps(event["data"], default=str)}
+        except ConversationBusy as e:
+            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-stream
+            print(f"Error streaming graph service: {e}")
+            yield {"event": "error", "data": json.dumps({"detail": f"Internal server error during agent processing: {e}"})}
+        finally:
+            ticket.release()
+
+    # Also released after the response, in case the stream never starts
+    return EventSourceResponse(events(), background=BackgroundTask(ticket.release))
+
+# TODO: Add other potential MCP endpoints if needed (e.g., context management)
 
@@ -0,0 +1,18 @@
+# Pydantic schemas, re-exported so callers can write `schemas.AgentCreate`
+from .agent import AgentCreate, AgentResponse, AgentUpdate
+from .agent_state import AgentStateCreateOrUpdate, AgentStateResponse
+from .conversation import ConversationCreate, ConversationPage, ConversationResponse, ConversationUpdate
+from .evaluation_result import EvaluationResultCreate, EvaluationResultResponse
+from .job import JobEventPage, JobEventResponse, JobResponse
+from .message import MessageCreate, MessagePage, MessageResponse
+from .team import TeamAgentUpdate, TeamCreate, TeamResponse, TeamUpdate
+
+__all__ = [
+    "AgentCreate", "AgentResponse", "AgentUpdate",
+    "AgentStateCreateOrUpdate", "AgentStateResponse",
+    "ConversationCreate", "ConversationPage", "ConversationResponse", "ConversationUpdate",
+    "EvaluationResultCreate", "EvaluationResultResponse",
+    "JobEventPage", "JobEventResponse", "JobResponse",
+    "MessageCreate", "MessagePage", "MessageResponse",
+    "TeamAgentUpdate", "TeamCreate", "TeamResponse", "TeamUpdate",
+]
@@ -2,14 +2,15 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import uuid
 from datetime import datetime
-from .message import MessageResponse # Import for relationship
+from .message import METADATA_ALIAS, MessageResponse # Import for relationship
+from .pagination import Page
 
 # Base schema for common fields
 class ConversationBase(BaseModel):
     user_id: Optional[str] = None
     team_id: Optional[uuid.UUID] = None
     title: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = Field(None, validation_alias=METADATA_ALIAS)
 
 # Schema for creating a conversation (request body)
 class ConversationCreate(ConversationBase):
@@ -18,7 +19,7 @@ class ConversationCreate(ConversationBase):
 # Schema for updating a conversation (request body)
 class ConversationUpdate(BaseModel):
     title: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = Field(None, validation_alias=METADATA_ALIAS)
 
 # Schema for conversation response (includes ID and timestamps)
 class ConversationResponse(ConversationBase):
@@ -31,3 +32,6 @@ class ConversationResponse(ConversationBase):
     class Config:
         from_attributes = True
 
+
+# Schema for a page of conversations (cursor pagination)
+ConversationPage = Page[ConversationResponse]
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+import uuid
+from datetime import datetime
+
+# Schema for a job as returned by the jobs API
+class JobResponse(BaseModel):
+    id: uuid.UUID
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# Schema for a job progress event
+class JobEventResponse(BaseModel):
+    id: int
+    event: str
+    data: Dict[str, Any]
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobEventPage(BaseModel):
+    items: List[JobEventResponse]
+    status: str
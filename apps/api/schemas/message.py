@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional, List, Dict, Any
 import uuid
 from datetime import datetime
+from .pagination import Page
+
+# ORM rows carry the column as metadata_ (see models.conversation_message)
+METADATA_ALIAS = AliasChoices("metadata_", "metadata")
 
 # Base schema for common fields
 class MessageBase(BaseModel):
@@ -11,7 +15,7 @@ class MessageBase(BaseModel):
     content: str
     tool_calls: Optional[List[Dict[str, Any]]] = None # For assistant messages requesting tool use
     tool_call_id: Optional[str] = None # For tool messages responding to a specific call
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = Field(None, validation_alias=METADATA_ALIAS)
 
 # Schema for creating a message (request body)
 class MessageCreate(MessageBase):
@@ -20,8 +24,13 @@ class MessageCreate(MessageBase):
 # Schema for message response (includes ID and timestamps)
 class MessageResponse(MessageBase):
     id: uuid.UUID
+    position: Optional[int] = None
+    token_count: Optional[int] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+
+# Schema for a page of messages (cursor pagination)
+MessagePage = Page[MessageResponse]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Response envelope for cursor (keyset) paginated listings
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the following page, if any")
+    prev_cursor: Optional[str] = Field(None, description="Opaque cursor for the preceding page, if any")
+
+    model_config = ConfigDict(from_attributes=True)
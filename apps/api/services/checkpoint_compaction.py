@@ -0,0 +1,147 @@
+# apps/api/services/checkpoint_compaction.py
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from ..core.agent.persistence import CheckpointerPool, PruneResult, checkpointer_pool, prune_thread
+from ..core.config import settings
+from ..core.logs import get_logger
+
+logger = get_logger(__name__)
+
+# Threads are visited in thread_id order, a page at a time, using the
+# checkpoints primary key; a run resumes where the previous one stopped.
+_THREADS_AFTER_SQL = """
+    SELECT DISTINCT thread_id
+    FROM checkpoints
+    WHERE thread_id > %(after)s
+    ORDER BY thread_id
+    LIMIT %(limit)s
+"""
+
+
+class CheckpointCompactor:
+    """Incremental, rate-limited compaction of the LangGraph checkpoint tables.
+
+    Each run visits up to `threads_per_run` threads and, per thread, deletes
+    superseded checkpoints (beyond `keep_last`, or older than `max_age`
+    seconds) with their `checkpoint_writes`, orphaned writes, and
+    `checkpoint_blobs` no remaining checkpoint references. Deletes run in
+    batches of `batch_size` rows, at most `batches_per_second` of them, so
+    foreground queries keep their latency. The latest checkpoint of every
+    thread is always kept.
+    """
+
+    def __init__(
+        self,
+        pool: CheckpointerPool,
+        keep_last: int = 20,
+        max_age: Optional[float] = None,
+        batch_size: int = 500,
+        batches_per_second: float = 10.0,
+        threads_per_run: int = 1000,
+        interval: float = 3600.0,
+    ):
+        self._checkpointer_pool = pool
+        self.keep_last = keep_last
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.batches_per_second = batches_per_second
+        self.threads_per_run = threads_per_run
+        self.interval = interval
+        self._cursor = ""
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._reclaimed = PruneResult()
+        self._last_run: Optional[Dict[str, Any]] = None
+        self._last_error: Optional[str] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically(), name="checkpoint-compactor")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(
+        self,
+        keep_last: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_threads: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Compacts the next page of threads. Arguments override the configured policy."""
+        keep_last = self.keep_last if keep_last is None else keep_last
+        max_age = self.max_age if max_age is None else max_age
+        max_threads = self.threads_per_run if max_threads is None else max_threads
+        pause = 1.0 / self.batches_per_second if self.batches_per_second > 0 else 0.0
+
+        async with self._lock: # One run at a time, whether periodic or requested
+            started = time.perf_counter()
+            pool = self._checkpointer_pool.pool
+            async with pool.connection() as conn:
+                rows = await (await conn.execute(
+                    _THREADS_AFTER_SQL, {"after": self._cursor, "limit": max_threads}
+                )).fetchall()
+            threads: List[str] = [row[0] for row in rows]
+            # A short page means the sweep reached the end; start over next time
+            self._cursor = threads[-1] if len(threads) == max_threads else ""
+
+            reclaimed = PruneResult()
+            for thread_id in threads:
+                reclaimed.merge(await prune_thread(
+                    pool,
+                    thread_id,
+                    keep_last=keep_last,
+                    max_age=max_age,
+                    batch_size=self.batch_size,
+                    pause=pause,
+                    orphans=True,
+                ))
+                await asyncio.sleep(pause)
+
+            self._runs += 1
+            self._reclaimed.merge(reclaimed)
+            self._last_run = {
+                "threads": len(threads),
+                "seconds": round(time.perf_counter() - started, 3),
+                "sweep_complete": self._cursor == "",
+                **reclaimed.as_dict(),
+            }
+            logger.info(f"Checkpoint compaction: {self._last_run}")
+            return self._last_run
+
+    async def _run_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._last_error = repr(e)
+                logger.warning(f"Checkpoint compaction failed: {e!r}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "runs": self._runs,
+            "reclaimed": self._reclaimed.as_dict(),
+            "last_run": self._last_run,
+            "last_error": self._last_error,
+        }
+
+
+checkpoint_compactor = CheckpointCompactor(
+    checkpointer_pool,
+    keep_last=settings.checkpoint_keep_last,
+    max_age=settings.checkpoint_max_age,
+    batch_size=settings.checkpoint_prune_batch_size,
+    batches_per_second=settings.checkpoint_compaction_batches_per_second,
+    threads_per_run=settings.checkpoint_compaction_threads_per_run,
+    interval=settings.checkpoint_compaction_interval,
+)
@@ -0,0 +1,206 @@
+# apps/api/services/conversation_runs.py
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from ..core.config import settings
+from ..core.dependencies import engine
+from ..core.logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class ConversationBusy(Exception):
+    """Raised when a conversation's lock could not be taken within the timeout."""
+
+
+def advisory_lock_key(conversation_id: str) -> int:
+    """Signed 64-bit Postgres advisory lock key of a conversation."""
+    digest = hashlib.sha256(f"conversation:{conversation_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def message_hash(content: Any) -> str:
+    return hashlib.sha256(str(content).encode()).hexdigest()
+
+
+class ConversationRunCoordinator:
+    """Serializes turns per conversation and coalesces duplicate requests.
+
+    Turns of one conversation run one at a time: an `asyncio.Lock` orders
+    them within a worker and, on Postgres, a transaction-level advisory lock
+    keyed by the conversation orders them across workers. The advisory lock
+    is polled with `pg_try_advisory_xact_lock` so waiting holds no
+    connection. The lock lives and dies with its transaction: releasing it is
+    a rollback, and a connection whose rollback fails is invalidated, so a
+    connection never goes back to the pool still holding a lock. `engine`
+    should be a small pool of its own; every running turn holds one of its
+    connections, which must not compete with the request pool.
+
+    A request whose conversation and message match one already in flight in
+    this worker does not run again; it waits for and returns the same result.
+    The shared run is shielded, so it finishes even if the request that
+    started it disconnects.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        lock_timeout: float = 120.0,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 1.0,
+    ):
+        self._engine = engine
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._local_locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._runs = 0
+        self._coalesced = 0
+        self._lock_waits = 0
+        self._lock_wait_seconds = 0.0
+        self._lock_timeouts = 0
+
+    async def run(
+        self,
+        conversation_id: str,
+        content: Any,
+        turn: Callable[[], Awaitable[Any]],
+        admit: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+    ) -> Any:
+        """Runs `turn` under the conversation's lock, or joins an identical run in flight.
+
+        `admit` (e.g. an admission slot) is entered before the lock is taken
+        and held until the turn ends; requests joining a run don't enter it.
+        """
+        key = (str(conversation_id), message_hash(content))
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            return await asyncio.shield(task)
+
+        async def locked_turn() -> Any:
+            # Admitted before locking, like streamed turns, so no run holds a
+            # lock connection while it waits for admission
+            async with admit() if admit is not None else nullcontext(), self.lock(conversation_id):
+                return await turn()
+
+        task = asyncio.create_task(locked_turn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        self._runs += 1
+        return await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def lock(self, conversation_id: str) -> AsyncIterator[None]:
+        """Holds the conversation's lock; raises ConversationBusy after `lock_timeout`."""
+        conversation_id = str(conversation_id)
+        local = self._local_locks.setdefault(conversation_id, asyncio.Lock())
+        self._lock_users[conversation_id] = self._lock_users.get(conversation_id, 0) + 1
+        started = time.perf_counter()
+        conn: Optional[AsyncConnection] = None
+        try:
+            waited = local.locked()
+            try:
+                await asyncio.wait_for(local.acquire(), timeout=self.lock_timeout)
+            except asyncio.TimeoutError:
+                self._record_wait(started, timed_out=True)
+                raise ConversationBusy(f"Conversation {conversation_id} is busy") from None
+            try:
+                if self._engine is not None:
+                    conn, polled = await self._acquire_advisory(conversation_id, started)
+                    waited = waited or polled
+                if waited:
+                    self._record_wait(started)
+                yield
+            finally:
+                if conn is not None:
+                    await self._release_advisory(conn)
+                local.release()
+        finally:
+            # Drop the conversation's lock once nobody holds or waits for it
+            self._lock_users[conversation_id] -= 1
+            if not self._lock_users[conversation_id]:
+                del self._lock_users[conversation_id]
+                del self._local_locks[conversation_id]
+
+    async def _acquire_advisory(self, conversation_id: str, started: float) -> Tuple[AsyncConnection, bool]:
+        key = advisory_lock_key(conversation_id)
+        interval, polled = self.poll_interval, False
+        while True:
+            try:
+                conn = await self._engine.connect()
+            except PoolTimeout:
+                self._record_wait(started, timed_out=True)
+                raise ConversationBusy(f"No connection free to lock conversation {conversation_id}") from None
+            try:
+                # Held by the transaction this begins, until _release_advisory ends it
+                acquired = (await conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key})).scalar()
+            except BaseException:
+                await self._release_advisory(conn)
+                raise
+            if acquired:
+                return conn, polled
+            await self._release_advisory(conn)
+            polled = True
+            if time.perf_counter() - started + interval > self.lock_timeout:
+                self._record_wait(started, timed_out=True)
+                raise ConversationBusy(f"Conversation {conversation_id} is busy in another worker")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def _release_advisory(self, conn: AsyncConnection) -> None:
+        try:
+            # Ending the transaction releases the lock
+            await conn.rollback()
+        except BaseException:
+            # Failed or cancelled mid-rollback: the lock may still be held, so
+            # the connection must not be reused
+            try:
+                await conn.invalidate()
+            except Exception as e:
+                logger.warning(f"Failed to invalidate a conversation lock connection: {e!r}")
+            raise
+        finally:
+            await conn.close()
+
+    async def close(self) -> None:
+        """Closes the lock connection pool."""
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    def _record_wait(self, started: float, timed_out: bool = False) -> None:
+        self._lock_waits += 1
+        self._lock_wait_seconds += time.perf_counter() - started
+        self._lock_timeouts += timed_out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self._runs,
+            "in_flight": len(self._inflight),
+            "coalesced": self._coalesced,
+            "lock_waits": self._lock_waits,
+            "lock_wait_seconds_total": round(self._lock_wait_seconds, 6),
+            "lock_timeouts": self._lock_timeouts,
+            "cross_worker": self._engine is not None,
+        }
+
+
+conversation_runs = ConversationRunCoordinator(
+    # Lock connections come from their own pool, sized for the turns that can run at once
+    engine=create_async_engine(
+        settings.orm_conn_str,
+        pool_size=settings.conversation_lock_pool_size,
+        max_overflow=0,
+        pool_timeout=settings.conversation_lock_timeout,
+    ) if engine.dialect.name == "postgresql" else None,
+    lock_timeout=settings.conversation_lock_timeout,
+)
@@ -0,0 +1,179 @@
+# apps/api/services/conversation_summary.py
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..core.agent.prompts import SUMMARY_PROMPT
+from ..core.config import settings
+from ..core.dependencies import async_session_maker, get_llm
+from ..core.logs import get_logger
+from ..core.tokens import count_message_tokens
+from ..crud import conversation as crud_conversation
+from ..crud import message as crud_message
+
+logger = get_logger(__name__)
+
+# Rolling summaries live in Conversation.metadata["summary"]:
+#   text             the summary of every message up to through_position
+#   through_position position of the last message folded into it
+#   messages         number of messages folded in so far
+#   updated_at       when it was last extended
+SUMMARY_KEY = "summary"
+
+
+def get_summary(conversation: Any) -> Optional[Dict[str, Any]]:
+    """Returns the stored rolling summary of a conversation, if any."""
+    if conversation is None:
+        return None
+    return (conversation.metadata_ or {}).get(SUMMARY_KEY)
+
+
+def summary_message(summary: Dict[str, Any]) -> SystemMessage:
+    """The summary as it is sent to the model ahead of the recent messages."""
+    return SystemMessage(content=f"Summary of the earlier conversation:\n{summary['text']}")
+
+
+def _message_tokens(message: Any) -> int:
+    if message.token_count is None:
+        return count_message_tokens(message.content, message.tool_calls)
+    return message.token_count
+
+
+class ConversationSummarizer:
+    """Folds older messages into a rolling per-conversation summary in the background.
+
+    After each turn the conversation is queued with `schedule()`. Once the
+    messages not yet covered by the summary exceed `trigger_tokens`, all but
+    the newest `tail_tokens` worth of them are folded into the summary with
+    one model call that sees only the previous summary and those messages, so
+    a summary is extended incrementally and never rebuilt from scratch.
+    """
+
+    def __init__(
+        self,
+        llm_factory: Callable[[], BaseChatModel] = get_llm,
+        session_maker: async_sessionmaker = async_session_maker,
+        trigger_tokens: int = 3000,
+        tail_tokens: int = 1500,
+        max_words: int = 300,
+        max_queue_size: int = 1000,
+    ):
+        self._llm_factory = llm_factory
+        self._session_maker = session_maker
+        self.trigger_tokens = trigger_tokens
+        self.tail_tokens = tail_tokens
+        self.max_words = max_words
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._queued: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self._summaries = 0
+        self._folded_messages = 0
+        self._failed = 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="conversation-summarizer")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, conversation_id: str) -> bool:
+        """Queues a conversation for a summary check. Never blocks; duplicates are ignored."""
+        if self._task is None or conversation_id in self._queued:
+            return False
+        try:
+            self._queue.put_nowait(conversation_id)
+        except asyncio.QueueFull:
+            return False
+        self._queued.add(conversation_id)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            conversation_id = await self._queue.get()
+            self._queued.discard(conversation_id)
+            try:
+                await self.summarize(conversation_id)
+            except Exception as e:
+                self._failed += 1
+                logger.warning(f"Failed to summarize conversation {conversation_id}: {e!r}")
+            finally:
+                self._queue.task_done()
+
+    async def summarize(self, conversation_id: str) -> bool:
+        """Extends the conversation's summary if enough new messages have accumulated.
+
+        Returns:
+            bool: Whether the summary was updated.
+        """
+        async with self._session_maker() as db:
+            conversation = await crud_conversation.get_conversation(db, uuid.UUID(str(conversation_id)))
+            if conversation is None:
+                return False
+            summary = get_summary(conversation) or {}
+            pending = await crud_message.get_messages_after_position(
+                db, conversation.id, after_position=summary.get("through_position")
+            )
+            if sum(_message_tokens(m) for m in pending) < self.trigger_tokens:
+                return False
+
+            # Leave the newest messages verbatim; they are what the history window sends
+            tail, split = 0, len(pending)
+            while split > 0 and tail + _message_tokens(pending[split - 1]) <= self.tail_tokens:
+                split -= 1
+                tail += _message_tokens(pending[split])
+            to_fold = pending[:split]
+            if not to_fold:
+                return False
+
+            text = await self._fold(summary.get("text"), to_fold)
+            metadata = dict(conversation.metadata_ or {})
+            metadata[SUMMARY_KEY] = {
+                "text": text,
+                "through_position": to_fold[-1].position,
+                "messages": summary.get("messages", 0) + len(to_fold),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+            conversation.metadata_ = metadata # Reassigned so the JSON column is marked dirty
+            await db.commit()
+
+        self._summaries += 1
+        self._folded_messages += len(to_fold)
+        return True
+
+    async def _fold(self, previous: Optional[str], messages: List[Any]) -> str:
+        transcript = "\n".join(f"{m.role}: {m.content}" for m in messages)
+        prompt = SUMMARY_PROMPT.format(
+            max_words=self.max_words,
+            summary=previous or "(none yet)",
+            messages=transcript,
+        )
+        response = await self._llm_factory().ainvoke(prompt)
+        return str(response.content).strip()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "depth": self._queue.qsize(),
+            "summaries": self._summaries,
+            "folded_messages": self._folded_messages,
+            "failed": self._failed,
+        }
+
+
+conversation_summarizer = ConversationSummarizer(
+    trigger_tokens=settings.summary_trigger_tokens,
+    tail_tokens=settings.summary_tail_tokens,
+    max_words=settings.summary_max_words,
+)
@@ -1,92 +1,92 @@
 # apps/api/services/graph_service.py
-import os
+import asyncio
 import uuid
-from typing import List, Dict, Any
-from sqlalchemy.orm import Session
-from langgraph.graph.message import AnyMessage, HumanMessage, AIMessage, ToolMessage
-from mem0 import Memory
+from typing import AsyncGenerator, List, Dict, Any, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, convert_to_messages
+from langchain_core.tools import BaseTool
+from langgraph.graph.message import AnyMessage
 from dotenv import load_dotenv
 
-from ..graphs.graph import app_graph
+from ..core.config import settings
+from ..core.dependencies import async_session_maker
+from ..core.memory import MemoryHandle, memory_registry
+from ..core.memory_writer import memory_writer
+from ..core.tokens import count_message_tokens
+from ..graphs.graph import app_graph, graph_run_stats
 from ..graphs.state import AgentState
+from ..crud import conversation as crud_conversation
 from ..crud import message as crud_message
 from ..crud import agent_state as crud_agent_state
 from ..schemas.message import MessageCreate
 from ..schemas.agent_state import AgentStateCreateOrUpdate
+from .conversation_summary import conversation_summarizer, get_summary, summary_message
+from .team_roster import TeamRoster, team_roster_cache
 
 # Load environment variables from .env file
 load_dotenv()
 
 # --- Memory Initialization ---
 
-def get_memory_for_conversation(conversation_id: str, user_id: str = "default_user") -> Memory:
-    """Initializes or retrieves a mem0 Memory instance for a conversation/user."""
-    # Configure mem0 to use Neo4j graph store
-    neo4j_uri = os.getenv("NEO4J_URI", "neo4j://localhost:7687")
-    neo4j_user = os.getenv("NEO4J_USERNAME", "neo4j")
-    neo4j_password = os.getenv("NEO4J_PASSWORD", "changeme")
-
-    config = {
-        "vector_store": {
-            "provider": "qdrant", # Default vector store, can be configured
-            "config": {
-                "host": "localhost",
-                "port": 6333,
-            }
-        },
-        "graph_store": {
-            "provider": "neo4j",
-            "config": {
-                "url": neo4j_uri,
-                "username": neo4j_user,
-                "password": neo4j_password
-            }
-        },
-        # Add LLM config if needed, otherwise uses mem0 default
-        # "llm": {
-        #     "provider": "openai",
-        #     "config": {
-        #         "model": "gpt-4o",
-        #         "api_key": os.getenv("OPENAI_API_KEY")
-        #     }
-        # }
-    }
-    # Initialize memory - mem0 handles persistence based on config
-    # We might associate memory with user_id or conversation_id depending on desired scope
+def get_memory_for_conversation(conversation_id: str, user_id: str = "default_user") -> MemoryHandle:
+    """Returns a handle on the shared mem0 Memory scoped to a conversation/user."""
+    # The backend clients are owned by the process-wide registry opened in the app lifespan;
+    # a handle only binds the user_id that memory operations are scoped to.
     # Using user_id as per mem0 graph examples
-    print(f"[Graph Service] Initializing mem0 with Neo4j for user: {user_id}")
-    return Memory.from_config(config_dict=config)
+    return memory_registry.scoped(user_id=user_id)
 
 # --- Agent/Team Logic ---
 
-# TODO: Replace with actual agent/team fetching logic
-def get_initial_agent_id(conversation_id: str, db: Session) -> str:
-    # Placeholder: Determine the first agent to act in a conversation
-    print(f"[Graph Service] Determining initial agent for conv {conversation_id}")
-    return "agent_1" # Placeholder
+async def get_team_roster(conversation: Any, db: AsyncSession) -> TeamRoster | None:
+    """The roster of the conversation's team, from the in-process roster cache."""
+    if conversation is None or conversation.team_id is None:
+        return None
+    return await team_roster_cache.get(db, conversation.team_id)
+
+def get_initial_agent_id(conversation_id: str, roster: TeamRoster | None) -> str:
+    """Picks the first agent to act in a conversation from its team roster."""
+    agent = roster.initial_agent() if roster is not None else None
+    if agent is None:
+        print(f"[Graph Service] No team agents for conv {conversation_id}, using the default agent")
+        return "agent_1" # Placeholder for conversations without a team
+    return agent.id
 
 # --- Message Conversion ---
 
+def _parse_uuid(value: Any) -> uuid.UUID | None:
+    """Returns value as a UUID, or None for empty or placeholder (non-UUID) ids."""
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
 def _convert_db_messages_to_graph_messages(db_messages: List[Any]) -> List[AnyMessage]:
     """Converts messages retrieved from the database to LangGraph message format."""
     graph_messages = []
     for msg in db_messages:
         content = msg.content
-        if msg.sender_type == "user":
+        if msg.role == "user":
             graph_messages.append(HumanMessage(content=content, id=str(msg.id)))
-        elif msg.sender_type == "agent":
-            graph_messages.append(AIMessage(content=content, id=str(msg.id)))
-        elif msg.sender_type == "tool":
-            tool_call_id = msg.metadata.get("tool_call_id", "unknown_tool_call")
+        elif msg.role == "assistant":
+            graph_messages.append(AIMessage(content=content, tool_calls=msg.tool_calls or [], id=str(msg.id)))
+        elif msg.role == "tool":
+            tool_call_id = msg.tool_call_id or (msg.metadata_ or {}).get("tool_call_id", "unknown_tool_call")
             graph_messages.append(ToolMessage(content=content, tool_call_id=tool_call_id, id=str(msg.id)))
     return graph_messages
 
 # --- Graph Execution ---
 
-async def run_graph_for_conversation(conversation_id: str, input_message: HumanMessage, db: Session):
-    """Runs the LangGraph for a given conversation, integrating mem0."""
-    print(f"[Graph Service] Running graph for conv {conversation_id}")
+def _graph_config(llm: BaseChatModel | None = None, tools: Sequence[BaseTool] = ()) -> Dict[str, Any]:
+    config: Dict[str, Any] = {"recursion_limit": 50}
+    if llm is not None:
+        # Nodes read the chat model and the MCP tools from the run config: call_agent
+        # binds the current agent's tools, execute_tools runs the calls it makes
+        config["configurable"] = {"llm": llm, "tools": list(tools)}
+    return config
 
+async def _prepare_turn(conversation_id: str, input_message: HumanMessage, db: AsyncSession) -> AgentState:
+    """Loads history and builds the initial graph state for one turn."""
     # Assume a user_id is associated with the conversation or derived
     # For simplicity, using conversation_id as user_id for memory scope
     user_id_for_memory = f"conv_{conversation_id}"
@@ -94,108 +94,245 @@ async def run_graph_for_conversation(conversation_id: str, input_message: HumanM
     # 1. Initialize Memory
     memory = get_memory_for_conversation(conversation_id, user_id=user_id_for_memory)
 
-    # 2. Load existing conversation state (messages)
-    db_messages = crud_message.get_messages_by_conversation(db, conversation_id=conversation_id, limit=50)
-    graph_messages = _convert_db_messages_to_graph_messages(db_messages)
+    # 2. Load existing conversation state: the rolling summary of older messages (if any)
+    # plus the newest messages it doesn't cover that fit the history token budget
+    conversation_uuid = _parse_uuid(conversation_id)
+    conversation = await crud_conversation.get_conversation(db, conversation_uuid) if conversation_uuid else None
+    summary = get_summary(conversation)
+    budget = settings.history_max_tokens - count_message_tokens(str(input_message.content))
+    graph_messages: List[AnyMessage] = []
+    if summary:
+        graph_messages.append(summary_message(summary))
+        budget -= count_message_tokens(summary["text"])
+    db_messages = await crud_message.get_history_window(
+        db,
+        conversation_id=conversation_uuid,
+        max_tokens=max(budget, 0),
+        after_position=summary["through_position"] if summary else None,
+    ) if conversation_uuid else []
+    graph_messages.extend(_convert_db_messages_to_graph_messages(db_messages))
     graph_messages.append(input_message) # Add the new user message
 
-    # Add new user message to memory
-    try:
-        memory.add(input_message.content, user_id=user_id_for_memory, metadata={
-            "conversation_id": conversation_id,
-            "message_id": str(input_message.id) if input_message.id else str(uuid.uuid4()),
-            "sender_type": "user"
-        })
-        print(f"[Graph Service] Added user message to mem0 for user: {user_id_for_memory}")
-    except Exception as e:
-        print(f"[Graph Service] Error adding user message to mem0: {e}")
-
-    # Determine the agent to start with
-    current_agent_id = get_initial_agent_id(conversation_id, db)
+    # Queue new user message for mem0 (written behind the request, see core.memory_writer)
+    memory_writer.submit(user_id_for_memory, input_message.content, role="user", metadata={
+        "conversation_id": conversation_id,
+        "message_id": str(input_message.id) if input_message.id else str(uuid.uuid4()),
+        "sender_type": "user"
+    })
+
+    # Determine the agent to start with (no queries once the team's roster is cached)
+    roster = await get_team_roster(conversation, db)
+    current_agent_id = get_initial_agent_id(conversation_id, roster)
 
     # 3. Prepare initial graph state (including memory)
-    initial_state: AgentState = {
+    return {
         "messages": graph_messages,
         "conversation_id": conversation_id,
         "current_agent_id": current_agent_id,
         "memory": memory, # Pass memory instance to the graph
+        "roster": roster,
         "next_node": None,
     }
 
+async def _save_turn(
+    conversation_id: str,
+    input_message: HumanMessage,
+    new_graph_messages: List[AnyMessage],
+    agent_id: str | None,
+    db: AsyncSession,
+) -> AIMessage | None:
+    """Queues the turn for mem0 and saves it in one transaction. Returns the last AI message."""
+    user_id_for_memory = f"conv_{conversation_id}"
+    last_ai_message = None
+    messages_to_save = [
+        MessageCreate(
+            conversation_id=uuid.UUID(conversation_id),
+            role="user",
+            content=str(input_message.content),
+        )
+    ]
+    print(f"[Graph Service] New messages from graph: {len(new_graph_messages)}")
+    for msg in new_graph_messages:
+        msg_content = str(msg.content)
+        msg_id = str(msg.id) if msg.id else str(uuid.uuid4())
+
+        if isinstance(msg, AIMessage):
+            last_ai_message = msg # Keep track of the last AI response
+            # Queue AI message for mem0
+            memory_writer.submit(user_id_for_memory, msg_content, role="assistant", metadata={
+                "conversation_id": conversation_id,
+                "message_id": msg_id,
+                "sender_type": "agent",
+                "agent_id": agent_id
+            })
+            messages_to_save.append(MessageCreate(
+                conversation_id=uuid.UUID(conversation_id),
+                agent_id=_parse_uuid(agent_id),
+                role="assistant",
+                content=msg_content,
+                tool_calls=msg.tool_calls or None,
+            ))
+
+        elif isinstance(msg, ToolMessage):
+            # Queue Tool message/result for mem0
+            memory_writer.submit(user_id_for_memory, f"Tool Result ({msg.tool_call_id}): {msg_content}", role="assistant", metadata={
+                "conversation_id": conversation_id,
+                "message_id": msg_id,
+                "sender_type": "tool",
+                "tool_call_id": msg.tool_call_id
+            })
+            messages_to_save.append(MessageCreate(
+                conversation_id=uuid.UUID(conversation_id),
+                role="tool",
+                content=msg_content,
+                tool_call_id=msg.tool_call_id,
+                metadata={"tool_call_id": msg.tool_call_id},
+            ))
+
+        # HumanMessages are the input message, which is already part of the turn
+
+    # Save the turn to PostgreSQL DB: one multi-row INSERT, one commit
+    await crud_message.create_messages(db=db, messages=messages_to_save)
+    print(f"[Graph Service] Saved {len(messages_to_save)} messages to DB.")
+    # Fold older messages into the rolling summary once the conversation is long enough
+    conversation_summarizer.schedule(conversation_id)
+
+    # TODO: Save the final agent state if needed for persistence
+    return last_ai_message
+
+class _RunTotals:
+    """Adds up the steps and tokens a run's node updates report."""
+
+    def __init__(self):
+        self.steps = 0
+        self.tokens = 0
+        self.stop_reason: str | None = None
+
+    def add(self, node_output: Dict[str, Any]) -> None:
+        self.steps += node_output.get("steps", 0)
+        self.tokens += node_output.get("tokens_used", 0)
+        self.stop_reason = node_output.get("stop_reason") or self.stop_reason
+
+    def record(self) -> None:
+        graph_run_stats.record(self.steps, self.tokens, self.stop_reason)
+        if self.stop_reason:
+            print(f"[Graph Service] Run stopped early: {self.stop_reason} budget used up")
+
+async def run_graph_for_conversation(
+    conversation_id: str,
+    input_message: HumanMessage,
+    db: AsyncSession,
+    llm: BaseChatModel | None = None,
+    tools: Sequence[BaseTool] = (),
+):
+    """Runs the LangGraph for a given conversation, integrating mem0.
+
+    `tools` (the MCP tool catalog) are what the conversation's agents may call.
+    """
+    print(f"[Graph Service] Running graph for conv {conversation_id}")
+    initial_state = await _prepare_turn(conversation_id, input_message, db)
+    current_agent_id = initial_state["current_agent_id"]
+
     # 4. Invoke the graph
     final_state = None
+    new_graph_messages: List[AnyMessage] = []
+    run = _RunTotals()
     print(f"[Graph Service] Invoking graph with initial state for conv {conversation_id}")
-    async for event in app_graph.astream(initial_state, config={"recursion_limit": 50}):
+    async for event in app_graph.astream(initial_state, config=_graph_config(llm, tools)):
         node_name = list(event.keys())[0]
         node_output = event[node_name]
         print(f"--- Graph Event ({conversation_id}): Node ", node_name, " Output ---")
         if isinstance(node_output, dict):
              final_state = node_output
+             run.add(node_output)
+             # Stream events carry each node's update, so collect the messages it appended
+             new_graph_messages.extend(convert_to_messages(node_output.get("messages") or []))
 
-    print(f"[Graph Service] Graph execution finished for conv {conversation_id}")
-
-    # 5. Process final state (save new messages, update memory)
-    last_ai_message = None
-    if final_state and "messages" in final_state:
-        new_graph_messages = final_state["messages"][len(graph_messages):]
-        print(f"[Graph Service] New messages from graph: {len(new_graph_messages)}")
-        for msg in new_graph_messages:
-            sender_type = "unknown"
-            agent_id = None
-            metadata = {}
-            msg_content = str(msg.content)
-            msg_id = str(msg.id) if msg.id else str(uuid.uuid4())
-
-            if isinstance(msg, AIMessage):
-                sender_type = "agent"
-                agent_id = final_state.get("current_agent_id")
-                last_ai_message = msg # Keep track of the last AI response
-                # Add AI message to memory
-                try:
-                    memory.add(msg_content, user_id=user_id_for_memory, metadata={
-                        "conversation_id": conversation_id,
-                        "message_id": msg_id,
-                        "sender_type": "agent",
-                        "agent_id": agent_id
-                    })
-                    print(f"[Graph Service] Added agent message to mem0 for user: {user_id_for_memory}")
-                except Exception as e:
-                    print(f"[Graph Service] Error adding agent message to mem0: {e}")
-
-            elif isinstance(msg, ToolMessage):
-                sender_type = "tool"
-                metadata = {"tool_call_id": msg.tool_call_id}
-                # Add Tool message/result to memory
-                try:
-                    memory.add(f"Tool Result ({msg.tool_call_id}): {msg_content}", user_id=user_id_for_memory, metadata={
-                        "conversation_id": conversation_id,
-                        "message_id": msg_id,
-                        "sender_type": "tool",
-                        "tool_call_id": msg.tool_call_id
-                    })
-                    print(f"[Graph Service] Added tool message to mem0 for user: {user_id_for_memory}")
-                except Exception as e:
-                    print(f"[Graph Service] Error adding tool message to mem0: {e}")
-
-            elif isinstance(msg, HumanMessage):
-                 continue # Already added before graph invocation
-
-            # Save message to PostgreSQL DB
-            if sender_type != "unknown":
-                message_create = MessageCreate(
-                    conversation_id=uuid.UUID(conversation_id),
-                    agent_id=uuid.UUID(agent_id) if agent_id else None,
-                    content=msg_content,
-                    sender_type=sender_type,
-                    metadata=metadata
-                )
-                # Use msg_id from graph message if available, otherwise let DB generate
-                # Note: Ensure your CRUD/model handles ID assignment correctly
-                crud_message.create_message(db=db, message=message_create)
-                print(f"[Graph Service] Saved {sender_type} message to DB.")
+    run.record()
+    print(f"[Graph Service] Graph execution finished for conv {conversation_id} after {run.steps} steps")
 
-    # TODO: Save the final agent state if needed for persistence
+    # 5. Process new messages (update memory, save the whole turn in one transaction)
+    agent_id = (final_state or {}).get("current_agent_id") or current_agent_id
+    last_ai_message = await _save_turn(conversation_id, input_message, new_graph_messages, agent_id, db)
 
     # 6. Return the last AI message
     return last_ai_message
 
+# --- Streaming Graph Execution ---
+
+# Turns still being saved after their stream ended (keeps the tasks referenced)
+_pending_saves: set[asyncio.Task] = set()
+
+def _event(event: str, **data: Any) -> Dict[str, Any]:
+    return {"event": event, "data": data}
+
+async def stream_graph_for_conversation(
+    conversation_id: str,
+    input_message: HumanMessage,
+    llm: BaseChatModel | None = None,
+    session_maker: async_sessionmaker = async_session_maker,
+    tools: Sequence[BaseTool] = (),
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """Runs the graph for one turn, yielding events as they happen.
+
+    Events (each `{"event": ..., "data": {...}}`):
+        token: a text delta from the model (`delta`).
+        tool_start: the agent requested a tool call (`tool_call_id`, `name`, `args`).
+        tool_end: a tool call returned (`tool_call_id`, `content`).
+        message: the final assistant message (`role`, `content`, `tool_calls`).
+        saved: the turn has been written to the database.
+
+    The final `message` event is sent before the turn is saved. The save runs
+    as its own task, so it completes even if the client disconnects after the
+    last token. Sessions come from `session_maker` and are not held open
+    while the model is generating. Agents may call `tools`, as in
+    `run_graph_for_conversation`.
+    """
+    print(f"[Graph Service] Streaming graph for conv {conversation_id}")
+    async with session_maker() as db:
+        initial_state = await _prepare_turn(conversation_id, input_message, db)
+    agent_id = initial_state["current_agent_id"]
+
+    new_graph_messages: List[AnyMessage] = []
+    run = _RunTotals()
+    async for mode, chunk in app_graph.astream(
+        initial_state, config=_graph_config(llm, tools), stream_mode=["messages", "updates"]
+    ):
+        if mode == "messages":
+            message, _ = chunk
+            if isinstance(message, AIMessage) and isinstance(message.content, str) and message.content:
+                yield _event("token", delta=message.content)
+            continue
+        for node_output in chunk.values():
+            if not isinstance(node_output, dict):
+                continue
+            run.add(node_output)
+            agent_id = node_output.get("current_agent_id") or agent_id
+            for message in convert_to_messages(node_output.get("messages") or []):
+                new_graph_messages.append(message)
+                if isinstance(message, AIMessage):
+                    for tool_call in message.tool_calls:
+                        yield _event("tool_start", tool_call_id=tool_call["id"], name=tool_call["name"], args=tool_call["args"])
+                elif isinstance(message, ToolMessage):
+                    yield _event("tool_end", tool_call_id=message.tool_call_id, content=str(message.content))
+    run.record()
+
+    async def save() -> None:
+        async with session_maker() as db:
+            await _save_turn(conversation_id, input_message, new_graph_messages, agent_id, db)
+
+    saving = asyncio.create_task(save())
+    _pending_saves.add(saving)
+    saving.add_done_callback(_pending_saves.discard)
+
+    final_message = next((m for m in reversed(new_graph_messages) if isinstance(m, AIMessage)), None)
+    if final_message is not None:
+        yield _event(
+            "message",
+            role="assistant",
+            content=str(final_message.content),
+            tool_calls=final_message.tool_calls or None,
+        )
+    # Shielded: a disconnect cancels this generator, not the save
+    await asyncio.shield(saving)
+    yield _event("saved", conversation_id=conversation_id)
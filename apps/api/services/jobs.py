@@ -0,0 +1,390 @@
+# apps/api/services/jobs.py
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from langchain_core.messages import HumanMessage
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..core.config import settings
+from ..core.dependencies import async_session_maker, get_llm
+from ..core.logs import get_logger
+from ..core.mcps import mcp_client_manager
+from ..models.job import Job, JobEvent
+from . import graph_service
+from .conversation_runs import conversation_runs
+
+logger = get_logger(__name__)
+
+FINISHED = ("succeeded", "failed")
+
+Emit = Callable[[str, Dict[str, Any]], Awaitable[None]]
+# handler(payload, emit) -> result; raising fails the attempt
+Handler = Callable[[Dict[str, Any], Emit], Awaitable[Dict[str, Any]]]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """Durable queue of agent runs backed by the `agent_jobs` table.
+
+    Workers claim the oldest runnable job with `SELECT ... FOR UPDATE SKIP
+    LOCKED`, so any number of workers, in this process or in others started
+    with `python -m api.services.jobs`, share the table without a broker or
+    double-running a job. A running job's heartbeat is refreshed every third
+    of `lease_seconds`; jobs whose heartbeat goes stale (their worker died or
+    restarted) are put back in the queue. A failed attempt is retried with
+    exponential backoff until `max_attempts` is reached.
+
+    Progress events go to `agent_job_events` so subscribers in any process
+    can follow a job; subscribers in the worker's own process are woken
+    directly instead of polling.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+        retry_backoff: float = 5.0,
+        max_attempts: int = 3,
+    ):
+        self._session_maker = session_maker
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: Dict[str, Handler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._subscribers: Dict[uuid.UUID, Set[asyncio.Event]] = {}
+        self._last_recovery = 0.0
+        self._running = 0
+        self._busy: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._counts = {
+            "submitted": 0, "succeeded": 0, "failed": 0, "retried": 0, "recovered": 0,
+            "heartbeat_failures": 0, "abandoned": 0,
+        }
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    async def submit(self, kind: str, payload: Dict[str, Any], max_attempts: Optional[int] = None) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        job = Job(
+            kind=kind,
+            status="queued",
+            payload=payload,
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            run_after=_now(),
+        )
+        async with self._session_maker() as db:
+            db.add(job)
+            await db.commit()
+        self._counts["submitted"] += 1
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: uuid.UUID) -> Optional[Job]:
+        async with self._session_maker() as db:
+            return await db.get(Job, job_id)
+
+    async def events_after(self, job_id: uuid.UUID, after_id: int = 0, limit: int = 100) -> List[JobEvent]:
+        async with self._session_maker() as db:
+            result = await db.execute(
+                select(JobEvent)
+                .where(JobEvent.job_id == job_id, JobEvent.id > after_id)
+                .order_by(JobEvent.id)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def wait_for_update(self, job_id: uuid.UUID, timeout: float) -> None:
+        """Returns when this process records an event for the job, or after `timeout`."""
+        update_event = asyncio.Event()
+        waiters = self._subscribers.setdefault(job_id, set())
+        waiters.add(update_event)
+        try:
+            await asyncio.wait_for(update_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters.discard(update_event)
+            if not waiters:
+                self._subscribers.pop(job_id, None)
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._stopping = False
+            self._tasks = [
+                asyncio.create_task(self._work(), name=f"job-worker-{i}") for i in range(self.workers)
+            ]
+
+    async def close(self) -> None:
+        # Idle workers stop between polls, so no query is cut off; workers
+        # running a job are cancelled, which hands the job back
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._busy:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while not self._stopping:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to dequeue a job: {e!r}")
+                job = None
+            if job is None:
+                if self._stopping:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if self._stopping:
+                # Claimed while closing: hand it back without spending an attempt
+                await self._finish(job, status="queued", attempts=job.attempts - 1, locked_by=None)
+                break
+            task = asyncio.current_task()
+            self._busy.add(task)
+            try:
+                await self._execute(job)
+            finally:
+                self._busy.discard(task)
+
+    async def _claim(self) -> Optional[Job]:
+        async with self._session_maker() as db:
+            await self._recover_stale(db)
+            now = _now()
+            job = (await db.execute(
+                select(Job)
+                .where(Job.status == "queued", Job.run_after <= now)
+                .order_by(Job.run_after, Job.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )).scalar_one_or_none()
+            if job is None:
+                await db.rollback()
+                return None
+            job.status = "running"
+            job.attempts += 1
+            job.locked_by = self.worker_id
+            job.heartbeat_at = now
+            await db.commit()
+            return job
+
+    async def _recover_stale(self, db) -> None:
+        # At most twice per lease: requeue jobs whose worker stopped heartbeating
+        loop_time = asyncio.get_running_loop().time()
+        if loop_time - self._last_recovery < self.lease_seconds / 2:
+            return
+        self._last_recovery = loop_time
+        result = await db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.heartbeat_at < _now() - timedelta(seconds=self.lease_seconds))
+            .values(status="queued", locked_by=None, run_after=_now())
+        )
+        await db.commit()
+        if result.rowcount:
+            self._counts["recovered"] += result.rowcount
+            logger.info(f"Requeued {result.rowcount} job(s) abandoned by their worker")
+
+    async def _execute(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        work: Optional[asyncio.Task] = None
+        heartbeat: Optional[asyncio.Task] = None
+        finished = asyncio.Event()
+        self._running += 1
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job kind {job.kind!r}")
+            await self._emit(job.id, "started", {"attempt": job.attempts})
+            work = asyncio.create_task(handler(job.payload, lambda event, data: self._emit(job.id, event, data)))
+            heartbeat = asyncio.create_task(self._heartbeat(job.id, work, finished))
+            result = await work
+        except asyncio.CancelledError:
+            if heartbeat is not None and heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                # The lease is gone; the job is (or will be) requeued by _recover_stale
+                self._counts["abandoned"] += 1
+                logger.warning(f"Job {job.id} stopped: its lease could not be renewed")
+                return
+            # Shutting down: hand the job back without spending an attempt
+            await asyncio.shield(self._finish(job, status="queued", attempts=job.attempts - 1, locked_by=None))
+            raise
+        except Exception as e:
+            error = repr(e)
+            if handler is not None and job.attempts < job.max_attempts:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                self._counts["retried"] += 1
+                logger.warning(f"Job {job.id} attempt {job.attempts} failed, retrying in {delay:g}s: {error}")
+                await self._finish(
+                    job, ("retry", {"attempt": job.attempts, "error": error, "delay": delay}),
+                    status="queued", error=error, locked_by=None, run_after=_now() + timedelta(seconds=delay),
+                )
+            else:
+                self._counts["failed"] += 1
+                logger.warning(f"Job {job.id} failed after {job.attempts} attempt(s): {error}")
+                await self._finish(
+                    job, ("failed", {"error": error}),
+                    status="failed", error=error, finished_at=_now(),
+                )
+        else:
+            self._counts["succeeded"] += 1
+            await self._finish(
+                job, ("succeeded", result),
+                status="succeeded", result=result, error=None, finished_at=_now(),
+            )
+        finally:
+            self._running -= 1
+            if heartbeat is not None:
+                # Stopped between renewals rather than cancelled mid-query
+                finished.set()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _heartbeat(self, job_id: uuid.UUID, work: asyncio.Task, finished: asyncio.Event) -> bool:
+        """Renews the job's lease while `work` runs, until `finished` is set.
+
+        Failed renewals are logged and retried. If the lease would expire
+        before the next attempt, or the job is no longer ours, `work` is
+        cancelled so the job can't run twice, and True is returned.
+        """
+        loop = asyncio.get_running_loop()
+        interval = self.lease_seconds / 3
+        renewed = loop.time()
+        while True:
+            try:
+                await asyncio.wait_for(finished.wait(), interval)
+                return False
+            except asyncio.TimeoutError:
+                pass
+            try:
+                async with self._session_maker() as db:
+                    result = await db.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.status == "running", Job.locked_by == self.worker_id)
+                        .values(heartbeat_at=_now())
+                    )
+                    await db.commit()
+                if not result.rowcount:
+                    logger.warning(f"Job {job_id} was taken over by another worker")
+                    break
+                renewed = loop.time()
+            except Exception as e:
+                self._counts["heartbeat_failures"] += 1
+                logger.warning(f"Heartbeat of job {job_id} failed: {e!r}")
+                if loop.time() + interval >= renewed + self.lease_seconds:
+                    break
+        work.cancel()
+        return True
+
+    async def _finish(self, job: Job, event: Optional[tuple] = None, **values: Any) -> None:
+        # Status and final event commit together, so a subscriber that sees the
+        # job finished has already been able to read every event
+        async with self._session_maker() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == "running", Job.locked_by == self.worker_id)
+                .values(**values)
+            )
+            if event is not None:
+                db.add(JobEvent(job_id=job.id, event=event[0], data=event[1]))
+            await db.commit()
+        self._notify(job.id)
+
+    async def _emit(self, job_id: uuid.UUID, event: str, data: Dict[str, Any]) -> None:
+        async with self._session_maker() as db:
+            db.add(JobEvent(job_id=job_id, event=event, data=data))
+            await db.commit()
+        self._notify(job_id)
+
+    def _notify(self, job_id: uuid.UUID) -> None:
+        for update_event in self._subscribers.get(job_id, ()):
+            update_event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "running": self._running,
+            **self._counts,
+        }
+
+
+# --- Job Handlers ---
+
+async def run_mcp_invoke(payload: Dict[str, Any], emit: Emit) -> Dict[str, Any]:
+    """Runs one `/v1/mcp/invoke` turn, reporting tool calls and the answer as progress."""
+    conversation_id = payload["conversation_id"]
+    final_message = None
+    async with conversation_runs.lock(conversation_id):
+        async for event in graph_service.stream_graph_for_conversation(
+            conversation_id=conversation_id,
+            input_message=HumanMessage(content=payload["content"]),
+            llm=get_llm(),
+            tools=await mcp_client_manager.tools(),
+        ):
+            if event["event"] == "token":
+                continue # Too fine-grained to store; the message event carries the full text
+            if event["event"] == "message":
+                final_message = event["data"]
+            await emit(event["event"], event["data"])
+    if final_message is None:
+        raise RuntimeError("Agent system did not produce a final response.")
+    return {"conversation_id": conversation_id, "message": final_message}
+
+
+job_queue = JobQueue(
+    workers=settings.job_workers,
+    poll_interval=settings.job_poll_interval,
+    lease_seconds=settings.job_lease_seconds,
+    retry_backoff=settings.job_retry_backoff,
+    max_attempts=settings.job_max_attempts,
+)
+job_queue.register("mcp_invoke", run_mcp_invoke)
+
+
+async def serve(workers: int) -> None:
+    """Runs a standalone worker process with the resources graph runs need."""
+    from ..core.logs import setup_logging
+    from ..core.memory import memory_registry
+    from ..core.memory_writer import memory_writer
+    from ..core.tokens import load_encoding
+    from .conversation_summary import conversation_summarizer
+
+    setup_logging()
+    await load_encoding()
+    await asyncio.to_thread(memory_registry.try_open)
+    await memory_writer.start()
+    await conversation_summarizer.start()
+    job_queue.workers = workers
+    await job_queue.start()
+    logger.info(f"Job worker {job_queue.worker_id} running {workers} worker(s)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_queue.close()
+        await conversation_summarizer.close()
+        await memory_writer.close()
+        await asyncio.to_thread(memory_registry.close)
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(max(settings.job_workers, 1)))
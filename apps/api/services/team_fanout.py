@@ -0,0 +1,188 @@
+# apps/api/services/team_fanout.py
+import asyncio
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from ..core.agent.prompts import TEAM_MERGE_PROMPT
+from ..core.config import settings
+from ..core.logs import get_logger
+from .team_roster import RosterAgent
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Branch:
+    """One member agent's attempt at a fanned-out turn."""
+
+    agent: Optional[RosterAgent] # None for an answer merged from several agents
+    message: Optional[AIMessage] = None
+    status: str = "pending" # ok, timeout, error or cancelled
+    seconds: float = 0.0
+    finished_at: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"agent_id": self.agent.id if self.agent else None, "status": self.status, "seconds": round(self.seconds, 3)}
+
+
+@dataclass
+class FanOutResult:
+    message: AIMessage
+    agent_id: Optional[str] # The agent whose answer was used; None for merged answers
+    branches: List[Branch]
+
+
+# (fan_out, branches, llm, messages, branch_tasks) -> the branch whose answer is used
+Reducer = Callable[..., Awaitable[Optional[Branch]]]
+
+
+class TeamFanOut:
+    """Sends one user turn to several team agents at once and merges their answers.
+
+    Every member runs concurrently with its own `branch_timeout`, so a turn
+    takes as long as its slowest member (or, for `first`, its fastest). The
+    reducer decides the reply:
+
+        first             the first agent to answer wins; the others are cancelled
+        vote              the answer most agents agree on (ties go to the fastest)
+        concat_summarize  one extra model call merges all answers into one reply
+
+    Branches still running when the reducer has decided are cancelled.
+    """
+
+    def __init__(self, branch_timeout: float = 60.0, default_reducer: str = "first"):
+        self.branch_timeout = branch_timeout
+        self.default_reducer = default_reducer
+        self._lock = threading.Lock()
+        self._turns: Counter = Counter()
+        self._branches: Counter = Counter()
+        self._wall_seconds = 0.0
+        self._branch_seconds = 0.0
+
+    async def run(
+        self,
+        agents: Sequence[RosterAgent],
+        messages: Sequence[BaseMessage],
+        llm: BaseChatModel,
+        reducer: Optional[str] = None,
+        branch_timeout: Optional[float] = None,
+    ) -> FanOutResult:
+        reducer = reducer or self.default_reducer
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown fan-out reducer {reducer!r}, expected one of {sorted(REDUCERS)}")
+        timeout = branch_timeout or self.branch_timeout
+        branches = [Branch(agent=agent) for agent in agents]
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(self._run_branch(b, llm, messages, timeout)) for b in branches]
+        try:
+            winner = await REDUCERS[reducer](self, branches, llm, messages, tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for branch in branches:
+                if branch.status == "pending": # Cancelled before it started
+                    branch.status = "cancelled"
+        wall = time.perf_counter() - started
+
+        with self._lock:
+            self._turns[reducer] += 1
+            self._branches.update(b.status for b in branches)
+            self._wall_seconds += wall
+            self._branch_seconds += sum(b.seconds for b in branches)
+
+        if winner is None:
+            logger.warning(f"No team member answered ({', '.join(b.status for b in branches)})")
+            message = AIMessage(content="None of the team's agents could answer in time. Please try again.")
+            return FanOutResult(message=message, agent_id=None, branches=branches)
+        return FanOutResult(message=winner.message, agent_id=winner.agent.id if winner.agent else None, branches=branches)
+
+    async def _run_branch(
+        self,
+        branch: Branch,
+        llm: BaseChatModel,
+        messages: Sequence[BaseMessage],
+        timeout: float,
+    ) -> Branch:
+        started = time.perf_counter()
+        try:
+            # Branches run without the graph's callbacks so their tokens don't interleave in streams
+            branch.message = await asyncio.wait_for(
+                llm.ainvoke([branch.agent.system_message, *messages]), timeout
+            )
+            branch.status = "ok"
+        except asyncio.TimeoutError:
+            branch.status = "timeout"
+        except asyncio.CancelledError:
+            branch.status = "cancelled"
+            raise
+        except Exception as e:
+            branch.status = "error"
+            logger.warning(f"Team agent {branch.agent.id} failed: {e!r}")
+        finally:
+            branch.seconds = time.perf_counter() - started
+            branch.finished_at = time.perf_counter()
+        return branch
+
+    async def _first(self, branches, llm, messages, tasks) -> Optional[Branch]:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            answered = [t.result() for t in done if not t.cancelled() and t.result().status == "ok"]
+            if answered:
+                return min(answered, key=lambda b: b.finished_at)
+        return None
+
+    async def _vote(self, branches, llm, messages, tasks) -> Optional[Branch]:
+        await asyncio.wait(tasks)
+        answered = sorted((b for b in branches if b.status == "ok"), key=lambda b: b.finished_at)
+        if not answered:
+            return None
+        votes = Counter(_normalize(b.message.content) for b in answered)
+        top = max(votes.values())
+        # Ties go to the answer given first
+        return next(b for b in answered if votes[_normalize(b.message.content)] == top)
+
+    async def _concat_summarize(self, branches, llm, messages, tasks) -> Optional[Branch]:
+        await asyncio.wait(tasks)
+        answered = [b for b in branches if b.status == "ok"]
+        if len(answered) <= 1:
+            return answered[0] if answered else None
+        question = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        answers = "\n\n".join(f"[{b.agent.name}]\n{b.message.content}" for b in answered)
+        merged = await llm.ainvoke(TEAM_MERGE_PROMPT.format(question=question, answers=answers))
+        return Branch(agent=None, message=AIMessage(content=str(merged.content)), status="ok")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            turns = sum(self._turns.values())
+            return {
+                "turns": dict(self._turns),
+                "branches": dict(self._branches),
+                "avg_turn_seconds": self._wall_seconds / turns if turns else 0.0,
+                # Time the members' calls would have taken back to back, minus what the turns took
+                "seconds_saved_total": round(max(self._branch_seconds - self._wall_seconds, 0.0), 6),
+            }
+
+
+def _normalize(content: Any) -> str:
+    return " ".join(str(content).split()).lower()
+
+
+REDUCERS: Dict[str, Reducer] = {
+    "first": TeamFanOut._first,
+    "vote": TeamFanOut._vote,
+    "concat_summarize": TeamFanOut._concat_summarize,
+}
+
+team_fanout = TeamFanOut(
+    branch_timeout=settings.team_branch_timeout,
+    default_reducer=settings.team_fanout_reducer,
+)
@@ -0,0 +1,165 @@
+# apps/api/services/team_roster.py
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.messages import SystemMessage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.agent.prompts import SYSTEM_PROMPT
+from ..core.config import settings
+from ..models.agent_team import Agent, Team, TeamAgent
+
+# Roles that make an agent the one a team's conversations start with
+LEAD_ROLES = ("lead", "coordinator", "router")
+
+
+@dataclass(frozen=True)
+class RosterAgent:
+    """An agent as a team runs it: its role plus the prompt and tools prepared once."""
+
+    id: str
+    name: str
+    role: Optional[str]
+    system_message: SystemMessage
+    tool_names: Tuple[str, ...]
+    config: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class TeamRoster:
+    """A team's agents in the order they joined it."""
+
+    team_id: str
+    name: str
+    config: Dict[str, Any]
+    agents: Tuple[RosterAgent, ...]
+
+    def agent(self, agent_id: Any) -> Optional[RosterAgent]:
+        return next((a for a in self.agents if a.id == str(agent_id)), None)
+
+    def initial_agent(self) -> Optional[RosterAgent]:
+        """The team lead if one has a lead role, else the first agent to join."""
+        for agent in self.agents:
+            if (agent.role or "").lower() in LEAD_ROLES:
+                return agent
+        return self.agents[0] if self.agents else None
+
+
+def _roster_agent(agent: Agent, role: Optional[str]) -> RosterAgent:
+    config = agent.config or {}
+    tools = config.get("tools") or []
+    return RosterAgent(
+        id=str(agent.id),
+        name=agent.name,
+        role=role,
+        system_message=SystemMessage(content=agent.system_prompt or SYSTEM_PROMPT),
+        tool_names=tuple(t if isinstance(t, str) else t.get("name") for t in tools),
+        config=config,
+    )
+
+
+class TeamRosterCache:
+    """In-process LRU of team rosters keyed by team id.
+
+    A roster is loaded with one query the first time a team runs and reused
+    by every later turn, so picking and preparing agents costs no queries.
+    crud.team and crud.agent invalidate affected rosters on every write to
+    teams, memberships or agents; other workers' copies are not notified.
+
+    Invalidations bump a generation counter (per team, and one for agent
+    writes, whose teams a load in flight can't know yet). A load only stores
+    its roster if neither changed while it read the database, so a roster
+    read before a write is never cached after that write's invalidation.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._rosters: OrderedDict[str, TeamRoster] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._team_generations: Dict[str, int] = {}
+        self._agent_generation = 0
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        return self._team_generations.get(key, 0), self._agent_generation
+
+    async def get(self, db: AsyncSession, team_id: Any) -> Optional[TeamRoster]:
+        key = str(team_id)
+        with self._lock:
+            roster = self._rosters.get(key)
+            if roster is not None:
+                self._rosters.move_to_end(key)
+                self._hits += 1
+                return roster
+            self._misses += 1
+            generation = self._generation(key)
+
+        roster = await self._load(db, uuid.UUID(key))
+        if roster is not None:
+            with self._lock:
+                if self._generation(key) != generation:
+                    # Invalidated while loading: serve this roster, don't cache it
+                    return roster
+                self._rosters[key] = roster
+                self._rosters.move_to_end(key)
+                while len(self._rosters) > self.max_size:
+                    self._rosters.popitem(last=False)
+        return roster
+
+    async def _load(self, db: AsyncSession, team_id: uuid.UUID) -> Optional[TeamRoster]:
+        # Outer join so a team without agents still loads (as an empty roster)
+        rows = (await db.execute(
+            select(Team, Agent, TeamAgent.role)
+            .outerjoin(TeamAgent, TeamAgent.team_id == Team.id)
+            .outerjoin(Agent, Agent.id == TeamAgent.agent_id)
+            .where(Team.id == team_id)
+            .order_by(TeamAgent.created_at, Agent.id)
+        )).all()
+        if not rows:
+            return None
+        team = rows[0][0]
+        return TeamRoster(
+            team_id=str(team.id),
+            name=team.name,
+            config=team.config or {},
+            agents=tuple(_roster_agent(agent, role) for _, agent, role in rows if agent is not None),
+        )
+
+    def invalidate_team(self, team_id: Any) -> bool:
+        with self._lock:
+            key = str(team_id)
+            self._team_generations[key] = self._team_generations.get(key, 0) + 1
+            dropped = self._rosters.pop(key, None) is not None
+            self._invalidations += dropped
+        return dropped
+
+    def invalidate_agent(self, agent_id: Any) -> int:
+        """Drops every cached roster the agent belongs to."""
+        with self._lock:
+            self._agent_generation += 1
+            stale = [key for key, roster in self._rosters.items() if roster.agent(agent_id) is not None]
+            for key in stale:
+                del self._rosters[key]
+            self._invalidations += len(stale)
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._rosters),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+
+team_roster_cache = TeamRosterCache(max_size=settings.team_roster_cache_size)
@@ -1,43 +1,58 @@
 # apps/api/tests/conftest.py
+import asyncio
 import pytest
-from typing import Generator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Generator
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 # Assuming your main FastAPI app instance is in apps/api/main.py
 # Adjust the import path if necessary
-from ..main import app, get_db
+from ..main import app
+from ..core.dependencies import get_db
 from ..models.base import Base # Import Base for creating tables
 
 # Use an in-memory SQLite database for testing
-DATABASE_URL = "sqlite:///:memory:"
+DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_engine(
+engine = create_async_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False}, # Needed for SQLite
     poolclass=StaticPool, # Use StaticPool for SQLite in-memory
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+async def _create_tables() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
 # Create tables in the in-memory database before tests run
-Base.metadata.create_all(bind=engine)
+asyncio.run(_create_tables())
 
-def override_get_db() -> Generator:
+async def override_get_db() -> AsyncGenerator:
     """Override dependency to use the in-memory test database."""
-    db = TestingSessionLocal()
-    try:
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Apply the dependency override for the test session
 app.dependency_overrides[get_db] = override_get_db
 
+@asynccontextmanager
+async def _test_lifespan(app):
+    # The app's lifespan migrates Postgres and opens the checkpointer pool, MCP
+    # session and mem0 clients; the SQLite harness needs none of them
+    yield
+
+app.router.lifespan_context = _test_lifespan
+
+def pytest_sessionfinish(session, exitstatus):
+    # Close the shared SQLite connection so its worker thread doesn't keep the process alive
+    asyncio.run(engine.dispose())
+
 @pytest.fixture(scope="module")
 def client() -> Generator:
     """Pytest fixture to provide a FastAPI TestClient."""
-    with TestClient(app) as c:
+    # Tests address the API under /api, its root path behind the proxy (see Dockerfile)
+    with TestClient(app, root_path="/api") as c:
         yield c
-
@@ -0,0 +1,104 @@
+# apps/api/tests/test_admission.py
+import asyncio
+
+import pytest
+
+from ..core.admission import AdmissionController, AdmissionRejected, admission_limit
+from ..core.config import Settings
+from ..core.metrics import Histogram
+
+
+async def _hold(controller, user_id, release):
+    async with controller.admit(user_id):
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_runs_over_the_limit_wait_for_a_slot():
+    controller = AdmissionController(max_concurrent=1, max_queue=4)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "a", release))
+    await asyncio.sleep(0)
+
+    waiter = asyncio.create_task(controller.acquire("b"))
+    await asyncio.sleep(0.01)
+    assert controller.stats()["queue_depth"] == 1 and not waiter.done()
+
+    release.set()
+    await holder
+    ticket = await asyncio.wait_for(waiter, 1)
+    assert controller.stats()["in_flight"] == 1
+    ticket.release()
+    assert controller.stats()["wait_seconds"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_at_once_with_retry_after():
+    controller = AdmissionController(max_concurrent=1, max_queue=1)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "a", release))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(controller.acquire("b"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("c")
+
+    assert rejected.value.status_code == 503 and rejected.value.retry_after >= 1
+    release.set()
+    await holder
+    (await queued).release()
+
+
+@pytest.mark.asyncio
+async def test_user_over_their_limit_gets_429():
+    controller = AdmissionController(max_concurrent=10, max_per_user=1)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "a", release))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(controller.acquire("a"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("a")
+    other = await controller.acquire("b") # Other users are unaffected
+
+    assert rejected.value.status_code == 429
+    other.release()
+    release.set()
+    await holder
+    (await queued).release()
+
+
+@pytest.mark.asyncio
+async def test_queued_run_times_out():
+    controller = AdmissionController(max_concurrent=1, queue_timeout=0.05)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, "a", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("b")
+
+    assert rejected.value.status_code == 503
+    assert controller.stats()["rejected"]["timeout"] == 1
+    assert controller.stats()["queue_depth"] == 0
+    release.set()
+    await holder
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value)
+
+    assert histogram.as_dict()["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+    assert histogram.as_dict()["count"] == 4
+
+
+def test_admission_limit_fits_the_connection_pools():
+    pools = dict(db_pool_size=10, db_max_overflow=5, db_pool_reserved=3, conversation_lock_pool_size=40, job_workers=2)
+
+    assert admission_limit(Settings(admission_max_concurrent=32, **pools)) == 10
+    assert admission_limit(Settings(admission_max_concurrent=4, **pools)) == 4
+    assert admission_limit(Settings(admission_max_concurrent=32, **{**pools, "conversation_lock_pool_size": 8})) == 6
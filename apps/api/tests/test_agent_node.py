@@ -0,0 +1,63 @@
+# apps/api/tests/test_agent_node.py
+import asyncio
+from typing import Any, AsyncIterator
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+from ..core.agent.orchestration import build_graph
+
+
+class SlowFakeChatModel(GenericFakeChatModel):
+    """Streams one token, then waits until cancelled."""
+
+    started: Any = None
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        self.started.set()
+        yield ChatGenerationChunk(message=AIMessageChunk(content="Hello"))
+        await asyncio.sleep(3600)
+
+
+@pytest.mark.asyncio
+async def test_agent_node_streams_tokens_as_they_arrive():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Hello there friend")]))
+    graph = build_graph(llm, tools=[], system_prompt="You are helpful.")
+
+    chunks = []
+    async for message, metadata in graph.astream(
+        {"messages": [HumanMessage(content="hi")]}, stream_mode="messages"
+    ):
+        if metadata["langgraph_node"] == "agent_node":
+            chunks.append(message.content)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Hello there friend"
+
+
+@pytest.mark.asyncio
+async def test_agent_node_returns_a_complete_message():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Hello there friend")]))
+    graph = build_graph(llm, tools=[], system_prompt="You are helpful.")
+
+    state = await graph.ainvoke({"messages": [HumanMessage(content="hi")]})
+
+    last = state["messages"][-1]
+    assert type(last) is AIMessage
+    assert last.content == "Hello there friend"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_run_cancels_the_model_call():
+    started = asyncio.Event()
+    llm = SlowFakeChatModel(messages=iter([]), started=started)
+    graph = build_graph(llm, tools=[], system_prompt="You are helpful.")
+
+    run = asyncio.create_task(graph.ainvoke({"messages": [HumanMessage(content="hi")]}))
+    await asyncio.wait_for(started.wait(), timeout=5)
+    run.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await run
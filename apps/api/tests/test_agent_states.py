@@ -8,23 +8,28 @@ from fastapi.testclient import TestClient
 async def test_create_agent_state(client: TestClient):
     """Test creating a new agent state for a conversation."""
     # First, create a conversation
-    conversation_data = {"name": "Agent State Test Conversation"}
+    conversation_data = {"title": "Agent State Test Conversation"}
     conv_response = client.post("/api/v1/conversations/", json=conversation_data)
-    assert conv_response.status_code == 200
+    assert conv_response.status_code == 201
     conversation_id = conv_response.json()["id"]
 
+    agent_response = client.post("/api/v1/agents/", json={"name": "State Test Agent", "system_prompt": "You keep state."})
+    assert agent_response.status_code == 201
+    agent_id = agent_response.json()["id"]
+
     # Then, create an agent state for that conversation
     agent_state_data = {
         "conversation_id": conversation_id,
+        "agent_id": agent_id,
         "state_data": {"turn": 1, "status": "thinking"},
-        "metadata": {"agent_id": "agent_123"}
+        "version": "1"
     }
-    response = client.post("/api/v1/agent-states/", json=agent_state_data)
-    assert response.status_code == 200
+    response = client.post("/api/v1/states/", json=agent_state_data)
+    assert response.status_code == 201
     data = response.json()
     assert data["conversation_id"] == conversation_id
     assert data["state_data"] == agent_state_data["state_data"]
-    assert data["metadata"] == agent_state_data["metadata"]
+    assert data["version"] == agent_state_data["version"]
     assert "id" in data
     assert "created_at" in data
 
@@ -32,22 +37,27 @@ async def test_create_agent_state(client: TestClient):
 async def test_read_agent_states_for_conversation(client: TestClient):
     """Test reading agent states for a specific conversation."""
     # Create a conversation
-    conversation_data = {"name": "Read Agent States Test Conversation"}
+    conversation_data = {"title": "Read Agent States Test Conversation"}
     conv_response = client.post("/api/v1/conversations/", json=conversation_data)
-    assert conv_response.status_code == 200
+    assert conv_response.status_code == 201
     conversation_id = conv_response.json()["id"]
 
+    agent_response = client.post("/api/v1/agents/", json={"name": "State Test Agent", "system_prompt": "You keep state."})
+    assert agent_response.status_code == 201
+    agent_id = agent_response.json()["id"]
+
     # Create an agent state in that conversation
     agent_state_data = {
         "conversation_id": conversation_id,
+        "agent_id": agent_id,
         "state_data": {"turn": 2, "status": "responding"}
     }
-    state_response = client.post("/api/v1/agent-states/", json=agent_state_data)
-    assert state_response.status_code == 200
+    state_response = client.post("/api/v1/states/", json=agent_state_data)
+    assert state_response.status_code == 201
     state_id = state_response.json()["id"]
 
     # Read agent states for the conversation
-    response = client.get(f"/api/v1/conversations/{conversation_id}/agent-states/")
+    response = client.get("/api/v1/states/", params={"conversation_id": conversation_id})
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
@@ -14,7 +14,7 @@ async def test_create_agent(client: TestClient):
         "config": {"model": "gpt-4o"}
     }
     response = client.post("/api/v1/agents/", json=agent_data)
-    assert response.status_code == 200
+    assert response.status_code == 201
     data = response.json()
     assert data["name"] == agent_data["name"]
     assert data["description"] == agent_data["description"]
@@ -0,0 +1,76 @@
+# apps/api/tests/test_async_db.py
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ..core.dependencies import get_db
+from ..models.base import Base
+# The harness app: get_db yields SQLite sessions and the lifespan needs no Postgres
+from .conftest import app
+
+DB_LATENCY = 0.2
+CONCURRENT_REQUESTS = 5
+
+
+@pytest.fixture
+async def slow_db(tmp_path):
+    """Serves the app from a database whose queries wait DB_LATENCY in SQLite first.
+
+    Each session gets a connection of its own, as on Postgres; the harness's
+    in-memory database is one shared connection, which runs queries one at a
+    time. `sleep(seconds)` stands in for pg_sleep: it blocks the connection's
+    worker thread, not the event loop.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}", pool_size=CONCURRENT_REQUESTS)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep", 1, time.sleep)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_slow_db():
+        async with session_maker() as db:
+            await db.execute(text("SELECT sleep(:seconds)"), {"seconds": DB_LATENCY})
+            yield db
+
+    harness_get_db = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = get_slow_db
+    yield
+    app.dependency_overrides[get_db] = harness_get_db
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_overlap_while_waiting_on_db(slow_db):
+    """Requests waiting on the database do not block each other or the event loop."""
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.get("/v1/agents/") for _ in range(CONCURRENT_REQUESTS))
+        )
+        elapsed = time.perf_counter() - started
+    heartbeat_task.cancel()
+
+    assert all(response.status_code == 200 for response in responses)
+    # Every request waited in the database, yet together they took about one wait, not one each
+    assert elapsed >= DB_LATENCY
+    assert elapsed < DB_LATENCY * CONCURRENT_REQUESTS / 2
+    # The loop kept running other work while requests were waiting
+    assert ticks >= int(DB_LATENCY / 0.01) // 2
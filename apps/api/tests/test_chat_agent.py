@@ -0,0 +1,44 @@
+# apps/api/tests/test_chat_agent.py
+import json
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from ..routers import llms
+
+
+class FakeGraph:
+    async def astream_events(self, events, config, version):
+        yield {"event": "on_chain_end", "data": {}}
+
+
+@pytest.fixture
+def fake_graph(monkeypatch):
+    @asynccontextmanager
+    async def setup_graph():
+        yield SimpleNamespace(tools=[], checkpointer=None)
+
+    monkeypatch.setattr(llms, "setup_graph", setup_graph)
+    monkeypatch.setattr(llms, "get_graph", lambda llm, tools, checkpointer: FakeGraph())
+
+
+@pytest.mark.asyncio
+async def test_new_agent_conversation_returns_its_id(fake_graph):
+    response = await llms.agent(query="hi", llm=None)
+    conversation_id = uuid.UUID(response.headers[llms.CONVERSATION_ID_HEADER])
+
+    events = [event async for event in llms.stream_graph("hi", None, conversation_id)]
+
+    assert events[0] == {"event": "conversation", "data": json.dumps({"conversation_id": str(conversation_id)})}
+    assert events[1] == {"data": {"event": "on_chain_end", "data": {}}}
+
+
+@pytest.mark.asyncio
+async def test_given_conversation_id_is_echoed(fake_graph):
+    conversation_id = uuid.uuid4()
+
+    response = await llms.agent(query="hi", llm=None, conversation_id=conversation_id)
+
+    assert response.headers[llms.CONVERSATION_ID_HEADER] == str(conversation_id)
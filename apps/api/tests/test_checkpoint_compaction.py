@@ -0,0 +1,58 @@
+# apps/api/tests/test_checkpoint_compaction.py
+import os
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import MessagesState, StateGraph
+
+from ..core.agent.orchestration import get_config
+from ..core.agent.persistence import CheckpointerPool, PruneResult
+from ..services.checkpoint_compaction import CheckpointCompactor
+
+POSTGRES_DSN = os.getenv("TEST_POSTGRES_DSN")
+
+
+def test_prune_results_add_up_per_table():
+    first, second = PruneResult(), PruneResult()
+    first.add("checkpoints", 2, 300)
+    second.add("checkpoints", 1, 100)
+    second.add("checkpoint_blobs", 4, 1000)
+    first.merge(second)
+
+    report = first.as_dict()
+    assert report["rows"] == {"checkpoints": 3, "checkpoint_writes": 0, "checkpoint_blobs": 4}
+    assert report["total_bytes"] == 1400
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not POSTGRES_DSN, reason="TEST_POSTGRES_DSN is not set")
+async def test_compaction_reclaims_superseded_rows_of_every_thread():
+    pool = CheckpointerPool(POSTGRES_DSN.replace("postgresql+psycopg://", "postgresql://"))
+    checkpointer = await pool.open()
+
+    def reply(state: MessagesState):
+        return {"messages": [AIMessage(content="ok")]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", reply)
+    builder.set_entry_point("reply")
+    graph = builder.compile(checkpointer=checkpointer)
+
+    configs = [get_config(uuid.uuid4()) for _ in range(3)]
+    for config in configs:
+        for turn in range(5):
+            await graph.ainvoke({"messages": [HumanMessage(content=f"turn {turn}")]}, config)
+
+    compactor = CheckpointCompactor(pool, keep_last=2, batch_size=3, batches_per_second=0)
+    report = {"sweep_complete": False}
+    while not report["sweep_complete"]:
+        report = await compactor.run_once(max_threads=100)
+
+    remaining = [[c async for c in checkpointer.alist(config)] for config in configs]
+    await pool.close()
+
+    assert all(len(checkpoints) == 2 for checkpoints in remaining)
+    reclaimed = compactor.stats()["reclaimed"]
+    assert reclaimed["rows"]["checkpoints"] >= 3 * 8
+    assert reclaimed["total_bytes"] > 0
@@ -0,0 +1,60 @@
+# apps/api/tests/test_checkpoint_retention.py
+import os
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import MessagesState, StateGraph
+
+from ..core.agent.orchestration import get_config
+from ..core.agent.persistence import CheckpointerPool, CheckpointPruner
+
+POSTGRES_DSN = os.getenv("TEST_POSTGRES_DSN")
+
+
+def test_each_conversation_gets_its_own_thread():
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    assert get_config(first)["configurable"]["thread_id"] == str(first)
+    assert get_config(first) == get_config(str(first))
+    assert get_config(first) != get_config(second)
+
+
+def test_touched_threads_are_pending_once():
+    pruner = CheckpointPruner(CheckpointerPool("postgresql://localhost/unused"))
+    pruner.touch("a")
+    pruner.touch("a")
+    pruner.touch("b")
+
+    assert pruner.stats()["pending_threads"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not POSTGRES_DSN, reason="TEST_POSTGRES_DSN is not set")
+async def test_prune_keeps_the_newest_checkpoints():
+    pool = CheckpointerPool(POSTGRES_DSN.replace("postgresql+psycopg://", "postgresql://"))
+    checkpointer = await pool.open()
+
+    def reply(state: MessagesState):
+        return {"messages": [AIMessage(content=f"reply {len(state['messages'])}")]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", reply)
+    builder.set_entry_point("reply")
+    graph = builder.compile(checkpointer=checkpointer)
+
+    config = get_config(uuid.uuid4())
+    for turn in range(10):
+        await graph.ainvoke({"messages": [HumanMessage(content=f"turn {turn}")]}, config)
+
+    pruner = CheckpointPruner(pool, keep_last=3, batch_size=4)
+    pruned = await pruner.prune_thread(config["configurable"]["thread_id"])
+
+    remaining = [c async for c in checkpointer.alist(config)]
+    state = await graph.aget_state(config)
+    await pool.close()
+
+    assert len(remaining) == 3
+    assert pruned.rows["checkpoints"] > 0
+    # The latest state is still complete after its ancestors are gone
+    assert len(state.values["messages"]) == 20
@@ -0,0 +1,107 @@
+# apps/api/tests/test_conversation_runs.py
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from ..services.conversation_runs import ConversationBusy, ConversationRunCoordinator, advisory_lock_key
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_in_flight_share_one_run():
+    coordinator = ConversationRunCoordinator()
+    calls = []
+
+    async def turn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    results = await asyncio.gather(*(coordinator.run("conv", "hello", turn) for _ in range(3)))
+
+    assert results == ["answer"] * 3
+    assert len(calls) == 1
+    assert coordinator.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_turns_of_one_conversation_do_not_overlap():
+    coordinator = ConversationRunCoordinator()
+    running = {"conv": 0, "other": 0}
+    peak = {"conv": 0, "other": 0}
+
+    def turn(conversation_id):
+        async def run():
+            running[conversation_id] += 1
+            peak[conversation_id] = max(peak[conversation_id], running[conversation_id])
+            await asyncio.sleep(0.02)
+            running[conversation_id] -= 1
+        return run
+
+    await asyncio.gather(
+        coordinator.run("conv", "first", turn("conv")),
+        coordinator.run("conv", "second", turn("conv")),
+        coordinator.run("other", "first", turn("other")),
+    )
+
+    stats = coordinator.stats()
+    assert peak == {"conv": 1, "other": 1}
+    assert stats["lock_waits"] == 1 and stats["runs"] == 3
+    assert coordinator._local_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_busy_conversation_times_out():
+    coordinator = ConversationRunCoordinator(lock_timeout=0.05)
+
+    async with coordinator.lock("conv"):
+        with pytest.raises(ConversationBusy):
+            async with coordinator.lock("conv"):
+                pass
+
+    assert coordinator.stats()["lock_timeouts"] == 1
+
+
+def test_advisory_lock_keys_fit_a_signed_bigint():
+    key = advisory_lock_key("8b7f0c1e-0000-4000-8000-000000000000")
+    assert -(2 ** 63) <= key < 2 ** 63
+    assert key == advisory_lock_key("8b7f0c1e-0000-4000-8000-000000000000")
+
+
+@pytest.mark.asyncio
+async def test_runs_are_admitted_before_they_lock():
+    coordinator = ConversationRunCoordinator()
+    order = []
+
+    @asynccontextmanager
+    async def admit():
+        order.append(("admit", "conv" in coordinator._local_locks))
+        yield
+
+    async def turn():
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    results = await asyncio.gather(*(coordinator.run("conv", "hello", turn, admit=admit) for _ in range(2)))
+
+    assert results == ["answer"] * 2
+    # Admitted once for the shared run, before its lock existed
+    assert order == [("admit", False)]
+
+
+@pytest.mark.asyncio
+async def test_rejected_runs_never_take_the_lock():
+    coordinator = ConversationRunCoordinator()
+
+    @asynccontextmanager
+    async def reject():
+        raise RuntimeError("full")
+        yield
+
+    async def turn():
+        raise AssertionError("not admitted")
+
+    with pytest.raises(RuntimeError):
+        await coordinator.run("conv", "hello", turn, admit=reject)
+
+    assert coordinator._local_locks == {} and coordinator.stats()["lock_waits"] == 0
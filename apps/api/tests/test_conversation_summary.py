@@ -0,0 +1,94 @@
+# apps/api/tests/test_conversation_summary.py
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from ..crud import conversation as crud_conversation
+from ..crud import message as crud_message
+from ..schemas.conversation import ConversationCreate
+from ..schemas.message import MessageCreate
+from ..services import graph_service
+from ..services.conversation_summary import ConversationSummarizer, get_summary
+from .conftest import TestingSessionLocal
+
+
+class RecordingLLM:
+    """Returns numbered summaries and remembers the prompts it was sent."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return AIMessage(content=f"summary {len(self.prompts)}")
+
+
+async def _add_messages(db, conversation_id, start, count):
+    await crud_message.create_messages(db, [
+        MessageCreate(conversation_id=conversation_id, role="user", content=f"message {i} " + "word " * 40)
+        for i in range(start, start + count)
+    ])
+
+
+def _summarizer(llm: RecordingLLM) -> ConversationSummarizer:
+    return ConversationSummarizer(
+        llm_factory=lambda: llm,
+        session_maker=TestingSessionLocal,
+        trigger_tokens=400,
+        tail_tokens=150,
+    )
+
+
+@pytest.mark.asyncio
+async def test_summary_is_extended_with_only_the_new_messages():
+    llm = RecordingLLM()
+    summarizer = _summarizer(llm)
+    async with TestingSessionLocal() as db:
+        conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="Long"))
+        await _add_messages(db, conversation.id, 0, 10)
+
+    assert await summarizer.summarize(str(conversation.id))
+    async with TestingSessionLocal() as db:
+        first = get_summary(await crud_conversation.get_conversation(db, conversation.id))
+        await _add_messages(db, conversation.id, 10, 10)
+    assert first["text"] == "summary 1"
+    assert "message 0 " in llm.prompts[0]
+    assert "message 9 " not in llm.prompts[0] # Newest messages stay verbatim
+
+    assert await summarizer.summarize(str(conversation.id))
+    async with TestingSessionLocal() as db:
+        second = get_summary(await crud_conversation.get_conversation(db, conversation.id))
+
+    assert "summary 1" in llm.prompts[1]
+    assert "message 0 " not in llm.prompts[1]
+    assert second["through_position"] > first["through_position"]
+    assert second["messages"] > first["messages"]
+
+
+@pytest.mark.asyncio
+async def test_short_conversations_are_not_summarized():
+    llm = RecordingLLM()
+    async with TestingSessionLocal() as db:
+        conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="Short"))
+        await _add_messages(db, conversation.id, 0, 2)
+
+    assert not await _summarizer(llm).summarize(str(conversation.id))
+    assert llm.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_history_sends_the_summary_and_the_unsummarized_tail(monkeypatch):
+    monkeypatch.setattr(graph_service, "get_memory_for_conversation", lambda *args, **kwargs: None)
+    async with TestingSessionLocal() as db:
+        conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="Tail"))
+        await _add_messages(db, conversation.id, 0, 10)
+    await _summarizer(RecordingLLM()).summarize(str(conversation.id))
+
+    async with TestingSessionLocal() as db:
+        summary = get_summary(await crud_conversation.get_conversation(db, conversation.id))
+        state = await graph_service._prepare_turn(str(conversation.id), HumanMessage(content="next"), db)
+
+    messages = state["messages"]
+    assert isinstance(messages[0], SystemMessage) and "summary 1" in messages[0].content
+    tail_numbers = [int(m.content.split(" ")[1]) for m in messages[1:-1]]
+    assert tail_numbers and min(tail_numbers) > summary["through_position"]
+    assert messages[-1].content == "next"
@@ -8,13 +8,13 @@ from fastapi.testclient import TestClient
 async def test_create_conversation(client: TestClient):
     """Test creating a new conversation via the API."""
     conversation_data = {
-        "name": "Test Conversation",
+        "title": "Test Conversation",
         "metadata": {"topic": "testing"}
     }
     response = client.post("/api/v1/conversations/", json=conversation_data)
-    assert response.status_code == 200
+    assert response.status_code == 201
     data = response.json()
-    assert data["name"] == conversation_data["name"]
+    assert data["title"] == conversation_data["title"]
     assert data["metadata"] == conversation_data["metadata"]
     assert "id" in data
     assert "created_at" in data
@@ -25,16 +25,16 @@ async def test_read_conversations(client: TestClient):
     """Test reading a list of conversations."""
     # First, create a conversation to ensure the list is not empty
     conversation_data = {
-        "name": "List Test Conversation",
+        "title": "List Test Conversation",
         "metadata": {"purpose": "list test"}
     }
     client.post("/api/v1/conversations/", json=conversation_data)
 
     response = client.get("/api/v1/conversations/")
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"] # A page; see crud.pagination
     assert isinstance(data, list)
     # Check if at least one conversation (the one we created) is in the list
     assert len(data) > 0
-    assert any(conv["name"] == conversation_data["name"] for conv in data)
+    assert any(conv["title"] == conversation_data["title"] for conv in data)
 
@@ -0,0 +1,63 @@
+# apps/api/tests/test_graph_cache.py
+from langchain_core.tools import StructuredTool
+from langchain_openai import ChatOpenAI
+
+from ..core.agent.orchestration import GraphCache
+
+
+def _llm(model: str = "gpt-4o-mini") -> ChatOpenAI:
+    return ChatOpenAI(model=model, api_key="test", temperature=0)
+
+
+def _tool(name: str, description: str = "Adds two numbers") -> StructuredTool:
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    return StructuredTool.from_function(add, name=name, description=description)
+
+
+def test_same_configuration_reuses_compiled_graph():
+    """A fresh client with the same parameters hits the cached graph."""
+    cache = GraphCache(max_size=4)
+    tools = [_tool("add")]
+
+    first = cache.get_or_build(_llm(), tools, "You are helpful.", "agent_node", None)
+    second = cache.get_or_build(_llm(), [_tool("add")], "You are helpful.", "agent_node", None)
+
+    assert second is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_changed_inputs_build_new_graphs():
+    cache = GraphCache(max_size=8)
+    base = cache.get_or_build(_llm(), [_tool("add")], "You are helpful.", "agent_node", None)
+
+    assert cache.get_or_build(_llm("gpt-4o"), [_tool("add")], "You are helpful.", "agent_node", None) is not base
+    assert cache.get_or_build(_llm(), [_tool("add")], "Be terse.", "agent_node", None) is not base
+    assert cache.get_or_build(_llm(), [_tool("add", "Sums")], "You are helpful.", "agent_node", None) is not base
+    assert cache.stats()["misses"] == 4
+
+
+def test_least_recently_used_graph_is_evicted():
+    cache = GraphCache(max_size=2)
+    a = cache.get_or_build(_llm(), [], "a", "agent_node", None)
+    cache.get_or_build(_llm(), [], "b", "agent_node", None)
+    cache.get_or_build(_llm(), [], "a", "agent_node", None)  # refresh "a"
+    cache.get_or_build(_llm(), [], "c", "agent_node", None)  # evicts "b"
+
+    assert cache.get_or_build(_llm(), [], "a", "agent_node", None) is a
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_invalidate_drops_graphs_for_a_tool_set():
+    cache = GraphCache(max_size=4)
+    old_tools = [_tool("add")]
+    cache.get_or_build(_llm(), old_tools, "a", "agent_node", None)
+    cache.get_or_build(_llm(), [], "a", "agent_node", None)
+
+    assert cache.invalidate(old_tools) == 1
+    assert cache.stats()["size"] == 1
+    assert cache.invalidate() == 1
+    assert cache.stats()["size"] == 0
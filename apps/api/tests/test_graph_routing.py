@@ -0,0 +1,112 @@
+# apps/api/tests/test_graph_routing.py
+import itertools
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import StructuredTool
+
+from ..crud import conversation as crud_conversation
+from ..crud import message as crud_message
+from ..graphs.graph import app_graph
+from ..graphs.nodes import HANDOFF_TOOL_NAME
+from ..schemas.conversation import ConversationCreate
+from ..services import graph_service
+from .conftest import TestingSessionLocal
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+ADD = StructuredTool.from_function(_add, name="add", description="Adds two numbers")
+
+
+class ToolCallingFakeChatModel(GenericFakeChatModel):
+    """Fake chat model that records the tools it is bound with."""
+
+    bound: list = []
+
+    def bind_tools(self, tools, **kwargs):
+        self.bound.append([t.name for t in tools])
+        return self
+
+
+def _tool_call(name="add", args=None, i=0):
+    return {"name": name, "args": args if args is not None else {"a": 1, "b": 2}, "id": f"call_{i}"}
+
+
+async def _run(replies, **configurable):
+    llm = ToolCallingFakeChatModel(messages=iter(replies), bound=[])
+    state = {
+        "messages": [HumanMessage(content="What is 1 + 2?")],
+        "conversation_id": "conv",
+        "current_agent_id": "agent_1",
+    }
+    config = {"recursion_limit": 50, "configurable": {"llm": llm, "tools": [ADD], **configurable}}
+    return await app_graph.ainvoke(state, config)
+
+
+@pytest.mark.asyncio
+async def test_final_answer_ends_the_run_after_one_step():
+    final = await _run([AIMessage(content="3")])
+
+    assert final["steps"] == 1
+    assert final["messages"][-1].content == "3"
+    assert final.get("stop_reason") is None
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_loop_back_until_the_answer():
+    final = await _run([AIMessage(content="", tool_calls=[_tool_call()]), AIMessage(content="3")])
+
+    assert [m.type for m in final["messages"]] == ["human", "ai", "tool", "ai"]
+    assert final["messages"][2].content == "3"
+    assert final["steps"] == 3
+
+
+@pytest.mark.asyncio
+async def test_step_budget_stops_an_endless_tool_loop():
+    endless = (AIMessage(content="", tool_calls=[_tool_call(i=i)]) for i in itertools.count())
+
+    final = await _run(endless, max_steps=5)
+
+    assert final["stop_reason"] == "steps"
+    assert final["steps"] == 5
+
+
+@pytest.mark.asyncio
+async def test_handoff_switches_the_current_agent():
+    final = await _run([
+        AIMessage(content="", tool_calls=[_tool_call(HANDOFF_TOOL_NAME, {"agent_id": "agent_2"})]),
+        AIMessage(content="Agent 2 here"),
+    ])
+
+    assert final["current_agent_id"] == "agent_2"
+    assert final["messages"][2].content == "Transferred to agent agent_2"
+    assert final["messages"][-1].content == "Agent 2 here"
+
+
+@pytest.mark.asyncio
+async def test_graph_service_runs_the_tools_it_binds(monkeypatch):
+    monkeypatch.setattr(graph_service, "get_memory_for_conversation", lambda *args, **kwargs: None)
+    llm = ToolCallingFakeChatModel(
+        messages=iter([AIMessage(content="", tool_calls=[_tool_call()]), AIMessage(content="3")]), bound=[]
+    )
+    async with TestingSessionLocal() as db:
+        conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="Tools"))
+        answer = await graph_service.run_graph_for_conversation(
+            conversation_id=str(conversation.id),
+            input_message=HumanMessage(content="What is 1 + 2?"),
+            db=db,
+            llm=llm,
+            tools=[ADD],
+        )
+
+    assert llm.bound == [["add"], ["add"]]
+    assert answer.content == "3"
+    async with TestingSessionLocal() as db:
+        saved = await crud_message.get_messages_by_conversation(db, conversation.id)
+    assert [(m.role, m.content) for m in saved.items] == [
+        ("user", "What is 1 + 2?"), ("assistant", ""), ("tool", "3"), ("assistant", "3"),
+    ]
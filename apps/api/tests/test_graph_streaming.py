@@ -0,0 +1,60 @@
+# apps/api/tests/test_graph_streaming.py
+import asyncio
+import time
+from typing import AsyncIterator
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+from ..crud import conversation as crud_conversation
+from ..crud import message as crud_message
+from ..schemas.conversation import ConversationCreate
+from ..services import graph_service
+from .conftest import TestingSessionLocal
+
+TOKENS = ["Hello", " there", ",", " how", " can", " I", " help", " you", " today", "?"]
+TOKEN_DELAY = 0.05
+
+
+class SlowStreamingChatModel(GenericFakeChatModel):
+    """Fake chat model that streams TOKENS with a delay before each one."""
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for token in TOKENS:
+            await asyncio.sleep(TOKEN_DELAY)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_first_token_long_before_the_turn_completes(monkeypatch):
+    monkeypatch.setattr(graph_service, "get_memory_for_conversation", lambda *args, **kwargs: None)
+    async with TestingSessionLocal() as db:
+        conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="Streaming"))
+    llm = SlowStreamingChatModel(messages=iter([AIMessage(content="".join(TOKENS))]))
+
+    started = time.perf_counter()
+    received = []
+    async for event in graph_service.stream_graph_for_conversation(
+        conversation_id=str(conversation.id),
+        input_message=HumanMessage(content="hi"),
+        llm=llm,
+        session_maker=TestingSessionLocal,
+    ):
+        received.append((time.perf_counter() - started, event))
+    total = received[-1][0]
+
+    time_to_first_byte, first = received[0]
+    assert first == {"event": "token", "data": {"delta": TOKENS[0]}}
+    # The first token goes out after one token delay, not after the whole generation
+    assert time_to_first_byte < TOKEN_DELAY * len(TOKENS) / 2
+    assert time_to_first_byte < total / 3
+
+    names = [event["event"] for _, event in received]
+    assert names == ["token"] * len(TOKENS) + ["message", "saved"]
+    assert received[len(TOKENS)][1]["data"]["content"] == "".join(TOKENS)
+
+    async with TestingSessionLocal() as db:
+        saved = (await crud_message.get_messages_by_conversation(db, conversation.id)).items
+    assert [(m.role, m.content) for m in saved] == [("user", "hi"), ("assistant", "".join(TOKENS))]
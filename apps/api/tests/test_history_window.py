@@ -0,0 +1,71 @@
+# apps/api/tests/test_history_window.py
+import pytest
+from sqlalchemy import update
+
+from ..crud import conversation as crud_conversation
+from ..crud import message as crud_message
+from ..models.conversation_message import Message
+from ..schemas.conversation import ConversationCreate
+from ..schemas.message import MessageCreate
+from .conftest import TestingSessionLocal
+
+
+async def _conversation_with(db, messages):
+    conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="History"))
+    await crud_message.create_messages(db, [
+        MessageCreate(conversation_id=conversation.id, **message) for message in messages
+    ])
+    return conversation
+
+
+@pytest.mark.asyncio
+async def test_window_holds_the_newest_messages_within_budget():
+    async with TestingSessionLocal() as db:
+        conversation = await _conversation_with(db, [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "word " * 40}
+            for i in range(30)
+        ])
+        per_message = (await crud_message.get_messages_by_conversation(db, conversation.id, limit=1)).items[0].token_count
+
+        window = await crud_message.get_history_window(db, conversation.id, max_tokens=per_message * 5, batch_size=4)
+
+    assert [m.content.split(" ")[1] for m in window] == [str(i) for i in range(25, 30)]
+    assert sum(m.token_count for m in window) <= per_message * 5
+
+
+@pytest.mark.asyncio
+async def test_newest_message_is_kept_even_over_budget():
+    async with TestingSessionLocal() as db:
+        conversation = await _conversation_with(db, [{"role": "user", "content": "word " * 500}])
+
+        window = await crud_message.get_history_window(db, conversation.id, max_tokens=10)
+
+    assert len(window) == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_token_counts_are_filled_in_and_saved():
+    async with TestingSessionLocal() as db:
+        conversation = await _conversation_with(db, [{"role": "user", "content": "hello there"}])
+        await db.execute(update(Message).where(Message.conversation_id == conversation.id).values(token_count=None))
+        await db.commit()
+
+        await crud_message.get_history_window(db, conversation.id, max_tokens=1000)
+
+    async with TestingSessionLocal() as db:
+        (message,) = (await crud_message.get_messages_by_conversation(db, conversation.id)).items
+    assert message.token_count is not None and message.token_count > 0
+
+
+@pytest.mark.asyncio
+async def test_window_does_not_start_with_an_orphaned_tool_result():
+    async with TestingSessionLocal() as db:
+        conversation = await _conversation_with(db, [
+            {"role": "assistant", "content": "word " * 200, "tool_calls": [{"name": "add", "args": {}, "id": "call_1"}]},
+            {"role": "tool", "content": "3", "tool_call_id": "call_1"},
+            {"role": "assistant", "content": "The answer is 3."},
+        ])
+
+        window = await crud_message.get_history_window(db, conversation.id, max_tokens=60)
+
+    assert [m.role for m in window] == ["assistant"]
@@ -0,0 +1,185 @@
+# apps/api/tests/test_jobs.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ..models.base import Base
+from ..models.job import Job
+from ..services.jobs import JobQueue
+
+
+@pytest.fixture
+async def jobs_db(tmp_path):
+    """A database of its own, with a connection per session as on Postgres.
+
+    Sessions on the shared in-memory connection see each other's uncommitted
+    writes, and one's rollback undoes another's, which a polling test races.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _queue(session_maker, **kwargs) -> JobQueue:
+    options = {"workers": 1, "poll_interval": 0.01, "lease_seconds": 60.0, "retry_backoff": 0.0}
+    options.update(kwargs)
+    return JobQueue(session_maker=session_maker, **options)
+
+
+async def _wait_finished(queue: JobQueue, job_id, timeout: float = 2.0) -> Job:
+    async def finished():
+        while True:
+            job = await queue.get(job_id)
+            if job.status in ("succeeded", "failed"):
+                return job
+            await asyncio.sleep(0.01)
+    return await asyncio.wait_for(finished(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_job_runs_and_records_progress(jobs_db):
+    queue = _queue(jobs_db)
+
+    async def echo(payload, emit):
+        await emit("tool_start", {"name": "add"})
+        return {"echo": payload["text"]}
+
+    queue.register("echo", echo)
+    job = await queue.submit("echo", {"text": "hi"})
+    await queue.start()
+    try:
+        done = await _wait_finished(queue, job.id)
+    finally:
+        await queue.close()
+
+    assert done.status == "succeeded" and done.result == {"echo": "hi"} and done.attempts == 1
+    events = await queue.events_after(job.id)
+    assert [e.event for e in events] == ["started", "tool_start", "succeeded"]
+    assert (await queue.events_after(job.id, events[1].id))[0].event == "succeeded"
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_are_retried_until_max_attempts(jobs_db):
+    queue = _queue(jobs_db)
+    calls = []
+
+    async def flaky(payload, emit):
+        calls.append(1)
+        raise RuntimeError("model unavailable")
+
+    queue.register("flaky", flaky)
+    job = await queue.submit("flaky", {}, max_attempts=2)
+    await queue.start()
+    try:
+        done = await _wait_finished(queue, job.id)
+    finally:
+        await queue.close()
+
+    assert done.status == "failed" and done.attempts == 2 and len(calls) == 2
+    assert "model unavailable" in done.error
+    assert [e.event for e in await queue.events_after(job.id)] == ["started", "retry", "started", "failed"]
+    assert queue.stats()["retried"] == 1 and queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_job_abandoned_by_a_dead_worker_is_requeued(jobs_db):
+    queue = _queue(jobs_db, lease_seconds=1.0)
+    queue.register("echo", lambda payload, emit: asyncio.sleep(0, result={"ok": True}))
+    job = await queue.submit("echo", {})
+    # As if a worker claimed the job, then stopped heartbeating
+    async with jobs_db() as db:
+        await db.execute(
+            update(Job).where(Job.id == job.id).values(
+                status="running", attempts=1, locked_by="gone:1",
+                heartbeat_at=datetime.now(timezone.utc) - timedelta(seconds=5),
+            )
+        )
+        await db.commit()
+
+    await queue.start()
+    try:
+        done = await _wait_finished(queue, job.id)
+    finally:
+        await queue.close()
+
+    assert done.status == "succeeded" and done.attempts == 2
+    assert queue.stats()["recovered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_unknown_kind(jobs_db):
+    with pytest.raises(ValueError):
+        await _queue(jobs_db).submit("missing", {})
+
+
+def _failing_heartbeats(session_maker, failures: list):
+    """Wraps `session_maker` so heartbeat updates raise while `failures` is non-empty."""
+    def flaky_session_maker():
+        session = session_maker()
+        execute = session.execute
+
+        async def flaky_execute(statement, *args, **kwargs):
+            if failures and "SET heartbeat_at" in str(statement):
+                failures.pop()
+                raise ConnectionError("database unavailable")
+            return await execute(statement, *args, **kwargs)
+
+        session.execute = flaky_execute
+        return session
+    return flaky_session_maker
+
+
+@pytest.mark.asyncio
+async def test_failed_heartbeat_is_retried_and_the_job_keeps_running(jobs_db):
+    failures = [1]
+    queue = JobQueue(session_maker=_failing_heartbeats(jobs_db, failures), workers=1, poll_interval=0.01, lease_seconds=0.6)
+
+    async def slow(payload, emit):
+        await asyncio.sleep(0.5)
+        return {"ok": True}
+
+    queue.register("slow", slow)
+    job = await queue.submit("slow", {})
+    await queue.start()
+    try:
+        done = await _wait_finished(queue, job.id)
+    finally:
+        await queue.close()
+
+    assert done.status == "succeeded" and done.attempts == 1
+    assert queue.stats()["heartbeat_failures"] == 1 and queue.stats()["abandoned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_handler_is_cancelled_when_the_lease_cannot_be_renewed(jobs_db):
+    # Two failed renewals in a row and the 0.3s lease would lapse before the third
+    failures = [1, 1]
+    queue = JobQueue(session_maker=_failing_heartbeats(jobs_db, failures), workers=1, poll_interval=0.01, lease_seconds=0.3)
+    cancelled = []
+
+    async def stuck_once(payload, emit):
+        if cancelled:
+            return {"ok": True}
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    queue.register("stuck", stuck_once)
+    job = await queue.submit("stuck", {})
+    await queue.start()
+    try:
+        # The abandoned attempt is requeued once its lease is stale, then runs again
+        done = await _wait_finished(queue, job.id, timeout=5.0)
+    finally:
+        await queue.close()
+
+    assert cancelled == [1]
+    assert done.status == "succeeded" and done.attempts == 2
+    assert queue.stats()["abandoned"] == 1 and queue.stats()["recovered"] == 1
@@ -0,0 +1,68 @@
+# apps/api/tests/test_llm_cache.py
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_openai import ChatOpenAI
+
+from ..core.llm_cache import CachedChatOpenAI, ResponseCache
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replaces the OpenAI stream with a canned one and counts the calls."""
+    calls = []
+
+    async def fake_astream(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        for i, token in enumerate(["Hel", "lo"]):
+            usage = {"input_tokens": 1000, "output_tokens": 500, "total_tokens": 1500} if i == 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+
+    monkeypatch.setattr(ChatOpenAI, "_astream", fake_astream)
+    return calls
+
+
+def _llm(cache: ResponseCache) -> CachedChatOpenAI:
+    return CachedChatOpenAI(model="gpt-4o-mini", api_key="test", streaming=True, stream_usage=True, response_cache=cache)
+
+
+def test_key_ignores_message_ids_and_streaming():
+    cache = ResponseCache()
+    streaming = _llm(cache)
+    invoking = CachedChatOpenAI(model="gpt-4o-mini", api_key="other", response_cache=cache)
+
+    first = cache.key(streaming, [HumanMessage(content="hi", id="a")], None, {})
+    second = cache.key(invoking, [HumanMessage(content="hi", id="b")], None, {"stream": True})
+
+    assert first == second
+    assert first != cache.key(streaming, [HumanMessage(content="hi")], None, {"tools": [{"name": "add"}]})
+    assert first != cache.key(ChatOpenAI(model="gpt-4o", api_key="test"), [HumanMessage(content="hi")], None, {})
+
+
+@pytest.mark.asyncio
+async def test_repeated_stream_is_replayed_from_cache(upstream):
+    cache = ResponseCache()
+    llm = _llm(cache)
+
+    first = [chunk.content async for chunk in llm.astream([HumanMessage(content="hi")])]
+    second = [chunk.content async for chunk in llm.astream([HumanMessage(content="hi")])]
+    invoked = await llm.ainvoke([HumanMessage(content="hi")])
+
+    assert first == second == ["Hel", "lo"]
+    assert invoked.content == "Hello"
+    assert len(upstream) == 1
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2 and stats["misses"] == 1
+    assert stats["tokens_saved"] == {"input": 2000, "output": 1000}
+    assert stats["cost_saved_usd"] == pytest.approx(2 * (1000 * 0.15 + 500 * 0.60) / 1_000_000)
+
+
+@pytest.mark.asyncio
+async def test_lru_tier_evicts_the_oldest_entry():
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        await cache.aput(key, "gpt-4o-mini", [AIMessage(content=key)])
+
+    assert await cache.aget("a") is None
+    assert [m.content for m in await cache.aget("c")] == ["c"]
+    assert cache.stats()["entries"] == 2
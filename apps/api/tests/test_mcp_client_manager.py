@@ -0,0 +1,118 @@
+# apps/api/tests/test_mcp_client_manager.py
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from mcp import types
+
+from ..core.mcps import MCPClientManager
+
+
+def _tool(name: str) -> types.Tool:
+    return types.Tool(name=name, description=name, inputSchema={"type": "object", "properties": {}})
+
+
+def _connected_manager(session) -> MCPClientManager:
+    manager = MCPClientManager(connect_timeout=0.1)
+    manager._supervisor = asyncio.get_running_loop().create_future()  # Pretend the supervisor is running
+    manager._session = session
+    manager._connected.set()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_reloaded_only_on_list_changed():
+    session = AsyncMock()
+    session.list_tools.side_effect = [
+        types.ListToolsResult(tools=[_tool("add")]),
+        types.ListToolsResult(tools=[_tool("add"), _tool("multiply")]),
+    ]
+    manager = _connected_manager(session)
+    changes = []
+    manager.on_tools_changed(lambda old, new: changes.append(([t.name for t in old], [t.name for t in new])))
+    await manager._load_tools(session)
+
+    assert [t.name for t in await manager.tools()] == ["add"]
+    assert [t.name for t in await manager.tools()] == ["add"]
+    assert session.list_tools.await_count == 1
+
+    await manager._handle_message(types.ServerNotification(
+        types.ToolListChangedNotification(method="notifications/tools/list_changed")
+    ))
+    await manager._refresh_task
+
+    assert [t.name for t in await manager.tools()] == ["add", "multiply"]
+    assert changes[-1] == (["add"], ["add", "multiply"])
+    assert manager.stats()["catalog_refreshes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_tools_call_through_the_current_session():
+    """Tools built before a reconnect use the new session afterwards."""
+    old_session, new_session = AsyncMock(), AsyncMock()
+    old_session.list_tools.return_value = types.ListToolsResult(tools=[_tool("add")])
+    new_session.call_tool.return_value = types.CallToolResult(content=[types.TextContent(type="text", text="3")])
+    manager = _connected_manager(old_session)
+    await manager._load_tools(old_session)
+    (tool,) = await manager.tools()
+
+    manager._session = new_session
+    result = await tool.ainvoke({"name": "add", "args": {}, "id": "call_1", "type": "tool_call"})
+
+    assert result.content == "3"
+    new_session.call_tool.assert_awaited_once_with("add", {})
+    old_session.call_tool.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_transport_error_marks_the_session_disconnected():
+    manager = _connected_manager(AsyncMock())
+    await manager._handle_message(ConnectionError("stream closed"))
+
+    assert manager._disconnected.is_set()
+    assert "stream closed" in manager.stats()["last_error"]
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_a_connection_times_out():
+    manager = MCPClientManager(connect_timeout=0.05)
+    manager._supervisor = asyncio.get_running_loop().create_future()
+
+    with pytest.raises(RuntimeError):
+        await manager.session()
+
+
+@pytest.mark.asyncio
+async def test_cacheable_tools_skip_the_round_trip_for_repeated_calls():
+    session = AsyncMock()
+    cacheable = types.Tool(name="add", description="add", inputSchema={"type": "object", "properties": {}}, cache={"ttl": 60})
+    session.list_tools.return_value = types.ListToolsResult(tools=[cacheable, _tool("now")])
+    session.call_tool.return_value = types.CallToolResult(content=[types.TextContent(type="text", text="3")])
+    manager = _connected_manager(session)
+    await manager._load_tools(session)
+
+    for _ in range(3):
+        await manager.call_tool("add", {"a": 1, "b": 2})
+    await manager.call_tool("add", {"b": 2, "a": 1})
+    await manager.call_tool("add", {"a": 2, "b": 2})
+    await manager.call_tool("now", {})
+    await manager.call_tool("now", {})
+
+    assert session.call_tool.await_count == 4 # Two distinct add calls, both uncached now calls
+    stats = manager.stats()["tool_cache"]
+    assert stats["tools"] == {"add": {"ttl": 60.0, "hits": 3, "misses": 2}}
+
+
+@pytest.mark.asyncio
+async def test_error_results_are_not_cached():
+    session = AsyncMock()
+    cacheable = types.Tool(name="add", description="add", inputSchema={"type": "object", "properties": {}}, cache={"ttl": 60})
+    session.list_tools.return_value = types.ListToolsResult(tools=[cacheable])
+    session.call_tool.return_value = types.CallToolResult(content=[], isError=True)
+    manager = _connected_manager(session)
+    await manager._load_tools(session)
+
+    await manager.call_tool("add", {"a": 1})
+    await manager.call_tool("add", {"a": 1})
+
+    assert session.call_tool.await_count == 2
@@ -0,0 +1,62 @@
+# apps/api/tests/test_memory_registry.py
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ..core.memory import MemoryRegistry
+
+
+def test_registry_builds_memory_once():
+    """Scoped handles share a single Memory built by the registry."""
+    registry = MemoryRegistry(config_factory=lambda: {})
+    with patch("api.core.memory.Memory.from_config", return_value=MagicMock()) as from_config:
+        registry.open()
+        first = registry.scoped(user_id="conv_1")
+        second = registry.scoped(user_id="conv_2")
+
+    from_config.assert_called_once()
+    assert first.memory is second.memory
+    assert registry.stats()["handles_issued"] == 2
+
+
+def test_handle_scopes_memory_calls():
+    """Handles inject their user_id into mem0 calls."""
+    registry = MemoryRegistry(config_factory=lambda: {})
+    memory = MagicMock()
+    with patch("api.core.memory.Memory.from_config", return_value=memory):
+        handle = registry.scoped(user_id="conv_1")
+        handle.add("hello", metadata={"sender_type": "user"})
+
+    memory.add.assert_called_once_with(
+        "hello", user_id="conv_1", run_id=None, metadata={"sender_type": "user"}
+    )
+
+
+def test_registry_close_releases_clients():
+    """Closing the registry closes backend clients and resets stats."""
+    registry = MemoryRegistry(config_factory=lambda: {})
+    memory = MagicMock()
+    with patch("api.core.memory.Memory.from_config", return_value=memory):
+        registry.open()
+    registry.close()
+
+    memory.graph.graph.close.assert_called_once()
+    memory.vector_store.client.close.assert_called_once()
+    assert registry.stats()["open"] is False
+    assert registry.stats()["clients"] == 0
+
+
+def test_failed_open_is_logged_and_retried_later():
+    """An unreachable backend doesn't fail startup; opening is retried after the interval."""
+    registry = MemoryRegistry(config_factory=lambda: {}, retry_interval=60.0)
+    with patch("api.core.memory.Memory.from_config", side_effect=ConnectionError("qdrant down")) as from_config:
+        assert registry.try_open() is False
+        handle = registry.scoped(user_id="conv_1") # Handles don't touch the backends
+        with pytest.raises(ConnectionError):
+            handle.add("hello")
+    from_config.assert_called_once() # The second attempt waited for the retry interval
+
+    registry._retry_at = 0.0
+    with patch("api.core.memory.Memory.from_config", return_value=MagicMock()):
+        assert registry.try_open() is True
+    assert registry.stats()["open"] is True and registry.stats()["open_failures"] == 1
@@ -0,0 +1,62 @@
+# apps/api/tests/test_memory_writer.py
+import pytest
+from unittest.mock import MagicMock
+
+from ..core.memory import MemoryRegistry
+from ..core.memory_writer import MemoryWriteBehind
+
+
+def _registry(memory: MagicMock) -> MemoryRegistry:
+    registry = MemoryRegistry(config_factory=lambda: {})
+    registry._memory = memory
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched_per_user_and_flushed_on_close():
+    """Queued writes for one user are sent as a single mem0 add on flush."""
+    memory = MagicMock()
+    writer = MemoryWriteBehind(_registry(memory), batch_size=10)
+    await writer.start()
+
+    writer.submit("conv_1", "hi", metadata={"conversation_id": "1", "message_id": "a"})
+    writer.submit("conv_1", "hello!", role="assistant", metadata={"conversation_id": "1", "message_id": "b"})
+    await writer.close()
+
+    memory.add.assert_called_once_with(
+        [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello!"}],
+        user_id="conv_1",
+        run_id=None,
+        metadata={"conversation_id": "1", "message_ids": ["a", "b"]},
+    )
+    stats = writer.stats()
+    assert stats["written"] == 2
+    assert stats["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_retried():
+    """A transient mem0 failure is retried with backoff."""
+    memory = MagicMock()
+    memory.add.side_effect = [RuntimeError("neo4j unavailable"), None]
+    writer = MemoryWriteBehind(_registry(memory), max_retries=2, retry_backoff=0)
+    await writer.start()
+
+    writer.submit("conv_1", "hi")
+    await writer.close()
+
+    assert memory.add.call_count == 2
+    assert writer.stats()["retries"] == 1
+    assert writer.stats()["written"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_instead_of_blocking():
+    """Submitting to a full queue returns immediately."""
+    writer = MemoryWriteBehind(_registry(MagicMock()), max_queue_size=1)
+    await writer.start()
+
+    assert writer.submit("conv_1", "first")
+    assert not writer.submit("conv_1", "second")
+    assert writer.stats()["dropped"] == 1
+    await writer.close()
@@ -0,0 +1,48 @@
+# apps/api/tests/test_pagination.py
+import pytest
+
+from ..crud import conversation as crud_conversation
+from ..crud import message as crud_message
+from ..crud.pagination import decode_cursor, encode_cursor
+from ..schemas.conversation import ConversationCreate
+from ..schemas.message import MessageCreate
+from .conftest import TestingSessionLocal
+
+
+def test_cursor_round_trip():
+    """Cursors decode back to typed key values."""
+    position, message_id = 3, "6f1c1b9e-3d2a-4a8e-9c55-0f5d2b8f8a11"
+    cursor = encode_cursor("next", [position, message_id])
+
+    direction, values = decode_cursor(cursor, crud_message.MESSAGE_ORDER)
+
+    assert direction == "next"
+    assert values[0] == position
+    assert str(values[1]) == message_id
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", crud_message.MESSAGE_ORDER)
+
+
+@pytest.mark.asyncio
+async def test_message_pages_walk_forward_and_back():
+    """next_cursor/prev_cursor walk a conversation without gaps or repeats."""
+    async with TestingSessionLocal() as db:
+        conversation = await crud_conversation.create_conversation(db, ConversationCreate(title="Paging"))
+        await crud_message.create_messages(db, [
+            MessageCreate(conversation_id=conversation.id, role="user", content=f"message {i}")
+            for i in range(5)
+        ])
+
+        first = await crud_message.get_messages_by_conversation(db, conversation.id, limit=2)
+        second = await crud_message.get_messages_by_conversation(db, conversation.id, cursor=first.next_cursor, limit=2)
+        third = await crud_message.get_messages_by_conversation(db, conversation.id, cursor=second.next_cursor, limit=2)
+        back = await crud_message.get_messages_by_conversation(db, conversation.id, cursor=third.prev_cursor, limit=2)
+
+    contents = [m.content for page in (first, second, third) for m in page.items]
+    assert contents == [f"message {i}" for i in range(5)]
+    assert first.prev_cursor is None
+    assert third.next_cursor is None
+    assert [m.id for m in back.items] == [m.id for m in second.items]
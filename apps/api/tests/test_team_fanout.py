@@ -0,0 +1,77 @@
+# apps/api/tests/test_team_fanout.py
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from ..services.team_fanout import TeamFanOut
+from ..services.team_roster import RosterAgent
+
+
+class ScriptedLLM:
+    """Answers as the agent named in the system prompt, after that agent's delay."""
+
+    def __init__(self, script):
+        self.script = script # agent name -> (delay, answer)
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        if isinstance(messages, str): # The merge prompt
+            self.prompts.append(messages)
+            return AIMessage(content="merged")
+        delay, answer = self.script[messages[0].content]
+        await asyncio.sleep(delay)
+        if isinstance(answer, Exception):
+            raise answer
+        return AIMessage(content=answer)
+
+
+def _agents(*names):
+    return [
+        RosterAgent(id=f"id-{name}", name=name, role=None, system_message=SystemMessage(content=name), tool_names=())
+        for name in names
+    ]
+
+
+TURN = [HumanMessage(content="What is 1 + 2?")]
+
+
+@pytest.mark.asyncio
+async def test_first_reducer_returns_the_fastest_and_cancels_the_rest():
+    llm = ScriptedLLM({"slow": (1.0, "3"), "fast": (0.05, "three")})
+
+    started = time.perf_counter()
+    result = await TeamFanOut().run(_agents("slow", "fast"), TURN, llm, reducer="first")
+
+    assert time.perf_counter() - started < 0.5
+    assert result.message.content == "three" and result.agent_id == "id-fast"
+    assert [b.status for b in result.branches] == ["cancelled", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_vote_reducer_picks_the_majority_within_the_slowest_branch():
+    llm = ScriptedLLM({"a": (0.2, "3"), "b": (0.05, "4"), "c": (0.2, " 3 ")})
+
+    started = time.perf_counter()
+    result = await TeamFanOut().run(_agents("a", "b", "c"), TURN, llm, reducer="vote")
+
+    assert time.perf_counter() - started < 0.4 # Parallel, not 0.45s back to back
+    assert result.message.content.strip() == "3"
+
+
+@pytest.mark.asyncio
+async def test_branches_time_out_and_failures_are_left_out_of_the_merge():
+    llm = ScriptedLLM({"a": (0.01, "3"), "b": (0.01, RuntimeError("boom")), "c": (5, "late"), "d": (0.01, "three")})
+
+    result = await TeamFanOut(branch_timeout=0.2).run(_agents("a", "b", "c", "d"), TURN, llm, reducer="concat_summarize")
+
+    assert result.message.content == "merged" and result.agent_id is None
+    assert [b.status for b in result.branches] == ["ok", "error", "timeout", "ok"]
+    assert "[a]\n3" in llm.prompts[0] and "late" not in llm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_unknown_reducer_is_rejected():
+    with pytest.raises(ValueError):
+        await TeamFanOut().run(_agents("a"), TURN, ScriptedLLM({}), reducer="loudest")
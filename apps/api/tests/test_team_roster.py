@@ -0,0 +1,113 @@
+# apps/api/tests/test_team_roster.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, update
+
+from ..crud import agent as crud_agent
+from ..crud import team as crud_team
+from ..models.agent_team import TeamAgent
+from ..schemas.agent import AgentCreate, AgentUpdate
+from ..schemas.team import TeamCreate, TeamUpdate
+from ..services.team_roster import TeamRosterCache, team_roster_cache
+from .conftest import TestingSessionLocal, engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self)
+
+
+async def _team_with_agents(db):
+    team = await crud_team.create_team(db, TeamCreate(name="Support"))
+    writer = await crud_agent.create_agent(db, AgentCreate(name="Writer", system_prompt="You write."))
+    lead = await crud_agent.create_agent(db, AgentCreate(name="Lead", system_prompt="You lead."))
+    await crud_team.add_agent_to_team(db, team.id, writer.id, role="writer")
+    await crud_team.add_agent_to_team(db, team.id, lead.id, role="lead")
+    # SQLite's CURRENT_TIMESTAMP has one-second resolution, so pin the join order
+    joined = datetime.now(timezone.utc)
+    for seconds, agent in enumerate((writer, lead)):
+        await db.execute(
+            update(TeamAgent)
+            .where(TeamAgent.team_id == team.id, TeamAgent.agent_id == agent.id)
+            .values(created_at=joined + timedelta(seconds=seconds))
+        )
+    await db.commit()
+    return team, writer, lead
+
+
+@pytest.mark.asyncio
+async def test_cached_roster_costs_no_queries():
+    cache = TeamRosterCache()
+    async with TestingSessionLocal() as db:
+        team, writer, lead = await _team_with_agents(db)
+        roster = await cache.get(db, team.id)
+
+        with QueryCounter() as queries:
+            again = await cache.get(db, team.id)
+
+    assert again is roster and queries.count == 0
+    assert [a.name for a in roster.agents] == ["Writer", "Lead"]
+    assert roster.initial_agent().id == str(lead.id)
+    assert roster.agent(writer.id).system_message.content == "You write."
+
+
+@pytest.mark.asyncio
+async def test_team_and_agent_writes_invalidate_the_roster():
+    async with TestingSessionLocal() as db:
+        team, writer, lead = await _team_with_agents(db)
+        await team_roster_cache.get(db, team.id)
+
+        await crud_agent.update_agent(db, writer.id, AgentUpdate(system_prompt="You edit."))
+        roster = await team_roster_cache.get(db, team.id)
+        assert roster.agent(writer.id).system_message.content == "You edit."
+
+        await crud_team.remove_agent_from_team(db, team.id, lead.id)
+        roster = await team_roster_cache.get(db, team.id)
+        assert [a.name for a in roster.agents] == ["Writer"]
+
+        await crud_team.update_team(db, team.id, TeamUpdate(name="Editors"))
+        assert (await team_roster_cache.get(db, team.id)).name == "Editors"
+
+    assert team_roster_cache.stats()["invalidations"] >= 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("invalidate", ["team", "agent"])
+async def test_roster_invalidated_during_its_load_is_not_cached(invalidate):
+    cache = TeamRosterCache()
+    loading, resume = asyncio.Event(), asyncio.Event()
+    load = cache._load
+
+    async def slow_load(db, team_id):
+        roster = await load(db, team_id)
+        loading.set()
+        await resume.wait()
+        return roster
+
+    cache._load = slow_load
+    async with TestingSessionLocal() as db:
+        team, writer, lead = await _team_with_agents(db)
+        pending = asyncio.create_task(cache.get(db, team.id))
+        await loading.wait()
+        # A write lands after the roster was read, before it is stored
+        if invalidate == "team":
+            cache.invalidate_team(team.id)
+        else:
+            cache.invalidate_agent(writer.id)
+        resume.set()
+        stale = await pending
+
+    assert stale is not None
+    assert cache.stats()["size"] == 0
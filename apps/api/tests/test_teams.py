@@ -15,22 +15,23 @@ async def test_create_team(client: TestClient):
         "config": {"model": "gpt-4"}
     }
     agent_response = client.post("/api/v1/agents/", json=agent_data)
-    assert agent_response.status_code == 200
+    assert agent_response.status_code == 201
     agent_id = agent_response.json()["id"]
 
     team_data = {
         "name": "Test Team",
         "description": "A team created for testing purposes",
-        "agent_ids": [agent_id]
     }
     response = client.post("/api/v1/teams/", json=team_data)
-    assert response.status_code == 200
+    assert response.status_code == 201
     data = response.json()
     assert data["name"] == team_data["name"]
     assert data["description"] == team_data["description"]
     assert "id" in data
-    assert len(data["agents"]) == 1
-    assert data["agents"][0]["id"] == agent_id
+
+    # Then assign the agent to the team
+    member_response = client.post(f"/api/v1/teams/{data['id']}/agents", json={"agent_id": agent_id, "role": "lead"})
+    assert member_response.status_code == 201
 
 @pytest.mark.asyncio
 async def test_read_teams(client: TestClient):
@@ -43,15 +44,15 @@ async def test_read_teams(client: TestClient):
         "config": {"model": "gpt-3.5"}
     }
     agent_response = client.post("/api/v1/agents/", json=agent_data)
-    assert agent_response.status_code == 200
+    assert agent_response.status_code == 201
     agent_id = agent_response.json()["id"]
 
     team_data = {
         "name": "List Test Team",
         "description": "Team for list endpoint test",
-        "agent_ids": [agent_id]
     }
-    client.post("/api/v1/teams/", json=team_data)
+    team_response = client.post("/api/v1/teams/", json=team_data)
+    client.post(f"/api/v1/teams/{team_response.json()['id']}/agents", json={"agent_id": agent_id})
 
     response = client.get("/api/v1/teams/")
     assert response.status_code == 200
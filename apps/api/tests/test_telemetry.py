@@ -0,0 +1,56 @@
+# apps/api/tests/test_telemetry.py
+import uuid
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from ..core.telemetry import LLMMetricsCallback, instrument_engine
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_reports_route_latency_and_gauges(client):
+    before = _sample("http_request_duration_seconds_count", method="GET", route="/health", status="200")
+    client.get("/health")
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert _sample("http_request_duration_seconds_count", method="GET", route="/health", status="200") == before + 1
+    assert _sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+    assert "queue_depth" in response.text and "in_flight" in response.text
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_times_queries_by_operation():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    before = _sample("db_query_duration_seconds_count", operation="select")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await conn.execute(text("select 2"))
+    await engine.dispose()
+
+    assert _sample("db_query_duration_seconds_count", operation="select") == before + 2
+
+
+def test_llm_callback_records_first_token_once_and_total_time():
+    callback = LLMMetricsCallback()
+    run_id = uuid.uuid4()
+    before = _sample("llm_time_to_first_token_seconds_count", model="test-model")
+
+    callback.on_chat_model_start({}, [[]], run_id=run_id, metadata={"ls_model_name": "test-model"})
+    callback.on_llm_new_token("Hel", run_id=run_id)
+    callback.on_llm_new_token("lo", run_id=run_id)
+    callback.on_llm_end(None, run_id=run_id)
+
+    assert _sample("llm_time_to_first_token_seconds_count", model="test-model") == before + 1
+    assert _sample("llm_request_duration_seconds_count", model="test-model", outcome="ok") >= 1
+    assert callback._runs == {}
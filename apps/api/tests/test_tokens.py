@@ -0,0 +1,33 @@
+# apps/api/tests/test_tokens.py
+import pytest
+
+from ..core import tokens
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def encoding_for_model(model):
+        raise KeyError(model)
+
+    def get_encoding(name):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(tokens.tiktoken, "encoding_for_model", encoding_for_model)
+    monkeypatch.setattr(tokens.tiktoken, "get_encoding", get_encoding)
+    tokens._encoding.cache_clear()
+    yield
+    tokens._encoding.cache_clear()
+
+
+def test_unknown_model_without_network_estimates_counts(offline):
+    assert tokens._encoding("some-new-model") is None
+    assert tokens.count_tokens("x" * 40, model="some-new-model") == 10
+    assert tokens.count_message_tokens("x" * 40, model="some-new-model") == 10 + tokens.MESSAGE_OVERHEAD_TOKENS
+
+
+@pytest.mark.asyncio
+async def test_load_encoding_caches_the_outcome(offline, monkeypatch):
+    await tokens.load_encoding("some-new-model")
+    monkeypatch.setattr(tokens.tiktoken, "get_encoding", lambda name: pytest.fail("loaded twice"))
+
+    assert tokens.count_tokens("abcd", model="some-new-model") == 1
@@ -0,0 +1,79 @@
+# apps/api/tests/test_tool_executor.py
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from ..core.agent.tools import ToolExecutor
+
+
+def _sleepy_tool(name: str, running: list) -> StructuredTool:
+    async def sleep(seconds: float) -> str:
+        running.append(name)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            running.remove(name)
+        return f"{name} slept {seconds}"
+
+    return StructuredTool.from_function(coroutine=sleep, name=name, description=f"Sleeps ({name})")
+
+
+def _calls(*specs):
+    return [{"name": name, "args": {"seconds": seconds}, "id": f"call_{i}"} for i, (name, seconds) in enumerate(specs)]
+
+
+@pytest.mark.asyncio
+async def test_calls_run_concurrently_and_keep_their_order():
+    running = []
+    tools = [_sleepy_tool("a", running), _sleepy_tool("b", running), _sleepy_tool("c", running)]
+
+    started = time.perf_counter()
+    results = await ToolExecutor().run(_calls(("a", 0.3), ("b", 0.1), ("c", 0.2)), tools)
+    elapsed = time.perf_counter() - started
+
+    assert [r.tool_call_id for r in results] == ["call_0", "call_1", "call_2"]
+    assert results[1].content == "b slept 0.1"
+    assert elapsed < 0.5 # The slowest call, not the sum of all three
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    running, peak = [], []
+    tools = [_sleepy_tool(name, running) for name in "abcd"]
+
+    async def watch():
+        while True:
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(watch())
+    await ToolExecutor(max_concurrency=2).run(_calls(*[(name, 0.1) for name in "abcd"]), tools)
+    watcher.cancel()
+
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_and_unknown_tools_become_error_results():
+    running = []
+    executor = ToolExecutor(timeout=0.1)
+
+    results = await executor.run(_calls(("a", 1), ("missing", 0), ("b", 0)), [_sleepy_tool("a", running), _sleepy_tool("b", running)])
+
+    assert [r.status for r in results] == ["error", "error", "success"]
+    assert "timed out" in results[0].content
+    assert running == [] # The timed out call was cancelled
+    assert executor.stats()["timeouts"] == 1 and executor.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_node_runs_the_last_messages_tool_calls():
+    running = []
+    node = ToolExecutor().bind([_sleepy_tool("a", running)])
+
+    update = await node({"messages": [AIMessage(content="", tool_calls=_calls(("a", 0.0)))]}, {})
+
+    assert [m.content for m in update["messages"]] == ["a slept 0.0"]
@@ -78,6 +78,13 @@ export interface ConversationResponse {
   // Add other fields based on your Conversation model
 }
 
+// Cursor-paginated listing envelope
+export interface Page<T> {
+  items: T[];
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
+}
+
 // Message Types
 export interface MessageCreate {
   conversation_id: UUID;
@@ -1,5 +1,5 @@
 // src/lib/services/conversationService.ts
-import { ConversationCreate, ConversationResponse, ConversationUpdate, MessageResponse } from "@/app/types"; // Assuming types are defined here
+import { ConversationCreate, ConversationResponse, ConversationUpdate, MessageResponse, Page } from "@/app/types"; // Assuming types are defined here
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
@@ -12,7 +12,8 @@ export const getConversations = async (filters: { userId?: string; teamId?: stri
   if (!response.ok) {
     throw new Error("Failed to fetch conversations");
   }
-  return response.json();
+  const page: Page<ConversationResponse> = await response.json();
+  return page.items;
 };
 
 export const getConversation = async (conversationId: string): Promise<ConversationResponse> => {
@@ -61,12 +62,33 @@ export const deleteConversation = async (conversationId: string): Promise<Conver
   return response.json();
 };
 
-// Get messages for a specific conversation
-export const getConversationMessages = async (conversationId: string): Promise<MessageResponse[]> => {
-  const response = await fetch(`${API_BASE_URL}/conversations/${conversationId}/messages`);
+// Get one page of a conversation's messages, oldest first; pass the returned
+// next_cursor to continue after it
+export const getConversationMessagesPage = async (
+  conversationId: string,
+  cursor?: string | null,
+  limit?: number,
+): Promise<Page<MessageResponse>> => {
+  const queryParams = new URLSearchParams();
+  if (cursor) queryParams.append("cursor", cursor);
+  if (limit) queryParams.append("limit", String(limit));
+
+  const response = await fetch(`${API_BASE_URL}/conversations/${conversationId}/messages?${queryParams.toString()}`);
   if (!response.ok) {
     throw new Error(`Failed to fetch messages for conversation ${conversationId}`);
   }
   return response.json();
 };
 
+// Get all messages of a conversation, following next_cursor across pages
+export const getConversationMessages = async (conversationId: string): Promise<MessageResponse[]> => {
+  const messages: MessageResponse[] = [];
+  let cursor: string | null | undefined = undefined;
+  do {
+    const page: Page<MessageResponse> = await getConversationMessagesPage(conversationId, cursor);
+    messages.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return messages;
+};
+
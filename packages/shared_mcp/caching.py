@@ -0,0 +1,44 @@
+from typing import Any, Callable
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import Tool as MCPTool
+
+# Extra field on a listed tool marking its results as cacheable: {"ttl": seconds}
+CACHE_FIELD = "cache"
+
+
+class CachingFastMCP(FastMCP):
+    """FastMCP server whose tools can declare their results cacheable.
+
+    Register a deterministic tool with `@mcp.tool(cache_ttl=seconds)`; the TTL
+    is advertised in the tool listing so clients may serve repeated calls with
+    identical arguments from a local cache for that long.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._cache_ttls: dict[str, float] = {}
+        super().__init__(*args, **kwargs)
+
+    def tool(
+        self,
+        name: str | None = None,
+        description: str | None = None,
+        cache_ttl: float | None = None,
+    ) -> Callable:
+        register = super().tool(name=name, description=description)
+
+        def decorator(fn: Callable) -> Callable:
+            if cache_ttl is not None:
+                self._cache_ttls[name or fn.__name__] = cache_ttl
+            return register(fn)
+
+        return decorator
+
+    async def list_tools(self) -> list[MCPTool]:
+        tools = await super().list_tools()
+        return [
+            MCPTool(**tool.model_dump(), **{CACHE_FIELD: {"ttl": self._cache_ttls[tool.name]}})
+            if tool.name in self._cache_ttls
+            else tool
+            for tool in tools
+        ]
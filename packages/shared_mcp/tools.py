@@ -1,14 +1,14 @@
 import os
 
-from mcp.server.fastmcp import FastMCP
+from shared_mcp.caching import CachingFastMCP
 
-mcp = FastMCP(
+mcp = CachingFastMCP(
     "MCP Server",
     port=os.environ["MCP_SERVER_PORT"],
 )
 
 
-@mcp.tool()
+@mcp.tool(cache_ttl=3600) # Pure, so clients may reuse results
 def add(a: int, b: int) -> int:
     """Add two numbers"""
     return a + b